@@ -0,0 +1,220 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from block_markdown import (
+    direct_inline_html,
+    inline_cache,
+    markdown_to_html_node,
+    normalize_newlines,
+)
+from build_manifest import hash_bytes
+from generate_site import (
+    LARGE_PAGE_BYTES,
+    TEMPLATE_CONTENT_PLACEHOLDER,
+    BuildReport,
+    collect_results,
+    finish_build,
+    inline_cache_summary,
+    load_template,
+    plan_build,
+    process_block_cache,
+    process_inline_cache,
+    render_job,
+    save_block_cache,
+)
+from pipeline_stats import instrument
+
+
+class AsyncFileSystem:
+    """Blocking file operations run on a dedicated thread pool.
+
+    The pool is sized for I/O rather than CPU, so many slow reads and
+    writes (e.g. on a network filesystem) can be waiting at once without
+    holding up the event loop.
+    """
+
+    def __init__(self, max_threads=32):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="site-io"
+        )
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _read_bytes(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _write_text(self, path, text):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+
+    async def read_bytes(self, path):
+        return await self._run(self._read_bytes, path)
+
+    async def write_text(self, path, text):
+        """Writes text to path via a temporary file, like render_page."""
+        await self._run(self._write_text, path, text)
+
+    async def call(self, func, *args):
+        """Runs any other blocking function on the I/O pool."""
+        return await self._run(func, *args)
+
+    def close(self):
+        self._executor.shutdown()
+
+
+def render_html(markdown, template=None, cache=None, block_cache=None):
+    with inline_cache(cache), direct_inline_html():
+        html = markdown_to_html_node(markdown, cache=block_cache).to_html()
+    if template is not None:
+        html = template.replace(TEMPLATE_CONTENT_PLACEHOLDER, html)
+    return html
+
+
+def _render_markdown(markdown, template, stage_stats, inline_cache_size, block_cache_path):
+    """render_html with the same stats and caches as render_job.
+
+    Returns (html, stats, lookups, blocks).
+    """
+    block_cache = None
+    if block_cache_path is not None:
+        block_cache = process_block_cache(block_cache_path)
+
+    cache = None
+    if inline_cache_size is not None:
+        cache = process_inline_cache(inline_cache_size)
+        hits, misses = cache.hits, cache.misses
+
+    stats = None
+    if stage_stats:
+        with instrument() as stats:
+            html = render_html(markdown, template, cache, block_cache)
+    else:
+        html = render_html(markdown, template, cache, block_cache)
+
+    lookups = None
+    if cache is not None:
+        lookups = (cache.hits - hits, cache.misses - misses)
+    blocks = block_cache.take_added() if block_cache is not None else None
+    return html, stats, lookups, blocks
+
+
+async def _render_worker(jobs, filesystem, executor, results, on_page, options):
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        relative_path, source_path, dest_path, template = job
+        if await filesystem.call(os.path.getsize, source_path) >= LARGE_PAGE_BYTES:
+            # render_page streams large pages from a memory map instead of
+            # reading them whole, so it does the I/O for these itself.
+            result = await loop.run_in_executor(executor, render_job, job, *options)
+        else:
+            start = time.perf_counter()
+            data = await filesystem.read_bytes(source_path)
+            html, stats, lookups, blocks = await loop.run_in_executor(
+                executor,
+                _render_markdown,
+                normalize_newlines(data.decode("utf-8")),
+                template,
+                *options,
+            )
+            await filesystem.write_text(dest_path, html)
+            seconds = time.perf_counter() - start
+            result = (relative_path, seconds, hash_bytes(data), stats, lookups, blocks)
+        results.append(result)
+        if on_page is not None:
+            on_page(relative_path, result[1])
+
+
+async def async_build_site(
+    content_dir,
+    output_dir,
+    concurrency=16,
+    workers=1,
+    on_page=None,
+    template_path=None,
+    incremental=True,
+    filesystem=None,
+    stage_stats=False,
+    inline_cache_size=None,
+    block_cache_path=None,
+):
+    """Like build_site, but overlaps file reads and writes with rendering.
+
+    At most concurrency pages are in flight at a time, each held by one
+    worker task from read to write, so a slow disk limits how fast pages
+    are picked up rather than letting rendered HTML pile up in memory.
+    Rendering runs on a process pool with workers processes, or on a
+    single background thread when workers=1. filesystem defaults to an
+    AsyncFileSystem with one thread per concurrent page. stage_stats,
+    inline_cache_size and block_cache_path work as in build_site, and
+    pages of LARGE_PAGE_BYTES or more are streamed by render_page as well.
+    """
+    start = time.perf_counter()
+    own_filesystem = filesystem is None
+    if own_filesystem:
+        filesystem = AsyncFileSystem(max_threads=concurrency)
+    if workers == 1:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="site-render")
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        template, template_hash = await filesystem.call(load_template, template_path)
+        jobs, source_stats, manifest, skipped, removed = await filesystem.call(
+            plan_build, content_dir, output_dir, template, template_hash, incremental
+        )
+
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        results = []
+        options = (stage_stats, inline_cache_size, block_cache_path)
+        tasks = [
+            _render_worker(queue, filesystem, executor, results, on_page, options)
+            for _ in range(max(1, min(concurrency, len(jobs))))
+        ]
+        await asyncio.gather(*tasks)
+
+        page_timings = {}
+        page_hashes = {}
+        page_stats = {}
+        inline_lookups = [0, 0]
+        block_entries = []
+        collect_results(
+            results, page_timings, page_hashes, page_stats, inline_lookups, block_entries, None
+        )
+        await filesystem.call(finish_build, output_dir, manifest, source_stats, page_hashes)
+        if block_cache_path is not None:
+            await filesystem.call(save_block_cache, block_cache_path, block_entries)
+    finally:
+        executor.shutdown()
+        if own_filesystem:
+            filesystem.close()
+
+    inline_cache_stats = None
+    if inline_cache_size is not None:
+        inline_cache_stats = inline_cache_summary(inline_lookups)
+    return BuildReport(
+        page_timings,
+        time.perf_counter() - start,
+        skipped,
+        removed,
+        page_stats,
+        inline_cache_stats,
+    )
+
+
+def build_site_async(content_dir, output_dir, **kwargs):
+    """Runs async_build_site to completion from synchronous code."""
+    return asyncio.run(async_build_site(content_dir, output_dir, **kwargs))
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+from async_build import AsyncFileSystem, async_build_site
+from bench_corpus import make_markdown_corpus
+
+
+PAGE_COUNT = 200
+PAGE_BYTES = 4_000
+LATENCY = 0.02
+CONCURRENCY_LEVELS = [1, 4, 16, 64]
+
+
+class SlowFileSystem(AsyncFileSystem):
+    """Adds a fixed delay to every read and write, like a network mount."""
+
+    def __init__(self, max_threads, latency):
+        super().__init__(max_threads)
+        self.latency = latency
+
+    def _read_bytes(self, path):
+        time.sleep(self.latency)
+        return super()._read_bytes(path)
+
+    def _write_text(self, path, text):
+        time.sleep(self.latency)
+        super()._write_text(path, text)
+
+
+def write_content(content_dir):
+    for i in range(PAGE_COUNT):
+        path = os.path.join(content_dir, f"section{i % 10}", f"page{i}.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_markdown_corpus(PAGE_BYTES, seed=i))
+
+
+def run_build(content_dir, output_dir, concurrency):
+    filesystem = SlowFileSystem(max_threads=concurrency, latency=LATENCY)
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        asyncio.run(
+            async_build_site(
+                content_dir,
+                output_dir,
+                concurrency=concurrency,
+                incremental=False,
+                filesystem=filesystem,
+            )
+        )
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        filesystem.close()
+    return elapsed, peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        write_content(content_dir)
+        print(
+            f"{PAGE_COUNT} pages of {PAGE_BYTES} bytes, "
+            f"{LATENCY * 1000:.0f} ms injected per read and write"
+        )
+        print(f"{'concurrency':>11} {'seconds':>9} {'pages/s':>9} {'peak MB':>9}")
+        for concurrency in CONCURRENCY_LEVELS:
+            output_dir = os.path.join(tmp, f"public{concurrency}")
+            elapsed, peak = run_build(content_dir, output_dir, concurrency)
+            print(
+                f"{concurrency:>11} {elapsed:>9.2f} {PAGE_COUNT / elapsed:>9.1f} "
+                f"{peak / 1e6:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
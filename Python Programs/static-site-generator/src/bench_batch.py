@@ -0,0 +1,61 @@
+import random
+import time
+
+from block_markdown import markdown_to_html_node
+from markdown_batch import BatchConverter
+
+
+COMMENT_SIZES = [1_000, 10_000, 100_000]
+
+COMMENT_TEMPLATES = [
+    "Thanks!",
+    "LGTM",
+    "+1, this fixed it for me.",
+    "Have you tried `pip install --upgrade {name}`?",
+    "See [the docs](https://example.com/{name}) for **details**.",
+    "- works on _linux_\n- fails on `windows`",
+    "> {name} wrote:\n> it crashes on startup\n\nCan you share the **traceback**?",
+    "# Repro\n\n1. clone {name}\n2. run `make test`",
+]
+
+NAMES = ["alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi"]
+
+
+def make_comments(count, seed=0):
+    """Short, highly repetitive documents, like a comment thread dump."""
+    rng = random.Random(seed)
+    return [
+        rng.choice(COMMENT_TEMPLATES).format(name=rng.choice(NAMES))
+        for _ in range(count)
+    ]
+
+
+def time_loop(comments):
+    start = time.perf_counter()
+    html = [markdown_to_html_node(comment).to_html() for comment in comments]
+    return time.perf_counter() - start, html
+
+
+def time_batch(comments, workers=1):
+    with BatchConverter(workers=workers) as converter:
+        start = time.perf_counter()
+        html = list(converter.convert_many(comments))
+        return time.perf_counter() - start, html
+
+
+def main():
+    print(f"{'comments':>9} {'loop (us/doc)':>14} {'batch (us/doc)':>15} {'speedup':>8}")
+    for count in COMMENT_SIZES:
+        comments = make_comments(count)
+        loop_seconds, expected = time_loop(comments)
+        batch_seconds, html = time_batch(comments)
+        if html != expected:
+            raise ValueError(f"Output mismatch for {count} comments")
+        print(
+            f"{count:>9} {loop_seconds / count * 1e6:>14.2f} "
+            f"{batch_seconds / count * 1e6:>15.2f} {loop_seconds / batch_seconds:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+
+from bench_corpus import make_markdown_corpus
+from block_markdown import (
+    block_to_html_node,
+    iter_block_spans,
+    markdown_to_blocks,
+    markdown_to_html_node,
+)
+from htmlnode import ParentNode
+
+
+def split_markdown_to_html_node(markdown):
+    """markdown_to_html_node as it was, with every block copied up front."""
+    children_html_nodes = []
+    for block_string in markdown_to_blocks(markdown):
+        children_html_nodes.append(block_to_html_node(block_string))
+    return ParentNode("div", children_html_nodes)
+
+
+def walk_copied_blocks(markdown):
+    total = 0
+    for block_string in markdown_to_blocks(markdown):
+        total += len(block_string)
+    return total
+
+
+def walk_block_spans(markdown):
+    total = 0
+    for start, end in iter_block_spans(markdown):
+        total += len(markdown[start:end])
+    return total
+
+
+def peak_memory(func, markdown):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(markdown)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def median_seconds(funcs, markdown, rounds):
+    """Median time of each func, run in alternating rounds."""
+    times = [[] for _ in funcs]
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            for func, func_times in zip(funcs, times):
+                start = time.perf_counter()
+                func(markdown)
+                func_times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return [statistics.median(func_times) for func_times in times]
+
+
+def report(label, markdown, copied, spans, rounds):
+    copied_seconds, spans_seconds = median_seconds([copied, spans], markdown, rounds)
+    copied_peak = peak_memory(copied, markdown)
+    spans_peak = peak_memory(spans, markdown)
+    print(
+        f"{label:>8} {len(markdown) / 1e6:>8.1f} "
+        f"{copied_seconds:>9.3f} {spans_seconds:>9.3f} {spans_seconds / copied_seconds:>6.2f}x "
+        f"{copied_peak / 1e6:>10.1f} {spans_peak / 1e6:>10.1f}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare copying every block up front with slicing block spans"
+    )
+    parser.add_argument("--split-mb", type=float, default=100.0, help="Input size for block splitting")
+    parser.add_argument("--convert-mb", type=float, default=10.0, help="Input size for full conversion")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'stage':>8} {'MB':>8} {'copied s':>9} {'spans s':>9} {'ratio':>7} "
+        f"{'copied MB':>10} {'spans MB':>10}"
+    )
+    markdown = make_markdown_corpus(int(args.split_mb * 1e6))
+    report("split", markdown, walk_copied_blocks, walk_block_spans, args.rounds)
+    del markdown
+
+    markdown = make_markdown_corpus(int(args.convert_mb * 1e6))
+    report("convert", markdown, split_markdown_to_html_node, markdown_to_html_node, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
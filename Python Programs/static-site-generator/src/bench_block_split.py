@@ -0,0 +1,78 @@
+import argparse
+import gc
+import statistics
+import time
+
+from bench_corpus import make_shaped_corpus
+from block_markdown import BlockType, block_to_block_type, markdown_to_blocks
+
+
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+
+
+def split_markdown_to_blocks(markdown):
+    """The original markdown_to_blocks, which knows nothing about fences."""
+    blocks = markdown.split("\n\n")
+    filtered_blocks = []
+    for block in blocks:
+        if block == "":
+            continue
+        stripped_block = block.strip()
+        if stripped_block:
+            filtered_blocks.append(stripped_block)
+    return filtered_blocks
+
+
+def count_code_blocks(blocks):
+    return sum(1 for block in blocks if block_to_block_type(block) == BlockType.CODE)
+
+
+def time_once(func, markdown):
+    start = time.perf_counter()
+    func(markdown)
+    return time.perf_counter() - start
+
+
+def compare(markdown, rounds):
+    """Median split and scanner times, measured in alternating rounds."""
+    split_times = []
+    scan_times = []
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            split_times.append(time_once(split_markdown_to_blocks, markdown))
+            scan_times.append(time_once(markdown_to_blocks, markdown))
+    finally:
+        gc.enable()
+    return statistics.median(split_times), statistics.median(scan_times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare fence-aware block scanning with splitting on blank lines"
+    )
+    parser.add_argument("--shapes", nargs="+", default=["docs", "code", "mixed"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'shape':>6} {'size':>10} {'split ms':>9} {'scan ms':>9} {'ratio':>6} "
+        f"{'split blocks':>12} {'scan blocks':>12} {'split code':>10} {'scan code':>10}"
+    )
+    for shape in args.shapes:
+        for size in args.sizes:
+            markdown = make_shaped_corpus(shape, size)
+            split_blocks = split_markdown_to_blocks(markdown)
+            scan_blocks = markdown_to_blocks(markdown)
+            split_seconds, scan_seconds = compare(markdown, args.rounds)
+            print(
+                f"{shape:>6} {len(markdown):>10} {split_seconds * 1000:>9.2f} "
+                f"{scan_seconds * 1000:>9.2f} {scan_seconds / split_seconds:>5.2f}x "
+                f"{len(split_blocks):>12} {len(scan_blocks):>12} "
+                f"{count_code_blocks(split_blocks):>10} {count_code_blocks(scan_blocks):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import re
+import timeit
+
+from block_markdown import (
+    BlockType,
+    block_to_block_type,
+    block_to_html_node,
+    code_to_html_node,
+    heading_to_html_node,
+    ordered_list_to_html_node,
+    paragraph_to_html_node,
+    quote_to_html_node,
+    unordered_list_to_html_node,
+)
+
+
+SAMPLE_BLOCKS = {
+    BlockType.PARAGRAPH: "\n".join(
+        ["A paragraph line with **bold** and a [link](https://boot.dev)."] * 8
+    ),
+    BlockType.HEADING: "## A heading with `code`",
+    BlockType.CODE: "```\n" + "\n".join(f"line {i} = {i} * 2" for i in range(20)) + "\n```",
+    BlockType.QUOTE: "\n".join(f"> quoted line {i} with _emphasis_" for i in range(8)),
+    BlockType.UNORDERED_LIST: "\n".join(f"- item {i} with **bold**" for i in range(12)),
+    BlockType.ORDERED_LIST: "\n".join(f"{i}. step {i}" for i in range(1, 13)),
+}
+
+
+def legacy_block_to_block_type(block_string):
+    """The original classifier, kept for comparison."""
+    lines = block_string.split("\n")
+
+    if re.match(r"#{1,6} ", block_string):
+        return BlockType.HEADING
+    if block_string.startswith("```") and block_string.endswith("```"):
+        return BlockType.CODE
+    if all(line.startswith(">") for line in lines):
+        return BlockType.QUOTE
+    if all(line.startswith("- ") for line in lines):
+        return BlockType.UNORDERED_LIST
+    if all(line.startswith("* ") for line in lines):
+        return BlockType.UNORDERED_LIST
+
+    is_ordered_list = True
+    expected_number = 1
+    for line in lines:
+        if not line.startswith(f"{expected_number}. "):
+            is_ordered_list = False
+            break
+        expected_number += 1
+    if is_ordered_list and len(lines) > 0:
+        return BlockType.ORDERED_LIST
+
+    return BlockType.PARAGRAPH
+
+
+def legacy_block_to_html_node(block_string):
+    """The original classify-then-if/elif dispatch, kept for comparison."""
+    block_type = legacy_block_to_block_type(block_string)
+    if block_type == BlockType.PARAGRAPH:
+        return paragraph_to_html_node(block_string)
+    if block_type == BlockType.HEADING:
+        return heading_to_html_node(block_string)
+    if block_type == BlockType.CODE:
+        return code_to_html_node(block_string)
+    if block_type == BlockType.QUOTE:
+        return quote_to_html_node(block_string)
+    if block_type == BlockType.UNORDERED_LIST:
+        return unordered_list_to_html_node(block_string)
+    return ordered_list_to_html_node(block_string)
+
+
+def time_per_call(func, block):
+    timer = timeit.Timer(lambda: func(block))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    print(
+        f"{'block type':>16} {'classify old/new (us)':>24} {'convert old/new (us)':>24}"
+    )
+    for block_type, block in SAMPLE_BLOCKS.items():
+        if block_to_block_type(block) != block_type:
+            raise ValueError(f"Sample block is not a {block_type}")
+        old_classify = time_per_call(legacy_block_to_block_type, block)
+        new_classify = time_per_call(block_to_block_type, block)
+        old_convert = time_per_call(legacy_block_to_html_node, block)
+        new_convert = time_per_call(block_to_html_node, block)
+        print(
+            f"{block_type.value:>16} "
+            f"{old_classify * 1e6:>11.2f} /{new_classify * 1e6:>10.2f} "
+            f"{old_convert * 1e6:>11.2f} /{new_convert * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
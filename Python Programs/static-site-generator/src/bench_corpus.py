@@ -0,0 +1,105 @@
+import random
+
+
+PARAGRAPH_SENTENCES = [
+    "This is **bold** text with an _italic_ word.",
+    "Here is some `inline code` in the middle of a sentence.",
+    "Read the [documentation](https://example.com/docs) before you start.",
+    "An ![inline image](https://example.com/img.png) sits in the text.",
+    "Plain prose keeps the paragraph from being all markup.",
+]
+
+
+def make_paragraph(rng, sentences=4):
+    return "\n".join(rng.choice(PARAGRAPH_SENTENCES) for _ in range(sentences))
+
+
+def make_document(rng):
+    blocks = [f"# Document {rng.randrange(10_000)}"]
+    blocks.append(make_paragraph(rng))
+    blocks.append("## Details")
+    blocks.append("\n".join(f"- item {i} with **bold**" for i in range(5)))
+    blocks.append(make_paragraph(rng, sentences=6))
+    blocks.append("> A quoted line\n> with a [link](https://boot.dev)")
+    blocks.append("\n".join(f"{i}. step _{i}_" for i in range(1, 5)))
+    blocks.append("```\ndef main():\n    print('hello')\n```")
+    return "\n\n".join(blocks)
+
+
+def make_markdown_corpus(size_bytes, seed=0):
+    """Builds a mixed markdown document of roughly size_bytes characters."""
+    rng = random.Random(seed)
+    documents = []
+    length = 0
+    while length < size_bytes:
+        document = make_document(rng)
+        documents.append(document)
+        length += len(document) + 2
+    return "\n\n".join(documents)
+
+
+def make_heading_block(rng):
+    level = rng.randint(1, 6)
+    return "#" * level + " " + rng.choice(["Overview", "Setup", "**Usage**", "API `v2`"])
+
+
+def make_list_block(rng):
+    if rng.random() < 0.5:
+        return "\n".join(f"- item {i} with **bold**" for i in range(rng.randint(3, 12)))
+    return "\n".join(f"{i}. step _{i}_" for i in range(1, rng.randint(3, 12)))
+
+
+def make_code_block(rng):
+    body = "\n".join(f"    value_{i} = compute({i}) * 2" for i in range(rng.randint(5, 30)))
+    return f"```\ndef main():\n{body}\n```"
+
+
+def make_spaced_code_block(rng):
+    """A fenced block of several functions with blank lines between them."""
+    functions = []
+    for f in range(rng.randint(2, 5)):
+        body = "\n".join(f"    value_{i} = compute({i}) * 2" for i in range(rng.randint(3, 10)))
+        functions.append(f"def step_{f}():\n{body}\n    return value_0")
+    return "```python\n" + "\n\n\n".join(functions) + "\n```"
+
+
+def make_link_block(rng):
+    return " ".join(
+        f"[link {i}](https://example.com/{rng.randrange(100_000)}) and "
+        f"![img {i}](https://example.com/img/{i}.png)"
+        for i in range(rng.randint(5, 20))
+    )
+
+
+def make_long_paragraph(rng):
+    return make_paragraph(rng, sentences=rng.randint(40, 80))
+
+
+SHAPE_BLOCKS = {
+    "heading": (make_heading_block, make_paragraph),
+    "list": (make_list_block,),
+    "code": (make_code_block, make_code_block, make_paragraph),
+    "docs": (make_heading_block, make_paragraph, make_spaced_code_block, make_spaced_code_block),
+    "link": (make_link_block,),
+    "paragraph": (make_long_paragraph,),
+}
+
+CORPUS_SHAPES = ["mixed"] + list(SHAPE_BLOCKS)
+
+
+def make_shaped_corpus(shape, size_bytes, seed=0):
+    """Builds a document of roughly size_bytes dominated by one kind of block.
+
+    shape is one of CORPUS_SHAPES; "mixed" is make_markdown_corpus.
+    """
+    if shape == "mixed":
+        return make_markdown_corpus(size_bytes, seed)
+    makers = SHAPE_BLOCKS[shape]
+    rng = random.Random(seed)
+    blocks = []
+    length = 0
+    while length < size_bytes:
+        block = makers[len(blocks) % len(makers)](rng)
+        blocks.append(block)
+        length += len(block) + 2
+    return "\n\n".join(blocks)
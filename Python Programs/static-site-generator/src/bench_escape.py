@@ -0,0 +1,121 @@
+import gc
+import statistics
+import time
+
+import htmlnode
+from bench_corpus import CORPUS_SHAPES, make_shaped_corpus
+from block_markdown import markdown_to_html_node
+from htmlnode import FrozenParentNode, LeafNode, ParentNode
+
+
+CORPUS_SIZE = 1_000_000
+
+# Escaping, as configured by default, may add at most this much to to_html
+# on any corpus shape.
+OVERHEAD_BUDGET = 0.15
+
+
+def unescaped_to_html(self):
+    """LeafNode.to_html before text escaping, kept for comparison."""
+    if self.value is None:
+        raise ValueError("LeafNode requires a value to render to HTML")
+
+    if self.tag is None:
+        return self.value
+
+    return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+
+
+def unescaped_iter_html(self):
+    """ParentNode.iter_html before text escaping, kept for comparison."""
+    yield f"<{self.tag}{self.props_to_html()}>"
+    stack = [(self, iter(self.children))]
+    while stack:
+        node, children = stack[-1]
+        for child_node in children:
+            if isinstance(child_node, LeafNode):
+                yield child_node.to_html()
+            elif isinstance(child_node, FrozenParentNode) and child_node._html is not None:
+                yield child_node._html
+            elif isinstance(child_node, ParentNode):
+                yield f"<{child_node.tag}{child_node.props_to_html()}>"
+                stack.append((child_node, iter(child_node.children)))
+                break
+            else:
+                yield from child_node.iter_html()
+        else:
+            stack.pop()
+            yield f"</{node.tag}>"
+
+
+class Renderer:
+    def __init__(self, to_html, iter_html, run_threshold):
+        self.to_html = to_html
+        self.iter_html = iter_html
+        self.run_threshold = run_threshold
+
+    def __enter__(self):
+        self.saved = LeafNode.to_html, ParentNode.iter_html, htmlnode.ESCAPE_RUN_THRESHOLD
+        LeafNode.to_html = self.to_html
+        ParentNode.iter_html = self.iter_html
+        htmlnode.ESCAPE_RUN_THRESHOLD = self.run_threshold
+
+    def __exit__(self, *exc):
+        LeafNode.to_html, ParentNode.iter_html, htmlnode.ESCAPE_RUN_THRESHOLD = self.saved
+
+
+RENDERERS = {
+    "unescaped": Renderer(unescaped_to_html, unescaped_iter_html, None),
+    "per leaf": Renderer(LeafNode.to_html, ParentNode.iter_html, htmlnode.ESCAPE_RUN_THRESHOLD),
+    "runs": Renderer(LeafNode.to_html, ParentNode.iter_html, 32),
+}
+
+
+def overhead_ratios(tree, rounds=15):
+    """Median time of each renderer relative to the unescaped one.
+
+    Renderers take turns within each round and the ratio is taken per
+    round, so a burst of machine noise skews one round, not the result.
+    The garbage collector is paused, as timeit does, so its passes over the
+    large tree do not land on whichever renderer happens to trigger them.
+    """
+    ratios = {name: [] for name in RENDERERS}
+    base_times = []
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            times = {}
+            for name, renderer in RENDERERS.items():
+                with renderer:
+                    start = time.perf_counter()
+                    tree.to_html()
+                    times[name] = time.perf_counter() - start
+            base_times.append(times["unescaped"])
+            for name, seconds in times.items():
+                ratios[name].append(seconds / times["unescaped"])
+    finally:
+        gc.enable()
+    return min(base_times), {name: statistics.median(values) for name, values in ratios.items()}
+
+
+def main():
+    print(f"{'shape':>10} {'unescaped (ms)':>15} {'per leaf':>10} {'runs':>10}")
+    overheads = {}
+    for shape in CORPUS_SHAPES:
+        tree = markdown_to_html_node(make_shaped_corpus(shape, CORPUS_SIZE))
+        base, ratios = overhead_ratios(tree)
+        overheads[shape] = ratios["per leaf"] - 1
+        print(
+            f"{shape:>10} {base * 1000:>15.2f} "
+            f"{ratios['per leaf'] - 1:>+10.1%} {ratios['runs'] - 1:>+10.1%}"
+        )
+    worst = max(overheads, key=overheads.get)
+    status = "within" if overheads[worst] <= OVERHEAD_BUDGET else "OVER"
+    print(
+        f"largest overhead {overheads[worst]:+.1%} ({worst}), "
+        f"{status} the {OVERHEAD_BUDGET:.0%} budget"
+    )
+
+
+if __name__ == "__main__":
+    main()
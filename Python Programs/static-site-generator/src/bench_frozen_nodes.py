@@ -0,0 +1,50 @@
+import time
+
+from bench_corpus import make_markdown_corpus
+from block_markdown import markdown_to_html_node
+
+
+CORPUS_SIZES = [100_000, 1_000_000]
+RENDERS = [1, 3, 10]
+
+
+def render_times(tree, renders):
+    start = time.perf_counter()
+    for _ in range(renders):
+        tree.to_html()
+    return time.perf_counter() - start
+
+
+def main():
+    print(
+        f"{'size':>9} {'renders':>8} {'plain (ms)':>11} {'leaves (ms)':>12} "
+        f"{'subtree (ms)':>13} {'speedup':>8}"
+    )
+    for size in CORPUS_SIZES:
+        markdown = make_markdown_corpus(size)
+        expected = markdown_to_html_node(markdown).to_html()
+        for renders in RENDERS:
+            plain_tree = markdown_to_html_node(markdown)
+            plain = render_times(plain_tree, renders)
+
+            # Freezing is part of the cost, since it renders every leaf.
+            leaves_tree = markdown_to_html_node(markdown)
+            start = time.perf_counter()
+            leaves_tree.freeze(cache_html=False)
+            leaves = time.perf_counter() - start + render_times(leaves_tree, renders)
+
+            subtree_tree = markdown_to_html_node(markdown)
+            start = time.perf_counter()
+            subtree_tree.freeze()
+            subtree = time.perf_counter() - start + render_times(subtree_tree, renders)
+
+            if leaves_tree.to_html() != expected or subtree_tree.to_html() != expected:
+                raise ValueError(f"Output mismatch for {size} bytes")
+            print(
+                f"{len(markdown):>9} {renders:>8} {plain * 1000:>11.2f} "
+                f"{leaves * 1000:>12.2f} {subtree * 1000:>13.2f} {plain / subtree:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import time
+
+from htmlnode import LeafNode, ParentNode
+
+
+def recursive_to_html(node):
+    """The original recursive, concatenating ParentNode.to_html."""
+    if not isinstance(node, ParentNode):
+        return node.to_html()
+    children_html_content = ""
+    for child_node in node.children:
+        children_html_content += recursive_to_html(child_node)
+    return f"<{node.tag}{node.props_to_html()}>{children_html_content}</{node.tag}>"
+
+
+def make_deep_tree(depth):
+    node = LeafNode("b", "core")
+    for i in range(depth):
+        node = ParentNode("blockquote", [LeafNode(None, f"level {i} "), node])
+    return node
+
+
+def make_wide_tree(paragraphs, leaves_per_paragraph):
+    return ParentNode(
+        "div",
+        [
+            ParentNode(
+                "p",
+                [
+                    LeafNode("a", f"link {j}", {"href": f"/page/{i}/{j}"})
+                    for j in range(leaves_per_paragraph)
+                ],
+            )
+            for i in range(paragraphs)
+        ],
+    )
+
+
+def best_of(func, node, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(node)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    # The recursive renderer cannot go much deeper than the default
+    # recursion limit, so the deep cases stay below it.
+    trees = [
+        ("deep 100", make_deep_tree(100)),
+        ("deep 900", make_deep_tree(900)),
+        ("wide 1k x 10", make_wide_tree(1_000, 10)),
+        ("wide 10k x 10", make_wide_tree(10_000, 10)),
+    ]
+    print(f"{'tree':>14} {'recursive (ms)':>16} {'iterative (ms)':>16} {'ratio':>7}")
+    for name, tree in trees:
+        if recursive_to_html(tree) != tree.to_html():
+            raise ValueError(f"Output mismatch for {name}")
+        recursive = best_of(recursive_to_html, tree)
+        iterative = best_of(ParentNode.to_html, tree)
+        print(
+            f"{name:>14} {recursive * 1000:>16.2f} {iterative * 1000:>16.2f} "
+            f"{recursive / iterative:>6.2f}x"
+        )
+
+    # Past the recursion limit the recursive renderer fails; run it anyway
+    # so the row reports what actually happened.
+    very_deep = make_deep_tree(100_000)
+    try:
+        recursive = f"{best_of(recursive_to_html, very_deep, repeat=1) * 1000:.2f}"
+    except RecursionError as e:
+        recursive = type(e).__name__
+    iterative = best_of(ParentNode.to_html, very_deep, repeat=1)
+    print(f"{'deep 100k':>14} {recursive:>16} {iterative * 1000:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
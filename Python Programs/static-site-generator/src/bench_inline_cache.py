@@ -0,0 +1,51 @@
+import time
+
+from bench_corpus import make_markdown_corpus
+from block_cache import InlineCache
+from block_markdown import inline_cache, markdown_to_html_node
+
+
+PAGE_COUNT = 2_000
+
+NAVIGATION = "\n".join(
+    f"- [{title}](/{title.lower()}/)"
+    for title in ["Home", "Blog", "Projects", "Talks", "About", "Contact"]
+)
+FOOTER = "Built with **static-site-generator** | [RSS](/feed.xml) | _All rights reserved_"
+
+
+def make_pages():
+    """Pages whose navigation and footer repeat on every page."""
+    return [
+        "\n\n".join([NAVIGATION, make_markdown_corpus(1_000, seed=i), FOOTER])
+        for i in range(PAGE_COUNT)
+    ]
+
+
+def render_all(pages, cache=None):
+    start = time.perf_counter()
+    with inline_cache(cache):
+        html = [markdown_to_html_node(page).to_html() for page in pages]
+    return time.perf_counter() - start, html
+
+
+def main():
+    pages = make_pages()
+    baseline, expected = render_all(pages)
+    print(f"{PAGE_COUNT} pages with shared navigation and footer")
+    print(f"{'inline cache':>13} {'ms/page':>9} {'speedup':>8} {'hit rate':>9}")
+    print(f"{'off':>13} {baseline / PAGE_COUNT * 1000:>9.3f} {1:>7.2f}x {'':>9}")
+    for mode in InlineCache.MODES:
+        cache = InlineCache(mode=mode)
+        seconds, html = render_all(pages, cache)
+        if html != expected:
+            raise ValueError(f"Output mismatch in {mode} mode")
+        print(
+            f"{mode:>13} {seconds / PAGE_COUNT * 1000:>9.3f} "
+            f"{baseline / seconds:>7.2f}x {cache.hit_rate:>8.1%}"
+        )
+        print(f"{'':>13} {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
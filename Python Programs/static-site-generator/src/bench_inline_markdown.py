@@ -0,0 +1,67 @@
+import timeit
+
+from textnode import TextNode, TextType
+from inline_markdown import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+
+
+SAMPLE_FRAGMENTS = [
+    "This is **bold** text ",
+    "with an _italic_ word, ",
+    "some `inline code`, ",
+    "an ![image](https://example.com/img.png) ",
+    "and a [link](https://boot.dev). ",
+    "Then some plain prose follows. ",
+]
+
+PARAGRAPH_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def chained_text_to_textnodes(text):
+    """The original five-pass implementation, kept for comparison."""
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return nodes
+
+
+def make_paragraph(size):
+    fragments = []
+    length = 0
+    while length < size:
+        fragment = SAMPLE_FRAGMENTS[len(fragments) % len(SAMPLE_FRAGMENTS)]
+        fragments.append(fragment)
+        length += len(fragment)
+    return "".join(fragments)
+
+
+def time_per_call(func, text):
+    timer = timeit.Timer(lambda: func(text))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    print(f"{'size':>8} {'chained (ms)':>14} {'single (ms)':>14} {'speedup':>8}")
+    for size in PARAGRAPH_SIZES:
+        text = make_paragraph(size)
+        if chained_text_to_textnodes(text) != text_to_textnodes(text):
+            raise ValueError(f"Output mismatch for paragraph of {size} bytes")
+
+        chained = time_per_call(chained_text_to_textnodes, text)
+        single = time_per_call(text_to_textnodes, text)
+        print(
+            f"{len(text):>8} {chained * 1000:>14.4f} {single * 1000:>14.4f} "
+            f"{chained / single:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
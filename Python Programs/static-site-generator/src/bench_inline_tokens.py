@@ -0,0 +1,97 @@
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from bench_corpus import make_paragraph
+from inline_markdown import text_to_textnodes, text_to_tokens
+from inline_tokens import tokens_to_html
+from textnode import text_node_to_html_node
+
+
+def make_paragraphs(count, seed=0):
+    """count paragraphs as paragraph_to_html_node hands them to the inline
+    parser, with their lines joined by spaces."""
+    rng = random.Random(seed)
+    return [make_paragraph(rng).replace("\n", " ") for _ in range(count)]
+
+
+def textnodes_to_html(paragraphs):
+    for text in paragraphs:
+        "".join(
+            text_node_to_html_node(text_node).to_html()
+            for text_node in text_to_textnodes(text)
+        )
+
+
+def tokens_html(paragraphs):
+    for text in paragraphs:
+        tokens_to_html(text_to_tokens(text))
+
+
+def tokenize_textnodes(paragraphs):
+    for text in paragraphs:
+        text_to_textnodes(text)
+
+
+def tokenize_tokens(paragraphs):
+    for text in paragraphs:
+        text_to_tokens(text)
+
+
+def seconds(func, paragraphs):
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        func(paragraphs)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def retained(tokenize, paragraphs):
+    """Allocated blocks and bytes held by the tokens of every paragraph."""
+    gc.collect()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    results = [tokenize(text) for text in paragraphs]
+    blocks = sys.getallocatedblocks() - blocks_before
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return blocks, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare TextNode lists with the array-backed InlineTokens"
+    )
+    parser.add_argument("--paragraphs", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    paragraphs = make_paragraphs(args.paragraphs)
+    megabytes = sum(len(text) for text in paragraphs) / 1e6
+    print(f"{len(paragraphs)} paragraphs, {megabytes:.1f} MB")
+
+    print(f"{'stage':>10} {'textnodes s':>12} {'tokens s':>9} {'speedup':>8} {'paragraphs/s':>13}")
+    for stage, old, new in [
+        ("tokenize", tokenize_textnodes, tokenize_tokens),
+        ("to html", textnodes_to_html, tokens_html),
+    ]:
+        old_seconds = seconds(old, paragraphs)
+        new_seconds = seconds(new, paragraphs)
+        print(
+            f"{stage:>10} {old_seconds:>12.2f} {new_seconds:>9.2f} "
+            f"{old_seconds / new_seconds:>7.2f}x {len(paragraphs) / new_seconds:>13.0f}"
+        )
+
+    print(f"{'retained':>10} {'blocks':>12} {'MB':>9} {'bytes/paragraph':>16}")
+    for label, tokenize in [("textnodes", text_to_textnodes), ("tokens", text_to_tokens)]:
+        blocks, size = retained(tokenize, paragraphs)
+        print(f"{label:>10} {blocks:>12} {size / 1e6:>9.1f} {size / len(paragraphs):>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_corpus import make_markdown_corpus
+from block_markdown import (
+    block_to_html,
+    iter_block_spans,
+    markdown_file_to_html_stream,
+    markdown_to_html_node,
+)
+
+
+def render_read_tree(source_path, dest):
+    """What render_page does: read, decode and convert the whole file."""
+    with open(source_path, "rb") as source:
+        markdown = source.read().decode("utf-8")
+    dest.write(markdown_to_html_node(markdown).to_html())
+
+
+def render_read_stream(source_path, dest):
+    """Reads the whole file, then renders and writes it block by block."""
+    with open(source_path, "rb") as source:
+        markdown = source.read().decode("utf-8")
+    dest.write("<div>")
+    for start, end in iter_block_spans(markdown):
+        dest.write(block_to_html(markdown[start:end]))
+    dest.write("</div>")
+
+
+def render_mmap_stream(source_path, dest):
+    for fragment in markdown_file_to_html_stream(source_path):
+        dest.write(fragment)
+
+
+def do_nothing(source_path, dest):
+    pass
+
+
+MODES = {
+    "baseline": do_nothing,
+    "read-tree": render_read_tree,
+    "read-stream": render_read_stream,
+    "mmap-stream": render_mmap_stream,
+}
+
+
+def peak_rss_mb():
+    # Linux carries ru_maxrss over from the parent across fork and exec,
+    # so prefer VmHWM, which starts again with the new program.
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def run_child(mode, source_path, dest_path):
+    start = time.perf_counter()
+    with open(dest_path, "w", encoding="utf-8") as dest:
+        MODES[mode](source_path, dest)
+    print(f"{time.perf_counter() - start} {peak_rss_mb()}")
+
+
+def measure(mode, source_path, dest_path):
+    """Runs one mode in a fresh process and returns (seconds, peak RSS MB)."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, source_path, dest_path],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    seconds, peak = result.stdout.split()
+    return float(seconds), float(peak)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare peak RSS of reading a markdown file whole with memory-mapping it"
+    )
+    parser.add_argument("--size-mb", type=float, default=100.0)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "SOURCE", "DEST"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        run_child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = os.path.join(tmp, "page.md")
+        dest_path = os.path.join(tmp, "page.html")
+        with open(source_path, "w", encoding="utf-8") as f:
+            f.write(make_markdown_corpus(int(args.size_mb * 1e6)))
+        size_mb = os.path.getsize(source_path) / 1e6
+
+        print(f"source: {size_mb:.1f} MB")
+        print(f"{'mode':>12} {'seconds':>9} {'peak RSS MB':>12} {'x source':>9}")
+        for mode in args.modes:
+            seconds, peak = measure(mode, source_path, dest_path)
+            print(f"{mode:>12} {seconds:>9.2f} {peak:>12.1f} {peak / size_mb:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
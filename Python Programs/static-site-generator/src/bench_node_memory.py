@@ -0,0 +1,112 @@
+import argparse
+import gc
+import tracemalloc
+
+import block_markdown
+import htmlnode
+import inline_markdown
+import textnode
+from block_markdown import markdown_to_blocks, markdown_to_html_node
+from bench_corpus import make_markdown_corpus
+
+
+# Subclasses without __slots__ get a per-instance __dict__ again, which is
+# what every node carried before the node classes declared __slots__.
+class DictTextNode(textnode.TextNode):
+    pass
+
+
+class DictLeafNode(htmlnode.LeafNode):
+    pass
+
+
+class DictParentNode(htmlnode.ParentNode):
+    pass
+
+
+SLOTTED_CLASSES = {
+    "TextNode": textnode.TextNode,
+    "LeafNode": htmlnode.LeafNode,
+    "ParentNode": htmlnode.ParentNode,
+}
+
+DICT_CLASSES = {
+    "TextNode": DictTextNode,
+    "LeafNode": DictLeafNode,
+    "ParentNode": DictParentNode,
+}
+
+PATCHED_MODULES = [block_markdown, inline_markdown, textnode]
+
+
+def use_node_classes(classes):
+    for module in PATCHED_MODULES:
+        for name, cls in classes.items():
+            if hasattr(module, name):
+                setattr(module, name, cls)
+
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        count += 1
+        if current.children:
+            stack.extend(current.children)
+    return count
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def measure_html_tree(markdown):
+    tree, current, peak = measure(lambda: markdown_to_html_node(markdown))
+    return count_nodes(tree), current, peak
+
+
+def measure_text_nodes(paragraphs):
+    def build():
+        return [inline_markdown.text_to_textnodes(p) for p in paragraphs]
+
+    node_lists, current, peak = measure(build)
+    return sum(len(nodes) for nodes in node_lists), current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report bytes per node with and without __slots__."
+    )
+    parser.add_argument("--size-mb", type=float, default=50.0)
+    args = parser.parse_args()
+
+    markdown = make_markdown_corpus(int(args.size_mb * 1024 * 1024))
+    paragraphs = [
+        block.replace("\n", " ")
+        for block in markdown_to_blocks(markdown)
+        if block_markdown.block_to_block_type(block) == block_markdown.BlockType.PARAGRAPH
+    ]
+    print(f"corpus: {len(markdown) / 1024 / 1024:.1f} MB, {len(paragraphs)} paragraphs")
+
+    print(f"{'nodes':>12} {'layout':>8} {'count':>10} {'bytes/node':>11} {'peak MB':>9}")
+    for layout, classes in [("dict", DICT_CLASSES), ("slots", SLOTTED_CLASSES)]:
+        use_node_classes(classes)
+        for label, (count, current, peak) in [
+            ("HTMLNode", measure_html_tree(markdown)),
+            ("TextNode", measure_text_nodes(paragraphs)),
+        ]:
+            print(
+                f"{label:>12} {layout:>8} {count:>10} {current / count:>11.1f} "
+                f"{peak / 1024 / 1024:>9.1f}"
+            )
+    use_node_classes(SLOTTED_CLASSES)
+
+
+if __name__ == "__main__":
+    main()
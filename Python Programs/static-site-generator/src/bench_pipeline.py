@@ -0,0 +1,202 @@
+import argparse
+import cProfile
+import json
+import os
+import platform
+import subprocess
+import time
+
+from bench_corpus import CORPUS_SHAPES, make_shaped_corpus
+from block_markdown import (
+    block_to_block_type,
+    inline_cache,
+    markdown_to_blocks,
+    markdown_to_html_node,
+)
+from inline_markdown import text_to_textnodes
+from textnode import text_node_to_html_node
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+STAGES = [
+    "markdown_to_blocks",
+    "block_to_block_type",
+    "text_to_textnodes",
+    "text_node_to_html_node",
+    "to_html",
+]
+
+
+class InlineTextRecorder:
+    """Stands in for an InlineCache to collect every text_to_children input.
+
+    It never hits, so conversion runs normally, and each text is recorded
+    on its way into the cache.
+    """
+
+    def __init__(self):
+        self.texts = []
+
+    def get(self, text):
+        return None
+
+    def freeze(self, children):
+        return children
+
+    def put(self, text, children):
+        self.texts.append(text)
+
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(getattr(node, "children", None) or ())
+    return count
+
+
+def prepare_stages(markdown):
+    """Returns {stage: (func, arg, item_count)}, each stage fed the real
+    output of the stage before it, so stages can be timed on their own."""
+    blocks = markdown_to_blocks(markdown)
+    recorder = InlineTextRecorder()
+    with inline_cache(recorder):
+        markdown_to_html_node(markdown)
+    texts = recorder.texts
+    text_nodes = [node for text in texts for node in text_to_textnodes(text)]
+    tree = markdown_to_html_node(markdown)
+
+    def classify_all(blocks):
+        for block in blocks:
+            block_to_block_type(block)
+
+    def tokenize_all(texts):
+        for text in texts:
+            text_to_textnodes(text)
+
+    def convert_all(text_nodes):
+        for text_node in text_nodes:
+            text_node_to_html_node(text_node)
+
+    return {
+        "markdown_to_blocks": (markdown_to_blocks, markdown, len(blocks)),
+        "block_to_block_type": (classify_all, blocks, len(blocks)),
+        "text_to_textnodes": (tokenize_all, texts, len(texts)),
+        "text_node_to_html_node": (convert_all, text_nodes, len(text_nodes)),
+        "to_html": (type(tree).to_html, tree, count_nodes(tree)),
+    }
+
+
+def time_stage(func, arg, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def profile_stage(func, arg, path):
+    profiler = cProfile.Profile()
+    profiler.runcall(func, arg)
+    profiler.dump_stats(path)
+
+
+def git_revision():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run(shapes, sizes, repeat=3, profile_dir=None):
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            markdown = make_shaped_corpus(shape, size)
+            stages = prepare_stages(markdown)
+            for stage in STAGES:
+                func, arg, items = stages[stage]
+                seconds = time_stage(func, arg, repeat)
+                results.append(
+                    {
+                        "shape": shape,
+                        "size": len(markdown),
+                        "stage": stage,
+                        "items": items,
+                        "seconds": seconds,
+                        "mb_per_second": len(markdown) / seconds / 1e6 if seconds else None,
+                    }
+                )
+                if profile_dir is not None:
+                    path = os.path.join(profile_dir, f"{shape}-{size}-{stage}.pstats")
+                    profile_stage(func, arg, path)
+    return results
+
+
+def compare(results, baseline):
+    """Adds each result's time relative to the matching baseline entry."""
+    previous = {
+        (entry["shape"], entry["size"], entry["stage"]): entry["seconds"]
+        for entry in baseline["results"]
+    }
+    for entry in results:
+        before = previous.get((entry["shape"], entry["size"], entry["stage"]))
+        entry["vs_baseline"] = entry["seconds"] / before if before else None
+
+
+def print_table(results):
+    print(f"{'shape':>10} {'size':>9} {'stage':>23} {'items':>8} {'ms':>10} {'MB/s':>8} {'vs base':>8}")
+    for entry in results:
+        ratio = entry.get("vs_baseline")
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else ""
+        print(
+            f"{entry['shape']:>10} {entry['size']:>9} {entry['stage']:>23} "
+            f"{entry['items']:>8} {entry['seconds'] * 1000:>10.3f} "
+            f"{entry['mb_per_second'] or 0:>8.2f} {ratio_text:>8}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each stage of the markdown pipeline")
+    parser.add_argument("--shapes", nargs="+", choices=CORPUS_SHAPES, default=CORPUS_SHAPES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs")
+    parser.add_argument("--output", default=None, help="Write results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="JSON file from an earlier run")
+    parser.add_argument(
+        "--profile-dir", default=None, help="Dump a cProfile .pstats file per stage here"
+    )
+    args = parser.parse_args(argv)
+
+    if args.profile_dir is not None:
+        os.makedirs(args.profile_dir, exist_ok=True)
+    results = run(args.shapes, args.sizes, args.repeat, args.profile_dir)
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(results, json.load(f))
+    print_table(results)
+
+    if args.output is not None:
+        report = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
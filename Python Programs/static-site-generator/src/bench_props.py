@@ -0,0 +1,59 @@
+import random
+import time
+
+from block_markdown import markdown_to_html_node
+from htmlnode import HTMLNode
+
+
+LINK_COUNT = 50_000
+
+
+def concatenating_props_to_html(self):
+    """The original unescaped, concatenating props_to_html."""
+    if self.props is None:
+        return ""
+
+    attributes = ""
+    for key, val in self.props.items():
+        attributes += f' {key}="{val}"'
+    return attributes
+
+
+def make_link_page(distinct_urls, seed=0):
+    """A page of LINK_COUNT links drawn from distinct_urls different targets."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(LINK_COUNT):
+        target = rng.randrange(distinct_urls)
+        lines.append(f"- [link {i}](https://example.com/search?q={target}&page=2)")
+    return "\n".join(lines)
+
+
+def time_render(tree, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tree.to_html()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print(f"{LINK_COUNT} links per page")
+    print(f"{'distinct urls':>14} {'old (ms)':>10} {'new (ms)':>10} {'ratio':>7}")
+    for distinct_urls in [10, 1_000, LINK_COUNT]:
+        tree = markdown_to_html_node(make_link_page(distinct_urls))
+        new = time_render(tree)
+
+        props_to_html = HTMLNode.props_to_html
+        HTMLNode.props_to_html = concatenating_props_to_html
+        try:
+            old = time_render(tree)
+        finally:
+            HTMLNode.props_to_html = props_to_html
+        print(f"{distinct_urls:>14} {old * 1000:>10.2f} {new * 1000:>10.2f} {old / new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import time
+
+from textnode import TextNode, TextType
+from inline_markdown import extract_markdown_links, split_nodes_link
+
+
+LINK_COUNTS = [100, 1_000, 10_000]
+
+
+def split_nodes_link_by_str_split(old_nodes):
+    """The original findall + str.split implementation, kept for comparison."""
+    new_nodes = []
+    for old_node in old_nodes:
+        if old_node.text_type != TextType.TEXT:
+            new_nodes.append(old_node)
+            continue
+
+        remaining_text = old_node.text
+        for anchor_text, url in extract_markdown_links(remaining_text):
+            parts = remaining_text.split(f"[{anchor_text}]({url})", 1)
+            if len(parts) < 2:
+                continue
+            if parts[0]:
+                new_nodes.append(TextNode(parts[0], TextType.TEXT))
+            new_nodes.append(TextNode(anchor_text, TextType.LINK, url))
+            remaining_text = parts[1]
+
+        if remaining_text:
+            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
+
+    return new_nodes
+
+
+def make_block(link_count):
+    return " ".join(
+        f"see [page {i}](https://example.com/pages/{i}) for details,"
+        for i in range(link_count)
+    )
+
+
+def best_of(func, nodes, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(nodes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print(f"{'links':>8} {'str.split (ms)':>16} {'offsets (ms)':>14} {'speedup':>8}")
+    for link_count in LINK_COUNTS:
+        nodes = [TextNode(make_block(link_count), TextType.TEXT)]
+        if split_nodes_link_by_str_split(nodes) != split_nodes_link(nodes):
+            raise ValueError(f"Output mismatch for {link_count} links")
+
+        old = best_of(split_nodes_link_by_str_split, nodes)
+        new = best_of(split_nodes_link, nodes)
+        print(
+            f"{link_count:>8} {old * 1000:>16.2f} {new * 1000:>14.2f} "
+            f"{old / new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
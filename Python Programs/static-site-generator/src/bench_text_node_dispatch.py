@@ -0,0 +1,126 @@
+import argparse
+import gc
+import statistics
+import time
+
+from bench_corpus import make_shaped_corpus
+from block_markdown import markdown_to_blocks
+from htmlnode import LeafNode
+from inline_markdown import text_to_textnodes
+from textnode import (
+    EXTENSION_TEXT_TYPES,
+    TextType,
+    text_node_to_html,
+    text_node_to_html_node,
+)
+
+
+def chained_text_node_to_html_node(text_node):
+    """The original text_node_to_html_node: an isinstance check and a
+    chain of comparisons."""
+    if not isinstance(text_node.text_type, TextType):
+        to_html_node = EXTENSION_TEXT_TYPES.get(text_node.text_type)
+        if to_html_node is None:
+            raise ValueError(f"Invalid TextType: {text_node.text_type}")
+        return to_html_node(text_node)
+
+    if text_node.text_type == TextType.TEXT:
+        return LeafNode(None, text_node.text)
+    if text_node.text_type == TextType.BOLD:
+        return LeafNode("b", text_node.text)
+    if text_node.text_type == TextType.ITALIC:
+        return LeafNode("i", text_node.text)
+    if text_node.text_type == TextType.CODE:
+        return LeafNode("code", text_node.text)
+    if text_node.text_type == TextType.LINK:
+        if text_node.url is None:
+            raise ValueError("Link TextNode requires a URL")
+        return LeafNode("a", text_node.text, {"href": text_node.url})
+    if text_node.text_type == TextType.IMAGE:
+        if text_node.url is None:
+            raise ValueError("Image TextNode requires a URL for src attribute")
+        if text_node.text is None:
+            raise ValueError("Image TextNode requires text for alt attribute")
+        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+
+    raise ValueError(f"Unsupported text type: {text_node.text_type}")
+
+
+def build_chained(text_nodes):
+    for text_node in text_nodes:
+        chained_text_node_to_html_node(text_node)
+
+
+def build_table(text_nodes):
+    for text_node in text_nodes:
+        text_node_to_html_node(text_node)
+
+
+def render_chained(text_nodes):
+    for text_node in text_nodes:
+        chained_text_node_to_html_node(text_node).to_html()
+
+
+def render_table(text_nodes):
+    for text_node in text_nodes:
+        text_node_to_html_node(text_node).to_html()
+
+
+def render_direct(text_nodes):
+    for text_node in text_nodes:
+        text_node_to_html(text_node)
+
+
+CASES = [
+    ("build", "chained", build_chained),
+    ("build", "table", build_table),
+    ("to html", "chained", render_chained),
+    ("to html", "table", render_table),
+    ("to html", "direct", render_direct),
+]
+
+
+def link_text_nodes(size_bytes):
+    text_nodes = []
+    for block in markdown_to_blocks(make_shaped_corpus("link", size_bytes)):
+        text_nodes.extend(text_to_textnodes(block.replace("\n", " ")))
+    return text_nodes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare text_node_to_html_node dispatch and direct rendering"
+    )
+    parser.add_argument("--size", type=int, default=5_000_000, help="Corpus size in bytes")
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    text_nodes = link_text_nodes(args.size)
+    counts = {}
+    for text_node in text_nodes:
+        counts[text_node.text_type.value] = counts.get(text_node.text_type.value, 0) + 1
+    print(f"{len(text_nodes)} text nodes: {counts}")
+
+    times = {(stage, variant): [] for stage, variant, _ in CASES}
+    gc.disable()
+    try:
+        for _ in range(args.rounds):
+            for stage, variant, func in CASES:
+                start = time.perf_counter()
+                func(text_nodes)
+                times[stage, variant].append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    print(f"{'stage':>8} {'variant':>8} {'ms':>9} {'nodes/s':>12} {'vs chained':>11}")
+    for stage, variant, _ in CASES:
+        seconds = statistics.median(times[stage, variant])
+        chained = statistics.median(times[stage, "chained"])
+        print(
+            f"{stage:>8} {variant:>8} {seconds * 1000:>9.1f} "
+            f"{len(text_nodes) / seconds:>12.0f} {chained / seconds:>10.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from build_manifest import GENERATOR_VERSION
+from htmlnode import RawHTMLNode
+
+
+class LRUCache:
+    """A bounded mapping that evicts the least recently used entry.
+
+    Counts hits, misses and evictions so callers can check it is working.
+    """
+
+    def __init__(self, max_entries=10_000):
+        if max_entries < 1:
+            raise ValueError(f"{type(self).__name__} requires max_entries >= 1")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}({len(self._entries)}/{self.max_entries} entries, "
+            f"{self.hits} hits, {self.misses} misses)"
+        )
+
+
+class BlockCache(LRUCache):
+    """A bounded LRU cache from markdown block hashes to rendered HTML.
+
+    If path is given, entries are loaded from it on creation and written
+    back by save(). A file written by a different generator version is
+    ignored. Such a cache also remembers what was put since the last
+    take_added(), so entries rendered in pool workers can be sent back to
+    the process that saves it.
+    """
+
+    def __init__(self, max_entries=10_000, path=None):
+        super().__init__(max_entries)
+        self.path = path
+        self._added = None
+        if path is not None:
+            self._added = {}
+            self.load()
+
+    def put(self, key, value):
+        super().put(key, value)
+        if self._added is not None:
+            self._added[key] = value
+
+    def take_added(self):
+        """Returns the (key, html) pairs put since the last call, oldest
+        first, and forgets them."""
+        if not self._added:
+            return []
+        added = list(self._added.items())
+        self._added.clear()
+        return added
+
+    @staticmethod
+    def key_for(block_string):
+        return hashlib.blake2b(block_string.encode("utf-8"), digest_size=16).hexdigest()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data["generator"] != GENERATOR_VERSION:
+                return
+            entries = data["entries"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        for key, html in entries[-self.max_entries :]:
+            self._entries[key] = html
+
+    def save(self):
+        if self.path is None:
+            raise ValueError("BlockCache has no path to save to")
+        data = {
+            "generator": GENERATOR_VERSION,
+            "entries": list(self._entries.items()),
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+
+class InlineCache(LRUCache):
+    """A bounded LRU cache from inline markdown text to its rendered children.
+
+    Keys are the text itself, since inline fragments are short. Values are
+    tuples of frozen nodes, shared between every block that contains the
+    same text. In "html" mode the tuple holds one raw leaf with the
+    pre-rendered HTML; in "nodes" mode it holds the parsed child nodes, for
+    callers that walk the tree rather than only rendering it.
+    """
+
+    MODES = ("html", "nodes")
+
+    def __init__(self, max_entries=10_000, mode="html"):
+        if mode not in self.MODES:
+            raise ValueError(f"InlineCache mode must be one of {self.MODES}, got {mode!r}")
+        super().__init__(max_entries)
+        self.mode = mode
+
+    def freeze(self, children):
+        """Turns freshly parsed children into the value stored for them.
+
+        The nodes are frozen too, since every block with the same text
+        shares them.
+        """
+        if self.mode == "nodes":
+            return tuple(child.freeze() for child in children)
+        return (RawHTMLNode("".join(child.to_html() for child in children)).freeze(),)
+
+    def stats(self):
+        stats = super().stats()
+        stats["mode"] = self.mode
+        return stats
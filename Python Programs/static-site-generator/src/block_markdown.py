@@ -1,22 +1,277 @@
+from contextlib import contextmanager
 from enum import Enum
+import mmap
+import os
 import re
-from textnode import text_node_to_html_node
+import pipeline_stats
+from textnode import text_node_to_html_node, text_nodes_to_html
 from inline_markdown import text_to_textnodes
-from htmlnode import ParentNode, LeafNode
+from htmlnode import ParentNode, LeafNode, RawHTMLNode
+
+
+CODE_FENCE = "```"
+
+
+def normalize_newlines(text):
+    """Turns \r\n and lone \r line endings into \n, as reading a file
+    in text mode does. Block splitting only looks for \n."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
+    """Splits markdown into stripped blocks separated by blank lines.
+
+    Fenced code is kept whole, blank lines included; see
+    iter_markdown_blocks for the rules. Chunks between blank lines are
+    cut with str.split and only the ones that involve a fence are
+    searched further, so this stays a single pass at C speed.
+    """
     filtered_blocks = []
-    for block in blocks:
-        if block == "":
-            continue
-        stripped_block = block.strip()
-        if stripped_block:
-            filtered_blocks.append(stripped_block)
+    fence_start = None
+    position = 0
+    for block in markdown.split("\n\n"):
+        start = position
+        position += len(block) + 2
+        if fence_start is None:
+            if CODE_FENCE not in block:
+                stripped_block = block.strip()
+                if stripped_block:
+                    filtered_blocks.append(stripped_block)
+                continue
+            stripped_block = block.strip()
+            if _is_whole_code_block(stripped_block):
+                filtered_blocks.append(stripped_block)
+                continue
+        spans = []
+        fence_start = _fenced_chunk_spans(markdown, start, position - 2, fence_start, spans)
+        for span_start, span_end in spans:
+            filtered_blocks.append(markdown[span_start:span_end])
+    if fence_start is not None:
+        filtered_blocks.append(markdown[fence_start:].strip())
     return filtered_blocks
 
 
+# What str.strip and bytes.strip remove, as the items indexing yields.
+# Every whitespace code point is below U+3001.
+_TEXT_WHITESPACE = frozenset(char for char in map(chr, range(0x3001)) if char.isspace())
+_BYTES_WHITESPACE = frozenset(b" \t\n\r\x0b\x0c")
+
+
+def iter_block_spans(markdown):
+    """Yields (start, end) for each block markdown_to_blocks would return,
+    so that markdown[start:end] is the block.
+
+    markdown can be a str or a bytes-like buffer such as an mmap. Nothing
+    is copied until the caller slices a block out, so a document can be
+    converted one block at a time without first holding a second copy of
+    all of its text.
+    """
+    if isinstance(markdown, str):
+        separator, newline, fence, whitespace = "\n\n", "\n", CODE_FENCE, _TEXT_WHITESPACE
+    else:
+        separator, newline, fence, whitespace = b"\n\n", b"\n", CODE_FENCE.encode(), _BYTES_WHITESPACE
+    find = markdown.find
+    length = len(markdown)
+    spans = []
+    fence_start = None
+    next_fence = find(fence)
+    start = 0
+    while True:
+        end = find(separator, start)
+        if end == -1:
+            end = length
+        # Strip in place, as _append_stripped_span does.
+        block_start, block_end = start, end
+        while block_start < block_end and markdown[block_start] in whitespace:
+            block_start += 1
+        while block_end > block_start and markdown[block_end - 1] in whitespace:
+            block_end -= 1
+        if fence_start is None and (next_fence == -1 or next_fence >= end):
+            if block_start < block_end:
+                yield block_start, block_end
+        elif (
+            fence_start is None
+            and next_fence == block_start
+            and _is_whole_code_span(markdown, block_start, block_end, fence, newline)
+        ):
+            yield block_start, block_end
+            next_fence = find(fence, end)
+        else:
+            fence_start = _fenced_chunk_spans(markdown, start, end, fence_start, spans)
+            yield from spans
+            spans.clear()
+            next_fence = find(fence, end)
+        if end == length:
+            break
+        start = end + 2
+    if fence_start is not None:
+        _append_stripped_span(markdown, fence_start, length, spans)
+        yield from spans
+
+
+def _append_stripped_span(buffer, start, end, spans):
+    """Appends (start, end) narrowed the way str.strip would, if not empty."""
+    whitespace = _TEXT_WHITESPACE if isinstance(buffer, str) else _BYTES_WHITESPACE
+    while start < end and buffer[start] in whitespace:
+        start += 1
+    while end > start and buffer[end - 1] in whitespace:
+        end -= 1
+    if start < end:
+        spans.append((start, end))
+
+
+def _is_whole_code_block(stripped_block):
+    """True for the usual fenced block: one fence from first line to last,
+    with no other ``` inside to look at."""
+    if (
+        not stripped_block.startswith(CODE_FENCE)
+        or not stripped_block.endswith(CODE_FENCE)
+        or stripped_block.count(CODE_FENCE) != 2
+    ):
+        return False
+    last_line_start = stripped_block.rfind("\n") + 1
+    if last_line_start == 0:
+        # ```code``` on one line is plain text, so already a whole block.
+        return not _is_fence_opener(stripped_block)
+    return stripped_block.startswith(CODE_FENCE, last_line_start) and _is_fence_opener(
+        stripped_block[: stripped_block.find("\n")]
+    )
+
+
+def _is_whole_code_span(buffer, start, end, fence, newline):
+    """_is_whole_code_block for the stripped block buffer[start:end], which
+    starts with fence, without slicing it out."""
+    fence_length = len(fence)
+    if buffer.find(fence, start + fence_length, end) != end - fence_length:
+        return False
+    last_line_start = buffer.rfind(newline, start, end) + 1
+    if last_line_start == 0:
+        return not _is_fence_opener(buffer[start:end], fence)
+    return last_line_start == end - fence_length and _is_fence_opener(
+        buffer[start : buffer.find(newline, start, end)], fence
+    )
+
+
+def _find_fence_line(buffer, start, end, fence, newline):
+    """Returns (line_start, line_end) of the first fence line in
+    buffer[start:end], or None. A fence line is one whose first non-space
+    text is the fence. start must be the start of a line."""
+    position = buffer.find(fence, start, end)
+    while position != -1:
+        line_start = buffer.rfind(newline, start, position) + 1 or start
+        line_end = buffer.find(newline, position, end)
+        if line_end == -1:
+            line_end = end
+        if not buffer[line_start:position].strip():
+            return line_start, line_end
+        position = buffer.find(fence, line_end, end)
+    return None
+
+
+def _fenced_chunk_spans(buffer, start, end, fence_start, spans):
+    """Appends the spans of the blocks in buffer[start:end], a chunk with
+    no blank lines that contains a fence or continues one.
+
+    fence_start is the offset of a fence left open by earlier chunks, or
+    None. Returns the same for the next chunk. A fenced block is one
+    contiguous span, as the blank lines it contains are part of it.
+    """
+    if isinstance(buffer, str):
+        fence, newline = CODE_FENCE, "\n"
+    else:
+        fence, newline = CODE_FENCE.encode(), b"\n"
+    while True:
+        if fence_start is not None:
+            # Inside a fence, look for a closing line of only backticks.
+            line = _find_fence_line(buffer, start, end, fence, newline)
+            while line is not None and not _is_closing_fence(buffer[line[0]:line[1]], fence):
+                line = _find_fence_line(buffer, line[1], end, fence, newline)
+            if line is None:
+                return fence_start
+            _append_stripped_span(buffer, fence_start, line[1], spans)
+            fence_start = None
+            start = line[1] + 1
+            continue
+
+        # Outside a fence, look for a line that opens one.
+        line = _find_fence_line(buffer, start, end, fence, newline)
+        while line is not None and not _is_fence_opener(buffer[line[0]:line[1]], fence):
+            line = _find_fence_line(buffer, line[1], end, fence, newline)
+        if line is None:
+            _append_stripped_span(buffer, start, end, spans)
+            return None
+        line_start, line_end = line
+        _append_stripped_span(buffer, start, line_start, spans)
+        fence_start = line_start
+        start = line_end + 1
+
+
+def _is_fence_opener(line, fence=CODE_FENCE):
+    """True if line opens a fence. As in CommonMark, the text after the
+    opening backticks must not contain a backtick, so ```code``` and
+    ```npm``` is the tool are plain text."""
+    stripped = line.strip()
+    backtick = fence[:1]
+    return stripped.startswith(fence) and backtick not in stripped.lstrip(backtick)
+
+
+def _is_closing_fence(line, fence=CODE_FENCE):
+    stripped = line.strip()
+    return stripped.startswith(fence) and not stripped.strip(fence[:1])
+
+
+def iter_markdown_blocks(lines):
+    """Yields the same blocks as markdown_to_blocks, one at a time.
+
+    lines can be an open file or any iterable of lines, with or without
+    their trailing newlines, so only one block is held in memory at once.
+
+    Blank lines end a block except inside a ``` fence, which runs to the
+    next line of only backticks. A fence also starts a block of its own
+    where it begins, and its closing line ends that block, so fenced code
+    is never split up or merged into the text around it. A fence left
+    open runs to the end of the input. A line whose text after the
+    opening backticks has another backtick, like ```code```, is plain
+    text rather than a fence.
+    """
+    block_lines = []
+    in_fence = False
+    for line in lines:
+        if line.endswith("\n"):
+            line = line[:-1]
+        if in_fence:
+            block_lines.append(line)
+            if _is_closing_fence(line):
+                in_fence = False
+                yield "\n".join(block_lines).strip()
+                block_lines = []
+            continue
+        if not line:
+            if block_lines:
+                block_string = "\n".join(block_lines).strip()
+                block_lines = []
+                if block_string:
+                    yield block_string
+            continue
+        if CODE_FENCE in line and _is_fence_opener(line):
+            if block_lines:
+                block_string = "\n".join(block_lines).strip()
+                block_lines = []
+                if block_string:
+                    yield block_string
+            block_lines.append(line)
+            in_fence = True
+            continue
+        block_lines.append(line)
+
+    if block_lines:
+        block_string = "\n".join(block_lines).strip()
+        if block_string:
+            yield block_string
+
+
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
     HEADING = "heading"
@@ -26,39 +281,211 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
-def block_to_block_type(block_string):
-    lines = block_string.split("\n")
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+
+
+class BlockSyntax:
+    """A block-level syntax: how to recognise a block and how to render it.
+
+    detect is called with the block string and returns the block's lines if
+    it matches, or None. handler is called with the block string and those
+    lines and returns an HTMLNode. first_chars lists the characters a
+    matching block can start with; only syntaxes registered for a block's
+    first character are tried, and None means every block is tried.
+    """
+
+    __slots__ = ("block_type", "detect", "handler", "first_chars")
+
+    def __init__(self, block_type, detect, handler, first_chars=None):
+        self.block_type = block_type
+        self.detect = detect
+        self.handler = handler
+        self.first_chars = first_chars
+
+    def __repr__(self):
+        return f"BlockSyntax({self.block_type!r}, first_chars={self.first_chars!r})"
+
 
-    if re.match(r"#{1,6} ", block_string):
-        return BlockType.HEADING
+def _detect_heading(block_string):
+    if HEADING_PATTERN.match(block_string):
+        return block_string.split("\n")
+    return None
 
+
+def _detect_code(block_string):
     if block_string.startswith("```") and block_string.endswith("```"):
-        return BlockType.CODE
+        return block_string.split("\n")
+    return None
+
 
+def _detect_quote(block_string):
+    lines = block_string.split("\n")
     if all(line.startswith(">") for line in lines):
-        return BlockType.QUOTE
+        return lines
+    return None
+
+
+def _detect_unordered_list(block_string):
+    lines = block_string.split("\n")
+    marker = block_string[:1] + " "
+    if all(line.startswith(marker) for line in lines):
+        return lines
+    return None
 
-    if all(line.startswith("- ") for line in lines):
-        return BlockType.UNORDERED_LIST
-    if all(line.startswith("* ") for line in lines):
-        return BlockType.UNORDERED_LIST
 
-    is_ordered_list = True
+def _detect_ordered_list(block_string):
+    lines = block_string.split("\n")
     expected_number = 1
     for line in lines:
         if not line.startswith(f"{expected_number}. "):
-            is_ordered_list = False
-            break
+            return None
         expected_number += 1
-    if is_ordered_list and len(lines) > 0:
-        return BlockType.ORDERED_LIST
+    return lines
+
+
+_block_syntaxes = []
+_block_dispatch = {}
+_block_fallbacks = ()
+
+
+def _rebuild_block_dispatch():
+    """Builds the first character -> candidate syntaxes table.
+
+    Runs when a syntax is registered, not per block, so classifying a block
+    costs one dict lookup plus the few syntaxes that share its first
+    character.
+    """
+    global _block_dispatch, _block_fallbacks
+    ordered = [
+        syntax
+        for _, _, syntax in sorted(_block_syntaxes, key=lambda entry: (-entry[0], entry[1]))
+    ]
+    chars = {char for syntax in ordered for char in syntax.first_chars or ()}
+    _block_dispatch = {
+        char: tuple(
+            syntax
+            for syntax in ordered
+            if syntax.first_chars is None or char in syntax.first_chars
+        )
+        for char in chars
+    }
+    _block_fallbacks = tuple(syntax for syntax in ordered if syntax.first_chars is None)
+
+
+def register_block_syntax(block_type, detect, handler, first_chars=None, priority=0):
+    """Adds a block syntax to block_to_block_type and markdown_to_html_node.
+
+    Syntaxes with a higher priority are tried first; ties keep registration
+    order, so the built-in syntaxes win unless priority is raised. Returns
+    the registered BlockSyntax.
+    """
+    syntax = BlockSyntax(block_type, detect, handler, first_chars)
+    _block_syntaxes.append((priority, len(_block_syntaxes), syntax))
+    _rebuild_block_dispatch()
+    return syntax
+
+
+def unregister_block_syntax(syntax):
+    """Removes a BlockSyntax returned by register_block_syntax."""
+    for entry in _block_syntaxes:
+        if entry[2] is syntax:
+            _block_syntaxes.remove(entry)
+            _rebuild_block_dispatch()
+            return
+    raise ValueError(f"Block syntax is not registered: {syntax!r}")
+
+
+def match_block(block_string):
+    """Returns (BlockSyntax, lines) for a block, falling back to a paragraph."""
+    for syntax in _block_dispatch.get(block_string[:1], _block_fallbacks):
+        lines = syntax.detect(block_string)
+        if lines is not None:
+            return syntax, lines
+    return PARAGRAPH_SYNTAX, None
+
+
+def classify_block(block_string):
+    """Returns (block_type, lines) for a block.
+
+    lines is the block split on newlines when classification needed it,
+    otherwise None, and is handed on to the block's handler so it does not
+    split the block again.
+    """
+    syntax, lines = match_block(block_string)
+    return syntax.block_type, lines
+
+
+def block_to_block_type(block_string):
+    return classify_block(block_string)[0]
+
+
+_inline_cache = None
+
+
+@contextmanager
+def inline_cache(cache):
+    """Makes text_to_children use an InlineCache inside the with block.
+
+    Repeated inline text is then parsed once, and every later occurrence
+    shares the cached children, which are returned as a tuple so they
+    cannot be changed through one block. The setting is module-wide, so it
+    should not be changed while another thread is converting.
+    """
+    global _inline_cache
+    previous = _inline_cache
+    _inline_cache = cache
+    try:
+        yield cache
+    finally:
+        _inline_cache = previous
 
-    return BlockType.PARAGRAPH
+
+_direct_inline_html = False
+
+
+@contextmanager
+def direct_inline_html(enabled=True):
+    """Makes text_to_children render inline text straight to HTML.
+
+    Inside the with block each inline run becomes a single RawHTMLNode
+    rendered by text_nodes_to_html, instead of one LeafNode per TextNode,
+    for when only the page's HTML is wanted. The HTML is the same. It is
+    ignored while pipeline_stats is recording, so the node counts still
+    describe one node per TextNode. Like inline_cache, the setting is
+    module-wide.
+    """
+    global _direct_inline_html
+    previous = _direct_inline_html
+    _direct_inline_html = enabled
+    try:
+        yield
+    finally:
+        _direct_inline_html = previous
 
 
 def text_to_children(text):
     """Converts a string of text with inline markdown to a list of HTMLNode children."""
+    stats = pipeline_stats.active
+    if stats is not None:
+        return stats.call("text_to_children", len, _cached_text_to_children, text)
+    return _cached_text_to_children(text)
+
+
+def _cached_text_to_children(text):
+    cache = _inline_cache
+    if cache is None:
+        return _text_to_children(text)
+    children = cache.get(text)
+    if children is None:
+        children = cache.freeze(_text_to_children(text))
+        cache.put(text, children)
+    return children
+
+
+def _text_to_children(text):
     text_nodes = text_to_textnodes(text)
+    if _direct_inline_html and pipeline_stats.active is None:
+        return [RawHTMLNode(text_nodes_to_html(text_nodes))]
     children = []
     for text_node in text_nodes:
         html_node = text_node_to_html_node(text_node)
@@ -66,13 +493,16 @@ def text_to_children(text):
     return children
 
 
-def paragraph_to_html_node(block_string):
-    processed_block_string = block_string.replace("\n", " ")
+def paragraph_to_html_node(block_string, lines=None):
+    if lines is None:
+        processed_block_string = block_string.replace("\n", " ")
+    else:
+        processed_block_string = " ".join(lines)
     children = text_to_children(processed_block_string)
     return ParentNode("p", children)
 
 
-def heading_to_html_node(block_string):
+def heading_to_html_node(block_string, lines=None):
     level = 0
     for char in block_string:
         if char == "#":
@@ -88,11 +518,12 @@ def heading_to_html_node(block_string):
     return ParentNode(f"h{level}", children)
 
 
-def code_to_html_node(block_string):
+def code_to_html_node(block_string, lines=None):
     if not block_string.startswith("```") or not block_string.endswith("```"):
         raise ValueError("Invalid code block: missing ``` delimiters")
 
-    lines = block_string.split("\n")
+    if lines is None:
+        lines = block_string.split("\n")
     if len(lines) < 2:
         content = block_string[3:-3]
     else:
@@ -102,8 +533,9 @@ def code_to_html_node(block_string):
     return ParentNode("pre", [code_leaf_node])
 
 
-def quote_to_html_node(block_string):
-    lines = block_string.split("\n")
+def quote_to_html_node(block_string, lines=None):
+    if lines is None:
+        lines = block_string.split("\n")
     cleaned_lines = []
     for line in lines:
         if not line.startswith(">"):
@@ -116,8 +548,9 @@ def quote_to_html_node(block_string):
     return ParentNode("blockquote", children)
 
 
-def unordered_list_to_html_node(block_string):
-    lines = block_string.split("\n")
+def unordered_list_to_html_node(block_string, lines=None):
+    if lines is None:
+        lines = block_string.split("\n")
     list_item_nodes = []
     for line in lines:
         if line.startswith("- "):
@@ -133,8 +566,9 @@ def unordered_list_to_html_node(block_string):
     return ParentNode("ul", list_item_nodes)
 
 
-def ordered_list_to_html_node(block_string):
-    lines = block_string.split("\n")
+def ordered_list_to_html_node(block_string, lines=None):
+    if lines is None:
+        lines = block_string.split("\n")
     list_item_nodes = []
     expected_number = 1
     for line in lines:
@@ -150,28 +584,138 @@ def ordered_list_to_html_node(block_string):
     return ParentNode("ol", list_item_nodes)
 
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
+PARAGRAPH_SYNTAX = BlockSyntax(BlockType.PARAGRAPH, lambda block_string: None, paragraph_to_html_node)
+
+register_block_syntax(BlockType.HEADING, _detect_heading, heading_to_html_node, "#")
+register_block_syntax(BlockType.CODE, _detect_code, code_to_html_node, "`")
+register_block_syntax(BlockType.QUOTE, _detect_quote, quote_to_html_node, ">")
+register_block_syntax(
+    BlockType.UNORDERED_LIST, _detect_unordered_list, unordered_list_to_html_node, "-*"
+)
+register_block_syntax(
+    BlockType.ORDERED_LIST, _detect_ordered_list, ordered_list_to_html_node, "1"
+)
+
+
+def block_to_html_node(block_string):
+    syntax, lines = match_block(block_string)
+    stats = pipeline_stats.active
+    if stats is not None:
+        return stats.call(
+            syntax.handler.__name__,
+            pipeline_stats.count_nodes,
+            syntax.handler,
+            block_string,
+            lines,
+        )
+    return syntax.handler(block_string, lines)
+
+
+def block_to_html(block_string, cache=None):
+    """Renders one block to an HTML string, through the BlockCache if given."""
+    if cache is None:
+        return block_to_html_node(block_string).to_html()
+
+    key = cache.key_for(block_string)
+    html = cache.get(key)
+    if html is None:
+        html = block_to_html_node(block_string).to_html()
+        cache.put(key, html)
+    return html
+
+
+def markdown_to_html_node(markdown, cache=None):
+    """Converts a markdown document to a div ParentNode.
+
+    If a BlockCache is given, blocks it has already rendered are reused as
+    raw HTML leaves instead of being classified, parsed and rendered again.
+    Blocks are sliced out of markdown one at a time as they are converted,
+    so only the block in hand is ever copied.
+    """
+    stats = pipeline_stats.active
+    if stats is not None:
+        spans = stats.call("markdown_to_blocks", len, list, iter_block_spans(markdown))
+    else:
+        spans = iter_block_spans(markdown)
     children_html_nodes = []
 
-    for block_string in blocks:
-        block_type = block_to_block_type(block_string)
-
-        if block_type == BlockType.PARAGRAPH:
-            children_html_nodes.append(paragraph_to_html_node(block_string))
-        elif block_type == BlockType.HEADING:
-            children_html_nodes.append(heading_to_html_node(block_string))
-        elif block_type == BlockType.CODE:
-            children_html_nodes.append(code_to_html_node(block_string))
-        elif block_type == BlockType.QUOTE:
-            children_html_nodes.append(quote_to_html_node(block_string))
-        elif block_type == BlockType.UNORDERED_LIST:
-            children_html_nodes.append(unordered_list_to_html_node(block_string))
-        elif block_type == BlockType.ORDERED_LIST:
-            children_html_nodes.append(ordered_list_to_html_node(block_string))
+    for start, end in spans:
+        block_string = markdown[start:end]
+        if cache is None:
+            children_html_nodes.append(block_to_html_node(block_string))
         else:
-            raise ValueError(
-                f"Unknown block type: {block_type} for block: {block_string}"
-            )
+            children_html_nodes.append(RawHTMLNode(block_to_html(block_string, cache)))
 
     return ParentNode("div", children_html_nodes)
+
+
+def markdown_to_html_stream(lines, cache=None):
+    """Yields the HTML of markdown_to_html_node(...).to_html() in fragments,
+    rendering each block as soon as it has been read from lines."""
+    yield "<div>"
+    for block_string in iter_markdown_blocks(lines):
+        yield block_to_html(block_string, cache)
+    yield "</div>"
+
+
+# Pages of a mapped file already rendered are dropped from resident
+# memory once at least this many bytes of them have built up.
+RELEASE_BYTES = 16 * 1024 * 1024
+
+
+def markdown_file_to_html_stream(path, cache=None):
+    """Yields the HTML of a UTF-8 markdown file in fragments, like
+    markdown_to_html_stream.
+
+    The file is memory-mapped and its block boundaries are found in the
+    raw bytes, so only the block being rendered is decoded, and mapped
+    pages are released as rendering passes them. Resident memory stays
+    near one block however large the file is. Only ASCII whitespace
+    counts as space before a fence, as with bytes.strip.
+
+    Block boundaries in the raw bytes assume \n line endings, so a file
+    with any \r is instead read line by line in text mode, which
+    translates \r\n and \r, and split with iter_markdown_blocks.
+    """
+    yield "<div>"
+    has_carriage_return = False
+    with open(path, "rb") as f:
+        # mmap refuses empty files.
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                has_carriage_return = _contains_byte(data, b"\r")
+                released = 0
+                spans = () if has_carriage_return else iter_block_spans(data)
+                for start, end in spans:
+                    block_string = data[start:end].decode("utf-8").strip()
+                    if block_string:
+                        yield block_to_html(block_string, cache)
+                    if start - released >= RELEASE_BYTES:
+                        released = _release_pages(data, released, start)
+    if has_carriage_return:
+        with open(path, encoding="utf-8") as f:
+            for block_string in iter_markdown_blocks(f):
+                yield block_to_html(block_string, cache)
+    yield "</div>"
+
+
+def _contains_byte(data, byte):
+    """True if the mapped data contains byte. Pages are released as the
+    search passes them, as in markdown_file_to_html_stream."""
+    released = 0
+    for start in range(0, len(data), RELEASE_BYTES):
+        end = start + RELEASE_BYTES
+        if data.find(byte, start, end) != -1:
+            return True
+        released = _release_pages(data, released, end)
+    return False
+
+
+def _release_pages(data, released, offset):
+    """Drops the mapped pages between released and offset from resident
+    memory and returns the new released offset."""
+    if not hasattr(mmap, "MADV_DONTNEED"):
+        return released
+    end = offset - offset % mmap.PAGESIZE
+    data.madvise(mmap.MADV_DONTNEED, released, end - released)
+    return end
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+from functools import partial
+
+
+# Bump whenever a change to the generator alters the HTML it produces, so
+# that existing manifests stop matching and every page is rebuilt once.
+GENERATOR_VERSION = "4"
+
+MANIFEST_FILENAME = ".build-manifest.json"
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Hashes a file a chunk at a time, so large sources are never read
+    into memory whole."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(partial(f.read, chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PageRecord:
+    __slots__ = ("source_hash", "mtime_ns", "size", "output")
+
+    def __init__(self, source_hash, mtime_ns, size, output):
+        self.source_hash = source_hash
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.output = output
+
+    def to_dict(self):
+        return {
+            "hash": self.source_hash,
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "output": self.output,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["hash"], data["mtime_ns"], data["size"], data["output"])
+
+    def __eq__(self, other):
+        if not isinstance(other, PageRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"PageRecord({self.source_hash[:12]!r}, {self.output!r})"
+
+
+class BuildManifest:
+    """Records what each output page was built from.
+
+    A page is up to date when its source hash matches and the manifest was
+    written by the same generator version with the same template.
+    """
+
+    def __init__(self, template_hash=None, generator=GENERATOR_VERSION, pages=None):
+        self.template_hash = template_hash
+        self.generator = generator
+        self.pages = pages if pages is not None else {}
+
+    def matches(self, template_hash):
+        return self.generator == GENERATOR_VERSION and self.template_hash == template_hash
+
+    def record_for(self, relative_path, source_path, output):
+        """Returns the PageRecord for a source, or None if it needs a rebuild.
+
+        Sources whose size and mtime are unchanged are trusted without being
+        read; otherwise the content hash decides.
+        """
+        previous = self.pages.get(relative_path)
+        if previous is None or previous.output != output:
+            return None
+
+        stat = os.stat(source_path)
+        if previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+            return previous
+        if previous.source_hash != hash_file(source_path):
+            return None
+        return PageRecord(previous.source_hash, stat.st_mtime_ns, stat.st_size, output)
+
+    @staticmethod
+    def path(output_dir):
+        return os.path.join(output_dir, MANIFEST_FILENAME)
+
+    @classmethod
+    def load(cls, output_dir):
+        """Returns the saved manifest, or None if it is missing or unreadable."""
+        try:
+            with open(cls.path(output_dir), encoding="utf-8") as f:
+                data = json.load(f)
+            pages = {
+                relative_path: PageRecord.from_dict(record)
+                for relative_path, record in data["pages"].items()
+            }
+            return cls(data["template"], data["generator"], pages)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, output_dir):
+        data = {
+            "generator": self.generator,
+            "template": self.template_hash,
+            "pages": {
+                relative_path: record.to_dict()
+                for relative_path, record in sorted(self.pages.items())
+            },
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        manifest_path = self.path(output_dir)
+        temp_path = manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, manifest_path)
@@ -0,0 +1,239 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+
+def scan_markdown_files(content_dir):
+    """Returns {relative_path: (mtime_ns, size)} for every .md file."""
+    snapshot = {}
+    stack = [content_dir]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.name.endswith(".md"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                relative_path = os.path.relpath(entry.path, content_dir)
+                snapshot[relative_path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class PollingWatcher:
+    """Detects changed markdown files by rescanning the tree on an interval."""
+
+    def __init__(self, content_dir, poll_interval=0.25):
+        self.content_dir = content_dir
+        self.poll_interval = poll_interval
+        self.snapshot = scan_markdown_files(content_dir)
+
+    def poll(self):
+        """Returns (changed, deleted) sets of relative paths since the last poll."""
+        snapshot = scan_markdown_files(self.content_dir)
+        changed = {
+            relative_path
+            for relative_path, signature in snapshot.items()
+            if self.snapshot.get(relative_path) != signature
+        }
+        deleted = set(self.snapshot) - set(snapshot)
+        self.snapshot = snapshot
+        return changed, deleted
+
+    def wait(self, timeout=None):
+        """Blocks until something changes or timeout seconds pass."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed, deleted = self.poll()
+            if changed or deleted:
+                return changed, deleted
+            if deadline is not None and time.monotonic() >= deadline:
+                return set(), set()
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        pass
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class InotifyWatcher:
+    """Detects changed markdown files with Linux inotify, without rescanning.
+
+    Events arrive as soon as a file is closed after writing or renamed into
+    place, so latency does not grow with the size of the content tree.
+    """
+
+    def __init__(self, content_dir, libc=None):
+        self.content_dir = content_dir
+        self._libc = libc or _load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories = {}
+        # Markdown files known to exist, so a directory that is moved out of
+        # the tree can report the pages it took with it.
+        self._markdown_files = set()
+        self._add_tree(content_dir, set())
+
+    def _add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), WATCH_MASK
+        )
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._directories[wd] = directory
+
+    def _remove_tree(self, directory, changed, deleted):
+        """Stops watching directory and everything below it, and moves the
+        markdown files known to be inside to deleted."""
+        prefix = directory + os.sep
+        for wd, path in list(self._directories.items()):
+            if path == directory or path.startswith(prefix):
+                del self._directories[wd]
+                # Fails harmlessly if the kernel already dropped the watch.
+                self._libc.inotify_rm_watch(self._fd, wd)
+        relative_prefix = os.path.relpath(directory, self.content_dir) + os.sep
+        for relative_path in list(self._markdown_files):
+            if relative_path.startswith(relative_prefix):
+                self._markdown_files.discard(relative_path)
+                changed.discard(relative_path)
+                deleted.add(relative_path)
+
+    def _rescan(self, changed, deleted):
+        """Recovers from a queue overflow by watching the tree afresh and
+        reporting every markdown file in it as changed."""
+        for wd in list(self._directories):
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._directories.clear()
+        previous = self._markdown_files
+        self._markdown_files = set()
+        self._add_tree(self.content_dir, changed)
+        deleted.update(previous - self._markdown_files)
+        deleted.difference_update(self._markdown_files)
+
+    def _add_tree(self, directory, changed=None):
+        """Watches directory and everything below it.
+
+        Markdown files already inside are added to changed, which covers
+        directories that were created together with their contents.
+        """
+        for dirpath, _, filenames in os.walk(directory):
+            self._add_watch(dirpath)
+            for filename in filenames:
+                if filename.endswith(".md"):
+                    full_path = os.path.join(dirpath, filename)
+                    relative_path = os.path.relpath(full_path, self.content_dir)
+                    self._markdown_files.add(relative_path)
+                    changed.add(relative_path)
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def _handle(self, events, changed, deleted):
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                self._rescan(changed, deleted)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_IGNORED):
+                self._directories.pop(wd, None)
+                continue
+
+            full_path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(full_path, changed)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._remove_tree(full_path, changed, deleted)
+                continue
+            if not name.endswith(".md"):
+                continue
+
+            relative_path = os.path.relpath(full_path, self.content_dir)
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._markdown_files.discard(relative_path)
+                changed.discard(relative_path)
+                deleted.add(relative_path)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                self._markdown_files.add(relative_path)
+                deleted.discard(relative_path)
+                changed.add(relative_path)
+
+    def wait(self, timeout=None):
+        """Blocks until something changes or timeout seconds pass.
+
+        Returns (changed, deleted) sets of relative paths.
+        """
+        changed = set()
+        deleted = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        while readable:
+            self._handle(self._read_events(), changed, deleted)
+            readable, _, _ = select.select([self._fd], [], [], 0)
+        return changed, deleted
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(content_dir, poll_interval=0.25):
+    """Returns an InotifyWatcher where supported, otherwise a PollingWatcher."""
+    try:
+        return InotifyWatcher(content_dir)
+    except OSError:
+        return PollingWatcher(content_dir, poll_interval)
@@ -0,0 +1,136 @@
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from block_cache import BlockCache, InlineCache
+from content_watcher import make_watcher
+from generate_site import build_site, output_path_for, remove_output, render_page
+
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class DevServer:
+    """Serves output_dir over HTTP and re-renders changed pages as they change.
+
+    Requests are handled on their own threads while rebuilds run on the
+    watcher thread, and pages are replaced atomically, so the server keeps
+    answering during a rebuild.
+    """
+
+    def __init__(
+        self,
+        content_dir,
+        output_dir,
+        host="127.0.0.1",
+        port=8888,
+        template_path=None,
+        poll_interval=0.25,
+        on_rebuild=None,
+    ):
+        self.content_dir = content_dir
+        self.output_dir = output_dir
+        self.template_path = template_path
+        self.poll_interval = poll_interval
+        self.on_rebuild = on_rebuild
+        self.cache = BlockCache()
+        self.inline_cache = InlineCache()
+        self.template = None
+        if template_path is not None:
+            with open(template_path, encoding="utf-8") as f:
+                self.template = f.read()
+
+        os.makedirs(output_dir, exist_ok=True)
+        handler = functools.partial(QuietRequestHandler, directory=output_dir)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def rebuild(self, changed, deleted):
+        """Renders changed pages and removes deleted ones.
+
+        A page that fails to render is reported and keeps its previous
+        output, and the other pages are still rendered. Returns
+        {relative_path: seconds} for the pages that were rendered.
+        """
+        timings = {}
+        for relative_path in sorted(deleted):
+            remove_output(self.output_dir, output_path_for(relative_path))
+        for relative_path in sorted(changed):
+            source_path = os.path.join(self.content_dir, relative_path)
+            dest_path = os.path.join(self.output_dir, output_path_for(relative_path))
+            try:
+                seconds, _ = render_page(
+                    source_path, dest_path, self.template, self.cache, self.inline_cache
+                )
+            except FileNotFoundError:
+                remove_output(self.output_dir, output_path_for(relative_path))
+                continue
+            except Exception as e:
+                print(f"Rebuild failed for {relative_path}: {e}", file=sys.stderr)
+                continue
+            timings[relative_path] = seconds
+        return timings
+
+    def watch(self, watcher):
+        """Rebuilds on every change until stop(). Errors are logged and the
+        loop keeps going, so one bad event does not end watching."""
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._watch_once(watcher)
+                except ValueError as e:
+                    print(f"Rebuild failed: {e}")
+                except Exception:
+                    print("Watcher error:", file=sys.stderr)
+                    traceback.print_exc()
+                    # Avoid spinning if the error repeats on every wait.
+                    self._stop.wait(self.poll_interval)
+        finally:
+            watcher.close()
+
+    def _watch_once(self, watcher):
+        changed, deleted = watcher.wait(timeout=self.poll_interval)
+        if not changed and not deleted:
+            return
+        start = time.perf_counter()
+        timings = self.rebuild(changed, deleted)
+        if self.on_rebuild is not None:
+            self.on_rebuild(timings, deleted, time.perf_counter() - start)
+
+    def start(self, watch=True):
+        """Builds the site once, then serves and optionally watches in the
+        background. Returns the initial BuildReport."""
+        # Start watching before the initial build so edits made while it
+        # runs are picked up afterwards.
+        targets = [(self.httpd.serve_forever, ())]
+        if watch:
+            watcher = make_watcher(self.content_dir, self.poll_interval)
+            targets.append((self.watch, (watcher,)))
+        report = build_site(
+            self.content_dir, self.output_dir, template_path=self.template_path
+        )
+        for target, args in targets:
+            thread = threading.Thread(target=target, args=args, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return report
+
+    def stop(self):
+        self._stop.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
@@ -0,0 +1,14 @@
+import os
+
+
+def write_file(path, content):
+    """Writes content to path as UTF-8, creating its directory first."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read_file(path):
+    """Returns the UTF-8 text of path."""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,386 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from block_cache import BlockCache, InlineCache
+from block_markdown import direct_inline_html
+from block_markdown import inline_cache as using_inline_cache
+from block_markdown import (
+    markdown_file_to_html_stream,
+    markdown_to_html_node,
+    normalize_newlines,
+)
+from build_manifest import BuildManifest, PageRecord, hash_bytes, hash_file
+from pipeline_stats import PipelineStats, instrument
+
+
+TEMPLATE_CONTENT_PLACEHOLDER = "{{ Content }}"
+
+# Sources at least this large are streamed from a memory-mapped file
+# instead of being read and converted whole.
+LARGE_PAGE_BYTES = 64 * 1024 * 1024
+
+
+class BuildReport:
+    def __init__(
+        self,
+        page_timings,
+        elapsed,
+        skipped=0,
+        removed=0,
+        page_stats=None,
+        inline_cache_stats=None,
+    ):
+        self.page_timings = page_timings
+        self.elapsed = elapsed
+        self.skipped = skipped
+        self.removed = removed
+        self.page_stats = page_stats if page_stats is not None else {}
+        self.inline_cache_stats = inline_cache_stats
+
+    def build_stats(self):
+        """Returns the PipelineStats of every rendered page added together."""
+        total = PipelineStats()
+        for stats in self.page_stats.values():
+            total.merge(stats)
+        return total
+
+    @property
+    def page_count(self):
+        return len(self.page_timings)
+
+    @property
+    def pages_per_second(self):
+        if self.elapsed == 0:
+            return 0.0
+        return self.page_count / self.elapsed
+
+    def __repr__(self):
+        return (
+            f"BuildReport({self.page_count} pages, {self.skipped} skipped, "
+            f"{self.removed} removed, {self.elapsed:.3f}s)"
+        )
+
+
+def find_markdown_files(content_dir):
+    """Returns the paths of every .md file under content_dir, relative to it."""
+    markdown_files = []
+    for dirpath, _, filenames in os.walk(content_dir):
+        for filename in filenames:
+            if filename.endswith(".md"):
+                full_path = os.path.join(dirpath, filename)
+                markdown_files.append(os.path.relpath(full_path, content_dir))
+    return sorted(markdown_files)
+
+
+def output_path_for(relative_path):
+    return os.path.splitext(relative_path)[0] + ".html"
+
+
+def render_page(source_path, dest_path, template=None, cache=None, inline_cache=None):
+    """Converts one markdown file to HTML.
+
+    The output is written to a temporary file and moved into place, so a
+    server reading dest_path never sees a partially written page.
+    Returns the time it took and the hash of the source it rendered.
+    """
+    start = time.perf_counter()
+    if os.path.getsize(source_path) >= LARGE_PAGE_BYTES:
+        with using_inline_cache(inline_cache), direct_inline_html():
+            _write_large_page(source_path, dest_path, template, cache)
+        return time.perf_counter() - start, hash_file(source_path)
+
+    with open(source_path, "rb") as source:
+        data = source.read()
+    with using_inline_cache(inline_cache), direct_inline_html():
+        markdown = normalize_newlines(data.decode("utf-8"))
+        html = markdown_to_html_node(markdown, cache=cache).to_html()
+    if template is not None:
+        html = template.replace(TEMPLATE_CONTENT_PLACEHOLDER, html)
+
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    temp_path = dest_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as dest:
+        dest.write(html)
+    os.replace(temp_path, dest_path)
+    return time.perf_counter() - start, hash_bytes(data)
+
+
+def _write_large_page(source_path, dest_path, template, cache):
+    """Writes a page block by block with markdown_file_to_html_stream.
+
+    The HTML is rendered once for each placeholder in the template, as
+    template.replace would repeat it, and not at all if there is none.
+    """
+    parts = ["", ""] if template is None else template.split(TEMPLATE_CONTENT_PLACEHOLDER)
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    temp_path = dest_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as dest:
+        dest.write(parts[0])
+        for part in parts[1:]:
+            for fragment in markdown_file_to_html_stream(source_path, cache):
+                dest.write(fragment)
+            dest.write(part)
+    os.replace(temp_path, dest_path)
+
+
+_process_inline_cache = None
+
+
+def process_inline_cache(max_entries):
+    """Returns this process's InlineCache, so pages rendered by the same pool
+    worker share it."""
+    global _process_inline_cache
+    if _process_inline_cache is None or _process_inline_cache.max_entries != max_entries:
+        _process_inline_cache = InlineCache(max_entries)
+    return _process_inline_cache
+
+
+_process_block_cache = None
+
+
+def process_block_cache(path):
+    """Returns this process's BlockCache persisted at path, loading it the
+    first time, so pages rendered by the same pool worker share it."""
+    global _process_block_cache
+    if _process_block_cache is None or _process_block_cache.path != path:
+        _process_block_cache = BlockCache(path=path)
+    return _process_block_cache
+
+
+def save_block_cache(path, entries):
+    """Adds (key, html) entries rendered by any process to this process's
+    cache for path and writes it out."""
+    cache = process_block_cache(path)
+    for key, html in entries:
+        if key not in cache:
+            cache.put(key, html)
+    cache.take_added()
+    cache.save()
+
+
+def render_job(job, stage_stats=False, inline_cache_size=None, block_cache_path=None):
+    """Renders one job from plan_build with render_page.
+
+    Returns (relative_path, seconds, source_hash, stats, lookups, blocks),
+    where stats is the page's PipelineStats with stage_stats=True, lookups
+    the (hits, misses) of the process's InlineCache for this page and
+    blocks the BlockCache entries the page added, each if enabled.
+    """
+    relative_path, source_path, dest_path, template = job
+    cache = None
+    if block_cache_path is not None:
+        cache = process_block_cache(block_cache_path)
+
+    inline = None
+    if inline_cache_size is not None:
+        inline = process_inline_cache(inline_cache_size)
+        hits, misses = inline.hits, inline.misses
+
+    stats = None
+    if stage_stats:
+        with instrument() as stats:
+            seconds, source_hash = render_page(source_path, dest_path, template, cache, inline)
+    else:
+        seconds, source_hash = render_page(source_path, dest_path, template, cache, inline)
+
+    lookups = None
+    if inline is not None:
+        lookups = (inline.hits - hits, inline.misses - misses)
+    blocks = cache.take_added() if cache is not None else None
+    return relative_path, seconds, source_hash, stats, lookups, blocks
+
+
+def render_jobs(jobs, **options):
+    """Runs render_job on each of jobs in turn and returns the results."""
+    return [render_job(job, **options) for job in jobs]
+
+
+def collect_results(
+    results, page_timings, page_hashes, page_stats, inline_lookups, block_entries, on_page
+):
+    """Adds render_job results to the build's totals."""
+    for relative_path, seconds, source_hash, stats, lookups, blocks in results:
+        if blocks:
+            block_entries.extend(blocks)
+        page_timings[relative_path] = seconds
+        page_hashes[relative_path] = source_hash
+        if stats is not None:
+            page_stats[relative_path] = stats
+        if lookups is not None:
+            inline_lookups[0] += lookups[0]
+            inline_lookups[1] += lookups[1]
+        if on_page is not None:
+            on_page(relative_path, seconds)
+
+
+def inline_cache_summary(inline_lookups):
+    """Returns a BuildReport's inline_cache_stats from total (hits, misses)."""
+    hits, misses = inline_lookups
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+    }
+
+
+def remove_output(output_dir, output):
+    dest_path = os.path.join(output_dir, output)
+    if not os.path.exists(dest_path):
+        return False
+    os.remove(dest_path)
+
+    parent = os.path.dirname(dest_path)
+    root = os.path.abspath(output_dir)
+    while os.path.abspath(parent) != root and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+    return True
+
+
+def load_template(template_path):
+    """Returns (template, template_hash), or (None, None) without a template."""
+    if template_path is None:
+        return None, None
+    with open(template_path, encoding="utf-8") as f:
+        template = f.read()
+    return template, hash_bytes(template.encode("utf-8"))
+
+
+def plan_build(content_dir, output_dir, template, template_hash, incremental=True):
+    """Works out which pages need rendering.
+
+    Returns (jobs, source_stats, manifest, skipped, removed). Unchanged
+    pages are already recorded in manifest, and outputs of deleted sources
+    have been removed.
+    """
+    previous = BuildManifest.load(output_dir) if incremental else None
+    reusable = previous if previous is not None and previous.matches(template_hash) else None
+    manifest = BuildManifest(template_hash)
+
+    jobs = []
+    source_stats = {}
+    skipped = 0
+    relative_paths = find_markdown_files(content_dir)
+    for relative_path in relative_paths:
+        output = output_path_for(relative_path)
+        source_path = os.path.join(content_dir, relative_path)
+        dest_path = os.path.join(output_dir, output)
+
+        if reusable is not None and os.path.exists(dest_path):
+            record = reusable.record_for(relative_path, source_path, output)
+            if record is not None:
+                manifest.pages[relative_path] = record
+                skipped += 1
+                continue
+
+        stat = os.stat(source_path)
+        source_stats[relative_path] = (stat.st_mtime_ns, stat.st_size, output)
+        jobs.append((relative_path, source_path, dest_path, template))
+
+    removed = 0
+    if previous is not None:
+        current = set(relative_paths)
+        for relative_path, record in previous.pages.items():
+            if relative_path not in current and remove_output(output_dir, record.output):
+                removed += 1
+
+    return jobs, source_stats, manifest, skipped, removed
+
+
+def finish_build(output_dir, manifest, source_stats, page_hashes):
+    """Records the rendered pages in manifest and saves it."""
+    for relative_path, source_hash in page_hashes.items():
+        mtime_ns, size, output = source_stats[relative_path]
+        manifest.pages[relative_path] = PageRecord(source_hash, mtime_ns, size, output)
+    manifest.save(output_dir)
+
+
+def build_site(
+    content_dir,
+    output_dir,
+    workers=None,
+    on_page=None,
+    template_path=None,
+    incremental=True,
+    stage_stats=False,
+    inline_cache_size=None,
+    block_cache_path=None,
+):
+    """Renders every markdown page under content_dir into a mirrored tree
+    under output_dir, spreading pages over a process pool.
+
+    workers defaults to the CPU count; workers=1 renders in this process.
+    on_page, if given, is called with (relative_path, seconds) per page,
+    as soon as the pool chunk holding the page is finished.
+    With incremental=True, pages whose source, template and generator
+    version match the build manifest are skipped, and outputs of deleted
+    sources are removed. With stage_stats=True, each rendered page's
+    PipelineStats are collected into the report's page_stats.
+    inline_cache_size, if given, gives each rendering process an
+    InlineCache of that size, shared by the pages it renders; the report's
+    inline_cache_stats then totals its hits and misses. block_cache_path,
+    if given, is a BlockCache file that every rendering process loads and
+    uses; the blocks rendered in this build are added to it and saved.
+    """
+    start = time.perf_counter()
+
+    template, template_hash = load_template(template_path)
+    jobs, source_stats, manifest, skipped, removed = plan_build(
+        content_dir, output_dir, template, template_hash, incremental
+    )
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    page_timings = {}
+    page_hashes = {}
+    page_stats = {}
+    inline_lookups = [0, 0]
+    block_entries = []
+    options = dict(
+        stage_stats=stage_stats,
+        inline_cache_size=inline_cache_size,
+        block_cache_path=block_cache_path,
+    )
+    if workers == 1 or len(jobs) <= 1:
+        results = map(partial(render_job, **options), jobs)
+        collect_results(
+            results, page_timings, page_hashes, page_stats, inline_lookups, block_entries, on_page
+        )
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(render_jobs, jobs[i : i + chunksize], **options)
+                for i in range(0, len(jobs), chunksize)
+            ]
+            # Report chunks as they finish, so one slow page does not hold
+            # back progress for every page submitted after it.
+            for future in as_completed(futures):
+                collect_results(
+                    future.result(),
+                    page_timings,
+                    page_hashes,
+                    page_stats,
+                    inline_lookups,
+                    block_entries,
+                    on_page,
+                )
+
+    finish_build(output_dir, manifest, source_stats, page_hashes)
+    if block_cache_path is not None:
+        save_block_cache(block_cache_path, block_entries)
+
+    inline_cache_stats = None
+    if inline_cache_size is not None:
+        inline_cache_stats = inline_cache_summary(inline_lookups)
+    return BuildReport(
+        page_timings,
+        time.perf_counter() - start,
+        skipped,
+        removed,
+        page_stats,
+        inline_cache_stats,
+    )
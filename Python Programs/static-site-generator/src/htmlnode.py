@@ -1,4 +1,72 @@
+import time
+from types import MappingProxyType
+
+import pipeline_stats
+
+
+class FrozenNodeError(AttributeError):
+    pass
+
+
+def escape_attribute(value):
+    """Escapes a value for use inside a double-quoted attribute.
+
+    Each replace only runs when its character is present, so values that
+    need no escaping cost four substring checks.
+    """
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    return value
+
+
+def escape_text(value):
+    """Escapes text content. Like escape_attribute, text without &, < or >
+    is returned as is after three substring checks."""
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    return value
+
+
+# Joins a run of sibling values for escape_text_run. It is not changed by
+# escaping and cannot appear in XML-compatible text.
+RUN_SEPARATOR = "\0"
+
+
+def escape_text_run(values):
+    """Escapes several text values with one escape_text call.
+
+    Returns a list in the same order. Values containing RUN_SEPARATOR are
+    escaped one at a time instead.
+    """
+    joined = RUN_SEPARATOR.join(values)
+    if joined.count(RUN_SEPARATOR) != len(values) - 1:
+        return [escape_text(value) for value in values]
+    return escape_text(joined).split(RUN_SEPARATOR)
+
+
+def render_props(items):
+    """Joins (name, value) pairs into an attribute string with escaped values."""
+    parts = []
+    for name, value in items:
+        if type(value) is not str:
+            value = str(value)
+        parts.append(f' {name}="{escape_attribute(value)}"')
+    return "".join(parts)
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -6,38 +74,92 @@ class HTMLNode:
         self.props = props
 
     def to_html(self):
-        raise NotImplementedError("to_html method not implemented")
+        stats = pipeline_stats.active
+        if stats is not None:
+            start = time.perf_counter()
+            html = "".join(self.iter_html())
+            stats.record("to_html", time.perf_counter() - start, pipeline_stats.count_nodes(self))
+            return html
+        return "".join(self.iter_html())
+
+    def iter_html(self):
+        raise NotImplementedError("iter_html method not implemented")
+
+    def freeze(self):
+        raise NotImplementedError("freeze method not implemented")
+
+    def render_to(self, stream):
+        """Writes the node's HTML to a file-like object fragment by fragment."""
+        write = stream.write
+        for fragment in self.iter_html():
+            write(fragment)
 
     def props_to_html(self):
-        if self.props is None:
+        """Returns the node's attributes as a string, with values escaped."""
+        if not self.props:
             return ""
-
-        attributes = ""
-        for key, val in self.props.items():
-            attributes += f' {key}="{val}"'
-        return attributes
+        return render_props(self.props.items())
 
     def __repr__(self):
         return f"HTMLNode({repr(self.tag)}, {repr(self.value)}, children: {repr(self.children)}, {repr(self.props)})"
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
         if value is None:
             raise ValueError("LeafNode requires a value")
 
     def to_html(self):
-        if self.value is None:
+        value = self.value
+        if value is None:
             raise ValueError("LeafNode requires a value to render to HTML")
+        if type(value) is not str:
+            value = str(value)
 
         if self.tag is None:
-            return self.value
+            return escape_text(value)
+
+        return f"<{self.tag}{self.props_to_html()}>{escape_text(value)}</{self.tag}>"
+
+    def iter_html(self):
+        yield self.to_html()
+
+    def freeze(self):
+        """Renders the leaf once and makes it immutable.
+
+        Later to_html calls return the stored HTML, and setting any
+        attribute raises FrozenNodeError. Returns the node itself.
+        """
+        if self.props is not None:
+            self.props = MappingProxyType(dict(self.props))
+        html = self.to_html()
+        self.__class__ = FrozenLeafNode
+        _CHILDREN_SLOT.__set__(self, html)
+        return self
+
+
+class RawHTMLNode(LeafNode):
+    """A leaf whose value is HTML that is already rendered and is output
+    without escaping, such as a block taken from a BlockCache."""
 
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+    __slots__ = ()
+
+    def __init__(self, html):
+        super().__init__(None, html)
+
+    def to_html(self):
+        return self.value
+
+    def __repr__(self):
+        return f"RawHTMLNode({self.value!r})"
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
         if self.tag is None:
@@ -45,9 +167,160 @@ class ParentNode(HTMLNode):
         if self.children is None:
             raise ValueError("ParentNode requires a list of children (can be empty)")
 
+    def iter_html(self):
+        """Yields HTML fragments using an explicit stack instead of recursion,
+        so arbitrarily deep trees render without hitting the recursion limit."""
+        run_threshold = ESCAPE_RUN_THRESHOLD
+        yield f"<{self.tag}{self.props_to_html()}>"
+        stack = [(self, _iter_children(self.children, run_threshold))]
+        while stack:
+            node, children = stack[-1]
+            for child_node in children:
+                if child_node.__class__ is LeafNode:
+                    # LeafNode.to_html inlined, as most children are plain leaves.
+                    value = child_node.value
+                    if value is None:
+                        raise ValueError("LeafNode requires a value to render to HTML")
+                    if type(value) is not str:
+                        value = str(value)
+                    if "&" in value or "<" in value or ">" in value:
+                        value = escape_text(value)
+                    tag = child_node.tag
+                    if tag is None:
+                        yield value
+                    else:
+                        yield f"<{tag}{child_node.props_to_html()}>{value}</{tag}>"
+                elif isinstance(child_node, LeafNode):
+                    yield child_node.to_html()
+                elif isinstance(child_node, FrozenParentNode) and child_node._html is not None:
+                    yield child_node._html
+                elif isinstance(child_node, ParentNode):
+                    yield f"<{child_node.tag}{child_node.props_to_html()}>"
+                    if run_threshold is None:
+                        stack.append((child_node, iter(child_node.children)))
+                    else:
+                        stack.append(
+                            (child_node, _iter_children(child_node.children, run_threshold))
+                        )
+                    break
+                elif isinstance(child_node, str):
+                    # Already rendered by _iter_children.
+                    yield child_node
+                else:
+                    yield from child_node.iter_html()
+            else:
+                stack.pop()
+                yield f"</{node.tag}>"
+
+    def freeze(self, cache_html=True):
+        """Freezes this node and everything below it.
+
+        Leaves store their HTML; children become tuples and props read-only
+        mappings, so nothing in the subtree can change afterwards. With
+        cache_html=True this node also stores the HTML of the whole subtree,
+        which is then returned without walking it. Returns the node itself.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, (FrozenLeafNode, FrozenParentNode)):
+                continue
+            if isinstance(node, LeafNode):
+                node.freeze()
+                continue
+            if not isinstance(node, ParentNode):
+                raise TypeError(f"Cannot freeze {type(node).__name__}")
+            node.children = tuple(node.children)
+            if node.props is not None:
+                node.props = MappingProxyType(dict(node.props))
+            node.__class__ = FrozenParentNode
+            _VALUE_SLOT.__set__(node, None)
+            stack.extend(node.children)
+
+        if cache_html and self._html is None:
+            _VALUE_SLOT.__set__(self, "".join(ParentNode.iter_html(self)))
+        return self
+
+
+# With a number here, parents with at least that many children escape the
+# text of all their plain leaves with one escape_text_run call instead of
+# one check per leaf. None (the default) turns this off: on the benchmark
+# corpora the per-leaf fast path is cheaper, since most text needs no
+# escaping, but a run can win for long runs of text that does.
+ESCAPE_RUN_THRESHOLD = None
+
+
+def _iter_children(children, run_threshold):
+    """Iterates children for ParentNode.iter_html.
+
+    Long child lists come back with their plain leaves already rendered to
+    strings, using one escape_text_run call for the whole list.
+    """
+    if run_threshold is None or len(children) < run_threshold:
+        return iter(children)
+    leaves = [child for child in children if child.__class__ is LeafNode]
+    try:
+        escaped = iter(escape_text_run([leaf.value for leaf in leaves]))
+    except TypeError:
+        # A leaf without a value; let rendering raise the usual error.
+        return iter(children)
+    items = []
+    for child in children:
+        if child.__class__ is not LeafNode:
+            items.append(child)
+        elif child.tag is None:
+            items.append(next(escaped))
+        else:
+            items.append(f"<{child.tag}{child.props_to_html()}>{next(escaped)}</{child.tag}>")
+    return iter(items)
+
+
+# Frozen nodes keep their HTML in the base slot their kind leaves unused,
+# children for leaves and value for parents, so nodes need no extra slot.
+# The frozen classes read it back as _html and still report the usual
+# None for that attribute.
+_VALUE_SLOT = HTMLNode.value
+_CHILDREN_SLOT = HTMLNode.children
+
+
+def _refuse_change(node, name, *args):
+    raise FrozenNodeError(f"Cannot change {name!r} of a frozen {type(node).__name__}")
+
+
+class FrozenLeafNode(LeafNode):
+    """A LeafNode after freeze(): immutable, with its HTML rendered once."""
+
+    __slots__ = ()
+    __setattr__ = _refuse_change
+    __delattr__ = _refuse_change
+
+    _html = property(_CHILDREN_SLOT.__get__)
+    children = property(lambda self: None)
+
+    def to_html(self):
+        return _CHILDREN_SLOT.__get__(self)
+
+    def freeze(self):
+        return self
+
+
+class FrozenParentNode(ParentNode):
+    """A ParentNode after freeze(): its whole subtree is immutable."""
+
+    __slots__ = ()
+    __setattr__ = _refuse_change
+    __delattr__ = _refuse_change
+
+    _html = property(_VALUE_SLOT.__get__)
+    value = property(lambda self: None)
+
     def to_html(self):
-        children_html_content = ""
-        for child_node in self.children:
-            children_html_content += child_node.to_html()
+        if self._html is not None:
+            return self._html
+        return super().to_html()
 
-        return f"<{self.tag}{self.props_to_html()}>{children_html_content}</{self.tag}>"
+    def iter_html(self):
+        if self._html is not None:
+            yield self._html
+        else:
+            yield from super().iter_html()
@@ -1,5 +1,6 @@
 import re
 from textnode import TextNode, TextType
+from inline_tokens import NODE, TEXT, InlineTokens, token_code
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -31,7 +32,15 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 
-def split_nodes_image(old_nodes):
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+
+def split_nodes_pattern(old_nodes, pattern, text_type):
+    """Splits TEXT nodes on every match of pattern, slicing by match offsets.
+
+    The pattern's two groups become the new node's text and url.
+    """
     new_nodes = []
     for old_node in old_nodes:
         if old_node.text_type != TextType.TEXT:
@@ -39,87 +48,364 @@ def split_nodes_image(old_nodes):
             continue
 
         original_text = old_node.text
-        images = extract_markdown_images(original_text)
-
-        if not images:
+        position = 0
+        for match in pattern.finditer(original_text):
+            start, end = match.span()
+            if start > position:
+                new_nodes.append(TextNode(original_text[position:start], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = end
+
+        if position == 0:
             if original_text:
-                new_nodes.append(TextNode(original_text, TextType.TEXT))
-            continue
-
-        remaining_text = original_text
-        for alt_text, url in images:
-            parts = remaining_text.split(f"![{alt_text}]({url})", 1)
-            if len(parts) < 2:
-                continue
-
-            text_before = parts[0]
-            text_after = parts[1]
-
-            if text_before:
-                new_nodes.append(TextNode(text_before, TextType.TEXT))
+                new_nodes.append(old_node)
+        elif position < len(original_text):
+            new_nodes.append(TextNode(original_text[position:], TextType.TEXT))
 
-            new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
-            remaining_text = text_after
+    return new_nodes
 
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
 
-    return new_nodes
+def split_nodes_image(old_nodes):
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
 
 def split_nodes_link(old_nodes):
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
+    return split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
 
-        original_text = old_node.text
-        links = extract_markdown_links(original_text)
 
-        if not links:
-            if original_text:
-                new_nodes.append(TextNode(original_text, TextType.TEXT))
-            continue
+def extract_markdown_images(text):
+    return IMAGE_PATTERN.findall(text)
 
-        remaining_text = original_text
-        for anchor_text, url in links:
-            parts = remaining_text.split(f"[{anchor_text}]({url})", 1)
-            if len(parts) < 2:
-                continue
 
-            text_before = parts[0]
-            text_after = parts[1]
+def extract_markdown_links(text):
+    return LINK_PATTERN.findall(text)
 
-            if text_before:
-                new_nodes.append(TextNode(text_before, TextType.TEXT))
 
-            new_nodes.append(TextNode(anchor_text, TextType.LINK, url))
-            remaining_text = text_after
+class InlinePattern:
+    """An inline syntax matched by a regular expression, like images and links.
 
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
+    make_node is called with the pattern's own groups and returns a TextNode.
+    first_chars, if given, lists every character a match can start with,
+    which lets the scanner skip ahead to candidate positions. The pattern is
+    embedded in a larger alternation, so it must not use numbered
+    backreferences.
 
-    return new_nodes
+    text_type, if given, says make_node builds TextNode(text, text_type,
+    url) from the pattern's two groups, which must always match. Then
+    text_to_tokens records the groups as offsets instead of calling it.
+    """
 
+    __slots__ = ("name", "pattern", "make_node", "first_chars", "group_count", "text_type")
 
-def extract_markdown_images(text):
-    matches = re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
-    return matches
+    def __init__(self, name, pattern, make_node, first_chars=None, text_type=None):
+        self.name = name
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.make_node = make_node
+        self.first_chars = first_chars
+        self.group_count = self.pattern.groups
+        self.text_type = text_type
+        if text_type is not None and self.group_count != 2:
+            raise ValueError(
+                f"Inline pattern {name!r} with a text_type needs 2 groups, not {self.group_count}"
+            )
 
+    def __repr__(self):
+        return f"InlinePattern({self.name!r}, {self.pattern.pattern!r})"
+
+
+class InlineDelimiter:
+    """An inline syntax wrapped in a delimiter, like code, bold and italic.
+
+    Earlier delimiters take precedence: inside a span, later delimiters are
+    kept as literal text, while an earlier one means the span was never
+    closed.
+    """
+
+    __slots__ = ("delimiter", "text_type")
+
+    def __init__(self, delimiter, text_type):
+        self.delimiter = delimiter
+        self.text_type = text_type
+
+    def __repr__(self):
+        return f"InlineDelimiter({self.delimiter!r}, {self.text_type!r})"
+
+
+class InlineScanner:
+    """Compiles registered inline syntaxes into one regular expression.
+
+    Every syntax is an outer capturing group of a single alternation, so a
+    match's lastindex identifies its syntax with one dict lookup however
+    many syntaxes are registered. When every syntax declares the characters
+    it can start with, a lookahead on those characters lets the regex engine
+    skip plain text quickly.
+    """
+
+    def __init__(self, patterns, delimiters):
+        self.patterns = list(patterns)
+        self.delimiters = list(delimiters)
+        alternatives = []
+        self.pattern_groups = {}
+        self.pattern_codes = {}
+        first_chars = set()
+        group = 1
+        for syntax in self.patterns:
+            if first_chars is not None and syntax.first_chars:
+                first_chars.update(syntax.first_chars)
+            else:
+                first_chars = None
+            alternatives.append(f"({syntax.pattern.pattern})")
+            indices = tuple(range(group + 1, group + 1 + syntax.group_count))
+            self.pattern_groups[group] = (syntax, indices)
+            if syntax.text_type is not None:
+                self.pattern_codes[group] = token_code(syntax.text_type)
+            group += 1 + syntax.group_count
+
+        self.delimiter_group = None
+        self.delimiter_types = {}
+        self.delimiter_codes = {}
+        self.delimiter_ranks = {}
+        if self.delimiters:
+            for rank, syntax in enumerate(self.delimiters):
+                self.delimiter_types[syntax.delimiter] = syntax.text_type
+                self.delimiter_codes[syntax.delimiter] = token_code(syntax.text_type)
+                self.delimiter_ranks[syntax.delimiter] = rank
+                if first_chars is not None:
+                    first_chars.add(syntax.delimiter[0])
+            # Longest first, so "**" is not read as two "*" delimiters.
+            ordered = sorted(self.delimiter_types, key=len, reverse=True)
+            alternatives.append("(" + "|".join(re.escape(d) for d in ordered) + ")")
+            self.delimiter_group = group
+
+        self.regex = None
+        if alternatives:
+            regex = "|".join(alternatives)
+            if first_chars:
+                charset = "".join(re.escape(char) for char in sorted(first_chars))
+                regex = f"(?=[{charset}])(?:{regex})"
+            self.regex = re.compile(regex)
+
+    def walk(self, text, emit_text, emit_pattern, emit_span):
+        """Scans inline markdown left to right, reporting each piece once.
+
+        emit_text(start, end) is called for plain text, emit_pattern(group,
+        match) for a match of the pattern in that outer group of regex, and
+        emit_span(delimiter, start, end) for the text inside a closed
+        delimiter. scan and scan_tokens differ only in these callbacks.
+        """
+        if self.regex is None:
+            if text:
+                emit_text(0, len(text))
+            return
+
+        delimiter_group = self.delimiter_group
+        ranks = self.delimiter_ranks
+        position = 0
+        segment_start = 0
+        open_delimiter = None
+        open_rank = 0
+        open_at = 0
+
+        for match in self.regex.finditer(text):
+            group = match.lastindex
+            start, end = match.span()
+
+            if group != delimiter_group:
+                if open_delimiter is not None:
+                    raise _unclosed_delimiter_error(
+                        open_delimiter, text[segment_start:start]
+                    )
+                if start > position:
+                    emit_text(position, start)
+                emit_pattern(group, match)
+                position = segment_start = end
+                continue
 
-def extract_markdown_links(text):
-    matches = re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
-    return matches
+            delimiter = text[start:end]
+            if open_delimiter is None:
+                if start > position:
+                    emit_text(position, start)
+                open_delimiter = delimiter
+                open_rank = ranks[delimiter]
+                open_at = end
+            elif delimiter == open_delimiter:
+                if start > open_at:
+                    emit_span(delimiter, open_at, start)
+                open_delimiter = None
+                position = end
+            elif ranks[delimiter] < open_rank:
+                raise _unclosed_delimiter_error(open_delimiter, text[segment_start:start])
+
+        if open_delimiter is not None:
+            raise _unclosed_delimiter_error(open_delimiter, text[segment_start:])
+        if position < len(text):
+            emit_text(position, len(text))
+
+    def scan(self, text):
+        """Converts inline markdown to TextNodes in a single left-to-right scan."""
+        nodes = []
+        append = nodes.append
+        pattern_groups = self.pattern_groups
+        delimiter_types = self.delimiter_types
+
+        def emit_text(start, end):
+            append(TextNode(text[start:end], TextType.TEXT))
+
+        def emit_pattern(group, match):
+            syntax, indices = pattern_groups[group]
+            append(_make_pattern_node(syntax, indices, match))
+
+        def emit_span(delimiter, start, end):
+            append(TextNode(text[start:end], delimiter_types[delimiter]))
+
+        self.walk(text, emit_text, emit_pattern, emit_span)
+        return nodes
+
+    def scan_tokens(self, text):
+        """Like scan, but returns the tokens as an InlineTokens."""
+        tokens = InlineTokens(text)
+        types = tokens.types
+        starts = tokens.starts
+        ends = tokens.ends
+        pattern_groups = self.pattern_groups
+        pattern_codes = self.pattern_codes
+        delimiter_codes = self.delimiter_codes
+
+        def emit_text(start, end):
+            types.append(TEXT)
+            starts.append(start)
+            ends.append(end)
+
+        def emit_pattern(group, match):
+            syntax, indices = pattern_groups[group]
+            code = pattern_codes.get(group)
+            if code is not None:
+                text_start, text_end = match.span(indices[0])
+                url_start, url_end = match.span(indices[1])
+                types.append(code)
+                starts.append(text_start)
+                ends.append(text_end)
+                tokens.url_starts.append(url_start)
+                tokens.url_ends.append(url_end)
+                return
+            if tokens.nodes is None:
+                tokens.nodes = []
+            tokens.nodes.append(_make_pattern_node(syntax, indices, match))
+            start, end = match.span()
+            types.append(NODE)
+            starts.append(start)
+            ends.append(end)
+
+        def emit_span(delimiter, start, end):
+            types.append(delimiter_codes[delimiter])
+            starts.append(start)
+            ends.append(end)
+
+        self.walk(text, emit_text, emit_pattern, emit_span)
+        return tokens
+
+
+def _make_pattern_node(syntax, indices, match):
+    if len(indices) > 1:
+        return syntax.make_node(*match.group(*indices))
+    if indices:
+        return syntax.make_node(match.group(indices[0]))
+    return syntax.make_node()
+
+
+def _unclosed_delimiter_error(delimiter, text):
+    return ValueError(
+        f"Invalid markdown: unclosed delimiter '{delimiter}' in text: '{text}'"
+    )
+
+
+_inline_patterns = []
+_inline_delimiters = []
+_inline_scanner = None
+
+
+def _rebuild_inline_scanner():
+    global _inline_scanner
+    patterns = [syntax for _, _, syntax in sorted(_inline_patterns, key=_priority_key)]
+    delimiters = [syntax for _, _, syntax in sorted(_inline_delimiters, key=_priority_key)]
+    _inline_scanner = InlineScanner(patterns, delimiters)
+
+
+def _priority_key(entry):
+    priority, order, _ = entry
+    return (-priority, order)
+
+
+def register_inline_pattern(
+    name, pattern, make_node, priority=0, first_chars=None, text_type=None
+):
+    """Adds a regex-based inline syntax to text_to_textnodes.
+
+    Patterns with a higher priority are tried first at each position; ties
+    keep registration order. Returns the registered InlinePattern.
+    """
+    syntax = InlinePattern(name, pattern, make_node, first_chars, text_type)
+    _inline_patterns.append((priority, len(_inline_patterns) + len(_inline_delimiters), syntax))
+    _rebuild_inline_scanner()
+    return syntax
+
+
+def register_inline_delimiter(delimiter, text_type, priority=0):
+    """Adds a delimited inline syntax to text_to_textnodes.
+
+    Delimiters with a higher priority take precedence over lower ones; ties
+    keep registration order. Returns the registered InlineDelimiter.
+    """
+    if any(syntax.delimiter == delimiter for _, _, syntax in _inline_delimiters):
+        raise ValueError(f"Inline delimiter already registered: '{delimiter}'")
+    syntax = InlineDelimiter(delimiter, text_type)
+    _inline_delimiters.append((priority, len(_inline_patterns) + len(_inline_delimiters), syntax))
+    _rebuild_inline_scanner()
+    return syntax
+
+
+def unregister_inline_syntax(syntax):
+    """Removes an InlinePattern or InlineDelimiter returned by a register call."""
+    for registry in (_inline_patterns, _inline_delimiters):
+        for entry in registry:
+            if entry[2] is syntax:
+                registry.remove(entry)
+                _rebuild_inline_scanner()
+                return
+    raise ValueError(f"Inline syntax is not registered: {syntax!r}")
+
+
+register_inline_pattern(
+    "image",
+    IMAGE_PATTERN,
+    lambda alt, src: TextNode(alt, TextType.IMAGE, src),
+    first_chars="!",
+    text_type=TextType.IMAGE,
+)
+register_inline_pattern(
+    "link",
+    LINK_PATTERN,
+    lambda anchor, href: TextNode(anchor, TextType.LINK, href),
+    first_chars="[",
+    text_type=TextType.LINK,
+)
+register_inline_delimiter("`", TextType.CODE)
+register_inline_delimiter("**", TextType.BOLD)
+register_inline_delimiter("_", TextType.ITALIC)
 
 
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
+    """Converts inline markdown to TextNodes in a single left-to-right scan.
+
+    With the built-in syntaxes this produces the same nodes as splitting
+    images, links, code, bold and italic in that order: images and links
+    are found first, code spans take precedence over bold, and bold takes
+    precedence over italic.
+    """
+    return _inline_scanner.scan(text)
 
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
 
-    return nodes
+def text_to_tokens(text):
+    """Converts inline markdown to an InlineTokens, the compact form of
+    text_to_textnodes(text): the same tokens as offsets into text."""
+    return _inline_scanner.scan_tokens(text)
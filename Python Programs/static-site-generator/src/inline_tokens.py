@@ -0,0 +1,167 @@
+from array import array
+
+from htmlnode import LeafNode, escape_attribute, escape_text
+from textnode import (
+    LEAF_TEMPLATES,
+    SIMPLE_LEAF_TAGS,
+    TextNode,
+    TextType,
+    text_node_to_html_node,
+)
+
+
+# Type codes of the built-in text types. Text types added by extensions
+# get the next free code the first time token_code sees them.
+TEXT, BOLD, ITALIC, CODE, LINK, IMAGE = range(6)
+TOKEN_TYPES = [
+    TextType.TEXT,
+    TextType.BOLD,
+    TextType.ITALIC,
+    TextType.CODE,
+    TextType.LINK,
+    TextType.IMAGE,
+]
+_TOKEN_CODES = {text_type: code for code, text_type in enumerate(TOKEN_TYPES)}
+
+# A token made by an extension's InlinePattern.make_node; the TextNode
+# itself is kept in InlineTokens.nodes.
+NODE = 255
+
+
+def token_code(text_type):
+    """Returns the type code InlineTokens uses for text_type."""
+    code = _TOKEN_CODES.get(text_type)
+    if code is None:
+        if len(TOKEN_TYPES) >= NODE:
+            raise ValueError(f"Too many text types for InlineTokens: {text_type}")
+        code = _TOKEN_CODES[text_type] = len(TOKEN_TYPES)
+        TOKEN_TYPES.append(text_type)
+    return code
+
+
+# The simple leaves other than plain text, by type code, from the tables
+# text_node_to_html_node and text_node_to_html use.
+_TAG_NAMES = {
+    token_code(text_type): tag for text_type, tag in SIMPLE_LEAF_TAGS.items() if tag is not None
+}
+_SIMPLE_TAGS = {code: LEAF_TEMPLATES[TOKEN_TYPES[code]] for code in _TAG_NAMES}
+
+
+class InlineTokens:
+    """The inline markdown of one paragraph as parallel arrays.
+
+    Token i has type code types[i] and its text is source[starts[i]:ends[i]].
+    Links and images also take the next URL from the side table, so the
+    n-th token with a URL has source[url_starts[n]:url_ends[n]]. A NODE
+    token takes the next TextNode from nodes instead, and its offsets are
+    those of the whole match. No strings are made until a token is read.
+    """
+
+    __slots__ = ("source", "types", "starts", "ends", "url_starts", "url_ends", "nodes")
+
+    def __init__(self, source):
+        self.source = source
+        self.types = array("B")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.url_starts = array("I")
+        self.url_ends = array("I")
+        self.nodes = None
+
+    def __len__(self):
+        return len(self.types)
+
+    def to_textnodes(self):
+        """Returns the TextNodes text_to_textnodes would have made."""
+        source = self.source
+        url_starts = self.url_starts
+        url_ends = self.url_ends
+        nodes = self.nodes
+        url_index = 0
+        node_index = 0
+        text_nodes = []
+        for code, start, end in zip(self.types, self.starts, self.ends):
+            if code == NODE:
+                text_nodes.append(nodes[node_index])
+                node_index += 1
+            elif code == LINK or code == IMAGE:
+                url = source[url_starts[url_index]:url_ends[url_index]]
+                url_index += 1
+                text_nodes.append(TextNode(source[start:end], TOKEN_TYPES[code], url))
+            else:
+                text_nodes.append(TextNode(source[start:end], TOKEN_TYPES[code]))
+        return text_nodes
+
+    def __repr__(self):
+        return f"InlineTokens({len(self.types)} tokens, {len(self.source)} chars)"
+
+
+def tokens_to_html_nodes(tokens):
+    """Returns the LeafNodes text_node_to_html_node makes for each token."""
+    source = tokens.source
+    url_starts = tokens.url_starts
+    url_ends = tokens.url_ends
+    nodes = tokens.nodes
+    url_index = 0
+    node_index = 0
+    html_nodes = []
+    for code, start, end in zip(tokens.types, tokens.starts, tokens.ends):
+        if code == TEXT:
+            html_nodes.append(LeafNode(None, source[start:end]))
+        elif code == LINK:
+            url = source[url_starts[url_index]:url_ends[url_index]]
+            url_index += 1
+            html_nodes.append(LeafNode("a", source[start:end], {"href": url}))
+        elif code == IMAGE:
+            url = source[url_starts[url_index]:url_ends[url_index]]
+            url_index += 1
+            html_nodes.append(LeafNode("img", "", {"src": url, "alt": source[start:end]}))
+        elif code == NODE:
+            html_nodes.append(text_node_to_html_node(nodes[node_index]))
+            node_index += 1
+        elif code in _TAG_NAMES:
+            html_nodes.append(LeafNode(_TAG_NAMES[code], source[start:end]))
+        else:
+            text_node = TextNode(source[start:end], TOKEN_TYPES[code])
+            html_nodes.append(text_node_to_html_node(text_node))
+    return html_nodes
+
+
+def tokens_to_html(tokens):
+    """Renders tokens straight to HTML, without building any nodes.
+
+    The result is the same as joining the to_html of tokens_to_html_nodes.
+    """
+    source = tokens.source
+    url_starts = tokens.url_starts
+    url_ends = tokens.url_ends
+    nodes = tokens.nodes
+    url_index = 0
+    node_index = 0
+    parts = []
+    for code, start, end in zip(tokens.types, tokens.starts, tokens.ends):
+        if code == TEXT:
+            parts.append(escape_text(source[start:end]))
+        elif code in _SIMPLE_TAGS:
+            open_tag, close_tag = _SIMPLE_TAGS[code]
+            parts.append(open_tag + escape_text(source[start:end]) + close_tag)
+        elif code == LINK:
+            url = source[url_starts[url_index]:url_ends[url_index]]
+            url_index += 1
+            parts.append(
+                f'<a href="{escape_attribute(url)}">{escape_text(source[start:end])}</a>'
+            )
+        elif code == IMAGE:
+            url = source[url_starts[url_index]:url_ends[url_index]]
+            url_index += 1
+            parts.append(
+                f'<img src="{escape_attribute(url)}" '
+                f'alt="{escape_attribute(source[start:end])}"></img>'
+            )
+        elif code == NODE:
+            parts.append(text_node_to_html_node(nodes[node_index]).to_html())
+            node_index += 1
+        else:
+            text_node = TextNode(source[start:end], TOKEN_TYPES[code])
+            parts.append(text_node_to_html_node(text_node).to_html())
+    return "".join(parts)
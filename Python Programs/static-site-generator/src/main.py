@@ -1,9 +1,165 @@
-from textnode import TextNode, TextType
+import argparse
+import json
+import os
+import time
 
+from async_build import build_site_async
+from dev_server import DevServer
+from generate_site import build_site
+
+
+def print_page_timing(relative_path, seconds):
+    print(f"  {relative_path}: {seconds * 1000:.2f} ms")
+
+
+def write_stage_stats(report, path):
+    build_stats = report.build_stats()
+    print(f"{'stage':>28} {'calls':>9} {'ms':>10} {'nodes':>9}")
+    for stage, entry in sorted(build_stats.stages.items(), key=lambda item: -item[1].seconds):
+        print(f"{stage:>28} {entry.calls:>9} {entry.seconds * 1000:>10.2f} {entry.nodes:>9}")
+    stats = {
+        "build": build_stats.to_dict(),
+        "pages": {page: stats.to_dict() for page, stats in sorted(report.page_stats.items())},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+
+
+def build_command(args):
+    on_page = None if args.quiet else print_page_timing
+    options = dict(
+        on_page=on_page,
+        template_path=args.template,
+        incremental=not args.full,
+        stage_stats=args.stage_stats is not None,
+        inline_cache_size=args.inline_cache,
+        block_cache_path=args.block_cache,
+    )
+    if args.io_concurrency is None:
+        report = build_site(args.content, args.output, workers=args.workers, **options)
+    else:
+        report = build_site_async(
+            args.content,
+            args.output,
+            concurrency=args.io_concurrency,
+            workers=args.workers or os.cpu_count() or 1,
+            **options,
+        )
+    print(
+        f"Built {report.page_count} pages in {report.elapsed:.2f}s "
+        f"({report.pages_per_second:.1f} pages/s), "
+        f"{report.skipped} unchanged, {report.removed} removed"
+    )
+    if report.inline_cache_stats is not None:
+        stats = report.inline_cache_stats
+        print(
+            f"Inline cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.1%} hit rate)"
+        )
+    if args.stage_stats is not None and report.page_stats:
+        write_stage_stats(report, args.stage_stats)
+
+
+def print_rebuild(timings, deleted, seconds):
+    for relative_path in sorted(deleted):
+        print(f"  removed {relative_path}")
+    for relative_path, page_seconds in sorted(timings.items()):
+        print(f"  rebuilt {relative_path}: {page_seconds * 1000:.2f} ms")
+    print(f"Rebuild finished in {seconds * 1000:.2f} ms")
+
+
+def serve_command(args):
+    server = DevServer(
+        args.content,
+        args.output,
+        host=args.host,
+        port=args.port,
+        template_path=args.template,
+        poll_interval=args.poll_interval,
+        on_rebuild=print_rebuild,
+    )
+    report = server.start(watch=args.watch)
+    print(f"Built {report.page_count} pages, {report.skipped} unchanged")
+    print(f"Serving {args.output} at {server.url}" + (" (watching)" if args.watch else ""))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Static site generator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="Render every markdown page in a content directory"
+    )
+    build_parser.add_argument("--content", default="content")
+    build_parser.add_argument("--output", default="public")
+    build_parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPU count)"
+    )
+    build_parser.add_argument(
+        "--template", default=None, help="HTML template containing {{ Content }}"
+    )
+    build_parser.add_argument(
+        "--full", action="store_true", help="Ignore the build manifest and rebuild every page"
+    )
+    build_parser.add_argument(
+        "--io-concurrency",
+        type=int,
+        default=None,
+        help="Use the asyncio builder with this many pages in flight (for slow filesystems)",
+    )
+    build_parser.add_argument(
+        "--inline-cache",
+        type=int,
+        metavar="ENTRIES",
+        default=None,
+        help="Reuse parsed inline text that repeats across pages, up to this many entries",
+    )
+    build_parser.add_argument(
+        "--block-cache",
+        metavar="PATH",
+        default=None,
+        help="Reuse rendered blocks from this file and save this build's blocks to it",
+    )
+    build_parser.add_argument(
+        "--stage-stats",
+        metavar="PATH",
+        default=None,
+        help="Record per-stage timings and write per-page and per-build totals as JSON",
+    )
+    build_parser.add_argument(
+        "--quiet", action="store_true", help="Only print the build summary"
+    )
+    build_parser.set_defaults(func=build_command)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Build, then serve the output directory over HTTP"
+    )
+    serve_parser.add_argument("--content", default="content")
+    serve_parser.add_argument("--output", default="public")
+    serve_parser.add_argument("--template", default=None)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8888)
+    serve_parser.add_argument(
+        "--watch", action="store_true", help="Re-render pages when their source changes"
+    )
+    serve_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.25,
+        help="Seconds between scans when inotify is unavailable",
+    )
+    serve_parser.set_defaults(func=serve_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
 
-def main():
-    node = TextNode("This is some anchor text", TextType.LINK, "https://www.boot.dev")
-    print(node)
 
 if __name__ == "__main__":
     main()
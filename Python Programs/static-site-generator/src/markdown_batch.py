@@ -0,0 +1,122 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from block_cache import BlockCache, InlineCache
+from block_markdown import direct_inline_html, inline_cache, markdown_to_html_node
+
+
+class BatchConverter:
+    """Converts many small markdown documents to HTML strings.
+
+    Block and inline caches are kept across documents, so repeated blocks
+    and repeated inline text are parsed once per converter. With workers
+    greater than 1, documents are sent in chunks to a process pool that
+    stays up until close(); each worker keeps its own caches.
+    """
+
+    def __init__(
+        self,
+        workers=1,
+        block_cache_size=10_000,
+        inline_cache_size=50_000,
+        chunksize=256,
+    ):
+        if workers < 1:
+            raise ValueError("BatchConverter requires workers >= 1")
+        self.workers = workers
+        self.chunksize = chunksize
+        self.block_cache_size = block_cache_size
+        self.inline_cache_size = inline_cache_size
+        self.block_cache = BlockCache(block_cache_size)
+        self.inline_cache = InlineCache(inline_cache_size)
+        self._executor = None
+
+    def convert(self, markdown):
+        with inline_cache(self.inline_cache), direct_inline_html():
+            return markdown_to_html_node(markdown, cache=self.block_cache).to_html()
+
+    def convert_many(self, documents):
+        """Yields the HTML of each document, in order.
+
+        documents is consumed lazily: at most a few chunks per worker are in
+        flight at once. In this process, each chunk is converted with the
+        converter's caches in effect and its results are yielded only after
+        they are switched off again, so code run between iterations is not
+        affected by them.
+        """
+        documents = iter(documents)
+        if self.workers == 1:
+            while True:
+                chunk = list(islice(documents, self.chunksize))
+                if not chunk:
+                    return
+                yield from self.convert_chunk(chunk)
+
+        executor = self._get_executor()
+        pending = deque()
+        while True:
+            while len(pending) < self.workers * 2:
+                chunk = list(islice(documents, self.chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_convert_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+    def convert_chunk(self, documents):
+        """Converts a list of documents in this process and returns their HTML."""
+        cache = self.block_cache
+        with inline_cache(self.inline_cache), direct_inline_html():
+            return [markdown_to_html_node(markdown, cache=cache).to_html() for markdown in documents]
+
+    def stats(self):
+        """Cache statistics for documents converted in this process."""
+        return {"block_cache": self.block_cache.stats(), "inline_cache": self.inline_cache.stats()}
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.block_cache_size, self.inline_cache_size),
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_worker_converter = None
+
+
+def _init_worker(block_cache_size, inline_cache_size):
+    global _worker_converter
+    _worker_converter = BatchConverter(
+        block_cache_size=block_cache_size, inline_cache_size=inline_cache_size
+    )
+
+
+def _convert_chunk(chunk):
+    return _worker_converter.convert_chunk(chunk)
+
+
+def markdown_to_html_many(documents, workers=1, converter=None):
+    """Converts an iterable of markdown documents to a list of HTML strings.
+
+    Pass a BatchConverter to keep its caches and worker pool between calls;
+    otherwise a temporary one is created with the given number of workers.
+    """
+    if converter is not None:
+        return list(converter.convert_many(documents))
+    with BatchConverter(workers=workers) as temporary:
+        return list(temporary.convert_many(documents))
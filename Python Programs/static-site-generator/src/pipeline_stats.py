@@ -0,0 +1,99 @@
+import time
+from contextlib import contextmanager
+
+
+# The PipelineStats currently recording, or None. The pipeline checks this
+# once per hooked call and does nothing else while it is None.
+active = None
+
+
+class StageStats:
+    __slots__ = ("calls", "seconds", "nodes")
+
+    def __init__(self, calls=0, seconds=0.0, nodes=0):
+        self.calls = calls
+        self.seconds = seconds
+        self.nodes = nodes
+
+    def to_dict(self):
+        return {"calls": self.calls, "seconds": self.seconds, "nodes": self.nodes}
+
+    def __repr__(self):
+        return f"StageStats({self.calls} calls, {self.seconds:.6f}s, {self.nodes} nodes)"
+
+
+class PipelineStats:
+    """Wall time, call counts and node counts per pipeline stage.
+
+    Stages are markdown_to_blocks, each block handler by function name
+    (e.g. paragraph_to_html_node), text_to_children and to_html. Times are
+    inclusive: a handler's time includes the text_to_children calls it
+    makes. nodes counts blocks for markdown_to_blocks, children for
+    text_to_children, and nodes in the result or rendered tree otherwise.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def record(self, stage, seconds, nodes=0):
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = StageStats()
+        entry.calls += 1
+        entry.seconds += seconds
+        entry.nodes += nodes
+
+    def call(self, stage, count, func, *args):
+        """Runs func(*args), recording its time and count(result) under stage."""
+        start = time.perf_counter()
+        result = func(*args)
+        self.record(stage, time.perf_counter() - start, count(result))
+        return result
+
+    def merge(self, other):
+        """Adds the stats of another PipelineStats, e.g. to total a build."""
+        for stage, entry in other.stages.items():
+            mine = self.stages.get(stage)
+            if mine is None:
+                mine = self.stages[stage] = StageStats()
+            mine.calls += entry.calls
+            mine.seconds += entry.seconds
+            mine.nodes += entry.nodes
+        return self
+
+    def to_dict(self):
+        return {stage: entry.to_dict() for stage, entry in sorted(self.stages.items())}
+
+    def __repr__(self):
+        return f"PipelineStats({len(self.stages)} stages)"
+
+
+def count_nodes(node):
+    """Counts node and everything below it."""
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        children = node.children
+        if children:
+            stack.extend(children)
+    return count
+
+
+@contextmanager
+def instrument(stats=None):
+    """Records pipeline stats inside the with block and yields them.
+
+    Like inline_cache, the setting is module-wide, so it should not be
+    changed while another thread is converting.
+    """
+    global active
+    if stats is None:
+        stats = PipelineStats()
+    previous = active
+    active = stats
+    try:
+        yield stats
+    finally:
+        active = previous
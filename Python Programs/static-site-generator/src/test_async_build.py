@@ -0,0 +1,171 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import async_build
+import generate_site
+from async_build import AsyncFileSystem, async_build_site, build_site_async
+from block_cache import BlockCache
+from build_manifest import BuildManifest
+from fixtures import read_file, write_file
+from generate_site import build_site
+
+
+class CountingFileSystem(AsyncFileSystem):
+    """Records the most reads that were ever in progress at once."""
+
+    def __init__(self, max_threads=32, latency=0.01):
+        super().__init__(max_threads)
+        self.latency = latency
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _read_bytes(self, path):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.latency)
+            return super()._read_bytes(path)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestAsyncBuildSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\nWelcome **here**")
+        for i in range(20):
+            write_file(os.path.join(self.content, "blog", f"post{i}.md"), f"- item {i}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_build_site(self):
+        seen = []
+        report = build_site_async(
+            self.content, self.output, concurrency=4, on_page=lambda p, s: seen.append(p)
+        )
+        self.assertEqual(report.page_count, 21)
+        self.assertEqual(sorted(seen), sorted(report.page_timings))
+
+        expected_output = os.path.join(self.tmp.name, "expected")
+        build_site(self.content, expected_output, workers=1)
+        for relative_path in report.page_timings:
+            output = os.path.splitext(relative_path)[0] + ".html"
+            self.assertEqual(
+                read_file(os.path.join(self.output, output)),
+                read_file(os.path.join(expected_output, output)),
+            )
+
+    def test_template(self):
+        template_path = os.path.join(self.tmp.name, "template.html")
+        write_file(template_path, "<html>{{ Content }}</html>")
+        build_site_async(self.content, self.output, template_path=template_path)
+        self.assertEqual(
+            read_file(os.path.join(self.output, "index.html")),
+            "<html><div><h1>Home</h1><p>Welcome <b>here</b></p></div></html>",
+        )
+
+    def test_incremental_manifest_is_shared_with_build_site(self):
+        build_site_async(self.content, self.output)
+        manifest = BuildManifest.load(self.output)
+        self.assertEqual(len(manifest.pages), 21)
+
+        report = build_site(self.content, self.output, workers=1)
+        self.assertEqual(report.page_count, 0)
+        self.assertEqual(report.skipped, 21)
+
+        write_file(os.path.join(self.content, "index.md"), "changed")
+        os.remove(os.path.join(self.content, "blog", "post0.md"))
+        report = build_site_async(self.content, self.output)
+        self.assertEqual(list(report.page_timings), ["index.md"])
+        self.assertEqual(report.removed, 1)
+
+    def test_concurrency_bounds_reads_in_flight(self):
+        filesystem = CountingFileSystem(max_threads=32)
+        try:
+            asyncio.run(
+                async_build_site(
+                    self.content, self.output, concurrency=3, filesystem=filesystem
+                )
+            )
+        finally:
+            filesystem.close()
+        self.assertGreater(filesystem.peak, 1)
+        self.assertLessEqual(filesystem.peak, 3)
+
+    def test_stage_stats_and_inline_cache(self):
+        # Rendering on a thread uses this process's InlineCache; start and
+        # end with a fresh one.
+        generate_site._process_inline_cache = None
+        self.addCleanup(setattr, generate_site, "_process_inline_cache", None)
+        report = build_site_async(
+            self.content, self.output, workers=1, stage_stats=True, inline_cache_size=100
+        )
+        self.assertEqual(sorted(report.page_stats), sorted(report.page_timings))
+        build_stats = report.build_stats().to_dict()
+        self.assertEqual(build_stats["markdown_to_blocks"]["calls"], 21)
+        stats = report.inline_cache_stats
+        self.assertEqual(stats["hits"] + stats["misses"], 22)
+
+        plain = build_site_async(self.content, os.path.join(self.tmp.name, "plain"))
+        self.assertEqual(plain.page_stats, {})
+        self.assertIsNone(plain.inline_cache_stats)
+
+    def test_block_cache(self):
+        path = os.path.join(self.tmp.name, "blocks.json")
+        generate_site._process_block_cache = None
+        self.addCleanup(setattr, generate_site, "_process_block_cache", None)
+        build_site_async(self.content, self.output, block_cache_path=path)
+        # "# Home", "Welcome **here**" and 20 lists.
+        self.assertEqual(len(BlockCache(path=path)), 22)
+
+    def test_large_pages_are_streamed(self):
+        expected_output = os.path.join(self.tmp.name, "expected")
+        build_site(self.content, expected_output, workers=1)
+        filesystem = CountingFileSystem(latency=0)
+        saved = async_build.LARGE_PAGE_BYTES, generate_site.LARGE_PAGE_BYTES
+        async_build.LARGE_PAGE_BYTES = generate_site.LARGE_PAGE_BYTES = 0
+        try:
+            report = asyncio.run(
+                async_build_site(self.content, self.output, filesystem=filesystem)
+            )
+        finally:
+            async_build.LARGE_PAGE_BYTES, generate_site.LARGE_PAGE_BYTES = saved
+            filesystem.close()
+        # render_page read each page itself, not through the filesystem.
+        self.assertEqual(filesystem.peak, 0)
+        self.assertEqual(report.page_count, 21)
+        for relative_path in report.page_timings:
+            output = os.path.splitext(relative_path)[0] + ".html"
+            self.assertEqual(
+                read_file(os.path.join(self.output, output)),
+                read_file(os.path.join(expected_output, output)),
+            )
+
+    def test_crlf_sources(self):
+        with open(os.path.join(self.content, "index.md"), "wb") as f:
+            f.write(b"# Title\r\n\r\nPara one\r\n\r\n- a\r\n- b\r\n")
+        build_site_async(self.content, self.output)
+        self.assertEqual(
+            read_file(os.path.join(self.output, "index.html")),
+            "<div><h1>Title</h1><p>Para one</p><ul><li>a</li><li>b</li></ul></div>",
+        )
+
+    def test_empty_content(self):
+        empty = os.path.join(self.tmp.name, "empty")
+        os.makedirs(empty)
+        report = build_site_async(empty, self.output)
+        self.assertEqual(report.page_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import json
+import os
+import tempfile
+import unittest
+
+from bench_corpus import CORPUS_SHAPES, make_shaped_corpus
+from block_cache import BlockCache, InlineCache
+from block_markdown import inline_cache, markdown_to_html_node, text_to_children
+
+
+MARKDOWN = """
+# Title
+
+A paragraph with **bold** and a [link](https://boot.dev).
+
+- one
+- two
+
+A paragraph with **bold** and a [link](https://boot.dev).
+"""
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = BlockCache()
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", "<p>v</p>")
+        self.assertEqual(cache.get("k"), "<p>v</p>")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_key_for_is_stable(self):
+        self.assertEqual(BlockCache.key_for("block"), BlockCache.key_for("block"))
+        self.assertNotEqual(BlockCache.key_for("block"), BlockCache.key_for("block2"))
+
+    def test_lru_eviction(self):
+        cache = BlockCache(max_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            BlockCache(max_entries=0)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "blocks.json")
+            cache = BlockCache(path=path)
+            cache.put("a", "A")
+            cache.put("b", "B")
+            cache.save()
+
+            reloaded = BlockCache(max_entries=1, path=path)
+            self.assertEqual(len(reloaded), 1)
+            self.assertEqual(reloaded.get("b"), "B")
+
+    def test_take_added(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = BlockCache(path=os.path.join(tmp, "blocks.json"))
+            cache.put("a", "A")
+            cache.put("b", "B")
+            self.assertEqual(cache.take_added(), [("a", "A"), ("b", "B")])
+            self.assertEqual(cache.take_added(), [])
+        # Caches without a file have nothing to send back.
+        cache = BlockCache()
+        cache.put("a", "A")
+        self.assertEqual(cache.take_added(), [])
+
+    def test_persisted_cache_from_other_generator_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"generator": "old", "entries": [["a", "A"]]}, f)
+            self.assertEqual(len(BlockCache(path=path)), 0)
+
+    def test_save_without_path(self):
+        with self.assertRaises(ValueError):
+            BlockCache().save()
+
+
+class TestMarkdownToHTMLNodeWithCache(unittest.TestCase):
+    def test_output_identical_with_cache(self):
+        cache = BlockCache()
+        expected = markdown_to_html_node(MARKDOWN).to_html()
+        self.assertEqual(markdown_to_html_node(MARKDOWN, cache=cache).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(MARKDOWN, cache=cache).to_html(), expected)
+
+    def test_unchanged_blocks_hit(self):
+        cache = BlockCache()
+        markdown_to_html_node(MARKDOWN, cache=cache)
+        # The repeated paragraph is already a hit on the first pass.
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+        edited = MARKDOWN.replace("- two", "- three")
+        markdown_to_html_node(edited, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+
+class TestInlineCache(unittest.TestCase):
+    def test_output_identical_with_cache_on_and_off(self):
+        for shape in CORPUS_SHAPES:
+            markdown = make_shaped_corpus(shape, 20_000)
+            expected = markdown_to_html_node(markdown).to_html()
+            for mode in InlineCache.MODES:
+                with self.subTest(shape=shape, mode=mode):
+                    cache = InlineCache(mode=mode)
+                    with inline_cache(cache):
+                        first = markdown_to_html_node(markdown).to_html()
+                        second = markdown_to_html_node(markdown).to_html()
+                    self.assertEqual(first, expected)
+                    self.assertEqual(second, expected)
+                    self.assertGreater(cache.hits, 0)
+
+    def test_repeated_text_shares_children(self):
+        for mode in InlineCache.MODES:
+            with self.subTest(mode=mode), inline_cache(InlineCache(mode=mode)) as cache:
+                first = text_to_children("Home | **Blog** | [About](/about)")
+                second = text_to_children("Home | **Blog** | [About](/about)")
+                self.assertIs(first, second)
+                self.assertIsInstance(first, tuple)
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_modes(self):
+        text = "a **b** c"
+        with inline_cache(InlineCache(mode="html")):
+            (leaf,) = text_to_children(text)
+        self.assertIsNone(leaf.tag)
+        self.assertEqual(leaf.value, "a <b>b</b> c")
+
+        with inline_cache(InlineCache(mode="nodes")):
+            children = text_to_children(text)
+        self.assertEqual([child.tag for child in children], [None, "b", None])
+
+    def test_cache_is_off_outside_with_block(self):
+        with inline_cache(InlineCache()):
+            pass
+        self.assertIsInstance(text_to_children("plain"), list)
+
+    def test_bounded(self):
+        cache = InlineCache(max_entries=2)
+        with inline_cache(cache):
+            for text in ["a", "b", "c", "a"]:
+                text_to_children(text)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 2)
+
+    def test_stats(self):
+        cache = InlineCache(mode="nodes")
+        with inline_cache(cache):
+            text_to_children("x")
+            text_to_children("x")
+        self.assertEqual(
+            cache.stats(),
+            {
+                "entries": 1,
+                "hits": 1,
+                "misses": 1,
+                "evictions": 0,
+                "hit_rate": 0.5,
+                "mode": "nodes",
+            },
+        )
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            InlineCache(mode="strings")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,34 @@
+import io
+import mmap
+import os
+import tempfile
 import unittest
-from block_markdown import markdown_to_blocks, BlockType, block_to_block_type, markdown_to_html_node
+import block_markdown
+from block_markdown import (
+    markdown_to_blocks,
+    BlockType,
+    block_to_block_type,
+    markdown_to_html_node,
+    iter_markdown_blocks,
+    iter_block_spans,
+    direct_inline_html,
+    markdown_to_html_stream,
+    markdown_file_to_html_stream,
+    normalize_newlines,
+    register_block_syntax,
+    unregister_block_syntax,
+)
+from htmlnode import LeafNode, ParentNode, RawHTMLNode
 
 
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_markdown_to_blocks_basic(self):
         md = """
 This is **bolded** paragraph
-This is another paragraph with *italic* text and `code` here
+
+This is another paragraph with _italic_ text and `code` here
 This is the same paragraph on a new line
+
 - This is a list
 - with items
         """
@@ -16,8 +37,8 @@ This is the same paragraph on a new line
         self.assertEqual(
             blocks,
             [
-                "This is bolded paragraph",
-                "This is another paragraph with italic text and code here\nThis is the same paragraph on a new line",
+                "This is **bolded** paragraph",
+                "This is another paragraph with _italic_ text and `code` here\nThis is the same paragraph on a new line",
                 "- This is a list\n- with items",
             ],
         )
@@ -47,6 +68,116 @@ This is the same paragraph on a new line
         blocks = markdown_to_blocks(md)
         self.assertEqual(blocks, ["block1", "block2"])
 
+    def test_code_fence_keeps_blank_lines(self):
+        md = "Intro\n\n```\ndef f():\n\n    return 1\n\n\n```\n\nOutro"
+        blocks = markdown_to_blocks(md)
+        self.assertEqual(
+            blocks, ["Intro", "```\ndef f():\n\n    return 1\n\n\n```", "Outro"]
+        )
+        self.assertEqual(block_to_block_type(blocks[1]), BlockType.CODE)
+
+    def test_code_fence_splits_surrounding_text(self):
+        md = "text before\n```py\nx = 1\n```\ntext after"
+        self.assertEqual(
+            markdown_to_blocks(md), ["text before", "```py\nx = 1\n```", "text after"]
+        )
+
+    def test_single_line_code_is_text(self):
+        md = "```x = 1```\nnext line\n\n```y```"
+        self.assertEqual(markdown_to_blocks(md), ["```x = 1```\nnext line", "```y```"])
+        self.assertEqual(block_to_block_type("```y```"), BlockType.CODE)
+
+    def test_backtick_in_info_string_is_not_a_fence(self):
+        md = "```npm``` is the tool\n\nNext paragraph\n\n- a\n- b"
+        self.assertEqual(
+            markdown_to_blocks(md), ["```npm``` is the tool", "Next paragraph", "- a\n- b"]
+        )
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><p><code>npm</code> is the tool</p><p>Next paragraph</p>"
+            "<ul><li>a</li><li>b</li></ul></div>",
+        )
+        # A later fence line still opens a fence.
+        md = "```a`b\ncode\n```\n\nstill code\n```"
+        self.assertEqual(markdown_to_blocks(md), ["```a`b\ncode", "```\n\nstill code\n```"])
+
+    def test_unclosed_code_fence_runs_to_end(self):
+        md = "```\ncode\n\nmore code"
+        self.assertEqual(markdown_to_blocks(md), ["```\ncode\n\nmore code"])
+
+    def test_fence_inside_line_is_text(self):
+        md = "use ``` to fence\n\nnext"
+        self.assertEqual(markdown_to_blocks(md), ["use ``` to fence", "next"])
+
+
+class TestIterMarkdownBlocks(unittest.TestCase):
+    def test_matches_markdown_to_blocks(self):
+        documents = [
+            "",
+            "\n\n\n",
+            "block1\n\n\n\nblock2",
+            "  block1  \n\n  block2  ",
+            "a\n  \nb\n\n\n c \n",
+            "# Heading\n\npara line 1\npara line 2\n\n- a\n- b\n",
+            "```\na\n\n\nb\n  ```  \ntail\n\n```c```",
+            "```npm``` is the tool\n\nNext\n\n- a\n- b",
+            "```a`b\ncode\n```\n\nstill code\n```",
+            "``````\n\nx",
+        ]
+        for md in documents:
+            self.assertEqual(
+                list(iter_markdown_blocks(io.StringIO(md))), markdown_to_blocks(md)
+            )
+
+    def test_lines_without_newlines(self):
+        lines = ["first", "block", "", "", "second"]
+        self.assertEqual(
+            list(iter_markdown_blocks(lines)), ["first\nblock", "second"]
+        )
+
+    def test_is_lazy(self):
+        def lines():
+            yield "first\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+
+        self.assertEqual(next(iter_markdown_blocks(lines())), "first")
+
+
+class TestIterBlockSpans(unittest.TestCase):
+    DOCUMENTS = [
+        "",
+        "\n\n\n",
+        "block1\n\n\n\nblock2",
+        "  block1  \n\n  block2  ",
+        "a\n  \nb\n\n\n c \n",
+        "# Heading\n\npara\n```\ncode\n\n\nmore\n```\ntail\n\n```x```",
+        "```\nunclosed\n\nfence",
+        "```npm``` is the tool\n\nNext\n\n- a\n- b",
+        "```a`b\ncode\n```\n\nstill code\n```",
+        "``````\n\nx",
+        "intro\n```x```\nmore",
+    ]
+
+    def test_matches_markdown_to_blocks(self):
+        for md in self.DOCUMENTS:
+            self.assertEqual(
+                [md[start:end] for start, end in iter_block_spans(md)],
+                markdown_to_blocks(md),
+            )
+
+    def test_bytes(self):
+        for md in self.DOCUMENTS:
+            data = md.encode("utf-8")
+            self.assertEqual(
+                [data[start:end].decode("utf-8") for start, end in iter_block_spans(data)],
+                markdown_to_blocks(md),
+            )
+
+    def test_fenced_block_is_one_span(self):
+        md = "Intro\n\n```\na\n\nb\n```"
+        self.assertEqual(list(iter_block_spans(md)), [(0, 5), (7, len(md))])
+
 
 class TestBlockToBlockType(unittest.TestCase):
     def test_heading(self):
@@ -179,18 +310,40 @@ This is another paragraph with _italic_ text and `code` here
 
     def test_codeblock(self):
         md = """
-This is text that *should* remain
+```
+This is text that _should_ remain
 the **same** even with inline stuff
+```
 """
         node = markdown_to_html_node(md)
         html = node.to_html()
+        expected_html_code_block = "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff</code></pre></div>"
+        self.assertEqual(html, expected_html_code_block)
+
+    def test_codeblock_with_blank_lines(self):
+        md = "```\nfirst\n\n\nsecond\n```\n\nAfter"
+        html = markdown_to_html_node(md).to_html()
         self.assertEqual(
-            html,
-            
-            expected_html_code_block = "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff</code></pre></div>"
-            self.assertEqual(html, expected_html_code_block)
+            html, "<div><pre><code>first\n\n\nsecond</code></pre><p>After</p></div>"
         )
 
+    def test_codeblock_and_text_are_escaped(self):
+        md = """
+```
+if a < b && b > c:
+    print("<done>")
+```
+
+Use `x < y` when a & b are <em>raw</em>.
+"""
+        node = markdown_to_html_node(md)
+        html = node.to_html()
+        self.assertEqual(
+            html,
+            "<div><pre><code>if a &lt; b &amp;&amp; b &gt; c:\n"
+            '    print("&lt;done&gt;")</code></pre>'
+            "<p>Use <code>x &lt; y</code> when a &amp; b are &lt;em&gt;raw&lt;/em&gt;.</p></div>",
+        )
 
     def test_empty_markdown(self):
         md = ""
@@ -203,7 +356,17 @@ the **same** even with inline stuff
         node = markdown_to_html_node(md)
         html = node.to_html()
         self.assertEqual(html, "<div></div>")
-        
+
+    def test_link_and_image_urls_are_escaped(self):
+        md = '[search](https://example.com/?q="md"&page=2) ![a & b](/img?w=1&h=2)'
+        node = markdown_to_html_node(md)
+        html = node.to_html()
+        self.assertEqual(
+            html,
+            '<div><p><a href="https://example.com/?q=&quot;md&quot;&amp;page=2">search</a> '
+            '<img src="/img?w=1&amp;h=2" alt="a &amp; b"></img></p></div>',
+        )
+
     def test_full_mix(self):
         md = """
 # Welcome
@@ -220,9 +383,13 @@ This is a **paragraph** with _some_ `code`.
 
 1. Number One
 2. Number Two: with a [link](https://example.com)
+
+```
 verbatim code
-preserved spacing
+  preserved spacing
 end code
+```
+
 Another paragraph.
         """
 
@@ -231,5 +398,170 @@ Another paragraph.
         expected_html = "<div><h1>Welcome</h1><p>This is a <b>paragraph</b> with <i>some</i> <code>code</code>.</p><blockquote>A wise quote.\nSpread over two lines.</blockquote><h2>List Section</h2><ul><li>Item A</li><li>Item B: with an <img src=\"img.png\" alt=\"image\"></img></li></ul><ol><li>Number One</li><li>Number Two: with a <a href=\"https://example.com\">link</a></li></ol><pre><code>verbatim code\n  preserved spacing\nend code</code></pre><p>Another paragraph.</p></div>"
         self.assertEqual(html, expected_html)
 
+
+class TestDirectInlineHTML(unittest.TestCase):
+    def test_same_html_without_leaf_nodes(self):
+        md = "# A **b**\n\nSee [x & y](https://e.com/?a=1&b=2) and ![i](p.png)\n\n- _one_\n- `two`"
+        expected = markdown_to_html_node(md).to_html()
+        with direct_inline_html():
+            node = markdown_to_html_node(md)
+        self.assertEqual(node.to_html(), expected)
+        paragraph = node.children[1]
+        self.assertEqual(len(paragraph.children), 1)
+        self.assertIsInstance(paragraph.children[0], RawHTMLNode)
+
+    def test_setting_is_restored(self):
+        with direct_inline_html():
+            with direct_inline_html(False):
+                node = markdown_to_html_node("a **b**")
+            self.assertEqual(len(node.children[0].children), 2)
+        node = markdown_to_html_node("a **b**")
+        self.assertEqual(len(node.children[0].children), 2)
+
+
+class TestMarkdownToHTMLStream(unittest.TestCase):
+    def test_matches_markdown_to_html_node(self):
+        md = "# Title\n\nSome **bold** text\n\n- one\n- two\n\n> quote\n"
+        self.assertEqual(
+            "".join(markdown_to_html_stream(io.StringIO(md))),
+            markdown_to_html_node(md).to_html(),
+        )
+
+    def test_empty_input(self):
+        self.assertEqual("".join(markdown_to_html_stream([])), "<div></div>")
+
+    def test_yields_one_fragment_per_block(self):
+        fragments = list(markdown_to_html_stream(["# A", "", "b"]))
+        self.assertEqual(fragments, ["<div>", "<h1>A</h1>", "<p>b</p>", "</div>"])
+
+
+class TestMarkdownFileToHTMLStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "page.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def render(self, md):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(md)
+        return "".join(markdown_file_to_html_stream(self.path))
+
+    def test_matches_markdown_to_html_node(self):
+        md = "# Título\n\nSome **bold** café\n\n```\na\n\nb\n```\n\n- one\n- two\n"
+        self.assertEqual(self.render(md), markdown_to_html_node(md).to_html())
+
+    def test_empty_file(self):
+        self.assertEqual(self.render(""), "<div></div>")
+
+    def test_crlf_line_endings(self):
+        with open(self.path, "wb") as f:
+            f.write(b"# Title\r\n\r\nPara one\r\n\r\n- a\r\n- b\r\rold mac\r\n")
+        self.assertEqual(
+            "".join(markdown_file_to_html_stream(self.path)),
+            "<div><h1>Title</h1><p>Para one</p><ul><li>a</li><li>b</li></ul><p>old mac</p></div>",
+        )
+
+    def test_crlf_found_in_later_pages(self):
+        md = "\n\n".join(f"Paragraph {i}" for i in range(2000)) + "\r\n\r\nlast"
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.write(md)
+        release_bytes = block_markdown.RELEASE_BYTES
+        block_markdown.RELEASE_BYTES = mmap.PAGESIZE
+        try:
+            html = "".join(markdown_file_to_html_stream(self.path))
+        finally:
+            block_markdown.RELEASE_BYTES = release_bytes
+        self.assertEqual(html, markdown_to_html_node(normalize_newlines(md)).to_html())
+        self.assertTrue(html.endswith("<p>last</p></div>"))
+
+    def test_releases_pages_while_rendering(self):
+        md = "\n\n".join(f"Paragraph {i} with **bold** text" for i in range(2000))
+        release_bytes = block_markdown.RELEASE_BYTES
+        block_markdown.RELEASE_BYTES = mmap.PAGESIZE
+        try:
+            html = self.render(md)
+        finally:
+            block_markdown.RELEASE_BYTES = release_bytes
+        self.assertEqual(html, markdown_to_html_node(md).to_html())
+
+
+def detect_table(block_string):
+    lines = block_string.split("\n")
+    if all(line.startswith("|") and line.endswith("|") for line in lines):
+        return lines
+    return None
+
+
+def table_to_html_node(block_string, lines):
+    rows = []
+    for line in lines:
+        cells = [cell.strip() for cell in line.strip("|").split("|")]
+        rows.append(ParentNode("tr", [LeafNode("td", cell) for cell in cells]))
+    return ParentNode("table", rows)
+
+
+class TestBlockExtensions(unittest.TestCase):
+    def register(self, *args, **kwargs):
+        syntax = register_block_syntax(*args, **kwargs)
+        self.addCleanup(unregister_block_syntax, syntax)
+        return syntax
+
+    def test_register_block_syntax(self):
+        self.register("table", detect_table, table_to_html_node, "|")
+        md = "# Data\n\n| a | b |\n| 1 | 2 |"
+        self.assertEqual(block_to_block_type("| a | b |"), "table")
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><h1>Data</h1><table><tr><td>a</td><td>b</td></tr>"
+            "<tr><td>1</td><td>2</td></tr></table></div>",
+        )
+
+    def test_non_matching_block_falls_back_to_paragraph(self):
+        self.register("table", detect_table, table_to_html_node, "|")
+        self.assertEqual(block_to_block_type("| not a table"), BlockType.PARAGRAPH)
+
+    def test_only_syntaxes_for_first_char_are_tried(self):
+        calls = []
+
+        def detect(block_string):
+            calls.append(block_string)
+            return None
+
+        for _ in range(5):
+            self.register("noop", detect, table_to_html_node, "|")
+        markdown_to_html_node("# Title\n\ntext\n\n- item\n\n> quote")
+        self.assertEqual(calls, [])
+
+    def test_priority_overrides_builtin(self):
+        def detect_fenced_language(block_string):
+            if block_string.startswith("```") and not block_string.startswith("```\n"):
+                return block_string.split("\n")
+            return None
+
+        def fenced_to_html_node(block_string, lines):
+            language = lines[0][3:]
+            code = LeafNode("code", "\n".join(lines[1:-1]), {"class": f"language-{language}"})
+            return ParentNode("pre", [code])
+
+        self.register("fenced", detect_fenced_language, fenced_to_html_node, "`", priority=1)
+        self.assertEqual(
+            markdown_to_html_node("```python\nx = 1\n```").to_html(),
+            '<div><pre><code class="language-python">x = 1</code></pre></div>',
+        )
+        self.assertEqual(block_to_block_type("```\nx = 1\n```"), BlockType.CODE)
+
+    def test_syntax_without_first_chars_is_tried_for_every_block(self):
+        def detect_rule(block_string):
+            return [block_string] if block_string == "***" else None
+
+        self.register("rule", detect_rule, lambda block, lines: LeafNode("hr", ""))
+        self.assertEqual(
+            markdown_to_html_node("***\n\ntext").to_html(),
+            "<div><hr></hr><p>text</p></div>",
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
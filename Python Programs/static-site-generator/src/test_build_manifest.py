@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import unittest
+
+from build_manifest import (
+    GENERATOR_VERSION,
+    BuildManifest,
+    PageRecord,
+    hash_bytes,
+    hash_file,
+)
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "page.md")
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write("# Title")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, output="page.html"):
+        stat = os.stat(self.source)
+        return PageRecord(
+            hash_file(self.source), stat.st_mtime_ns, stat.st_size, output
+        )
+
+    def test_hash_file_matches_hash_bytes(self):
+        self.assertEqual(hash_file(self.source), hash_bytes(b"# Title"))
+
+    def test_hash_file_in_chunks(self):
+        self.assertEqual(hash_file(self.source, chunk_size=2), hash_bytes(b"# Title"))
+
+    def test_load_missing(self):
+        self.assertIsNone(BuildManifest.load(self.tmp.name))
+
+    def test_load_corrupt(self):
+        with open(BuildManifest.path(self.tmp.name), "w") as f:
+            f.write("{not json")
+        self.assertIsNone(BuildManifest.load(self.tmp.name))
+
+    def test_save_and_load_round_trip(self):
+        manifest = BuildManifest("abc", pages={"page.md": self.record()})
+        manifest.save(self.tmp.name)
+
+        loaded = BuildManifest.load(self.tmp.name)
+        self.assertEqual(loaded.template_hash, "abc")
+        self.assertEqual(loaded.generator, GENERATOR_VERSION)
+        self.assertEqual(loaded.pages, {"page.md": self.record()})
+
+    def test_matches(self):
+        manifest = BuildManifest("abc")
+        self.assertTrue(manifest.matches("abc"))
+        self.assertFalse(manifest.matches(None))
+        self.assertFalse(BuildManifest("abc", generator="0").matches("abc"))
+
+    def test_record_for(self):
+        manifest = BuildManifest(pages={"page.md": self.record()})
+        self.assertEqual(
+            manifest.record_for("page.md", self.source, "page.html"), self.record()
+        )
+        self.assertIsNone(manifest.record_for("other.md", self.source, "other.html"))
+        self.assertIsNone(manifest.record_for("page.md", self.source, "moved.html"))
+
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write("# Changed title")
+        self.assertIsNone(manifest.record_for("page.md", self.source, "page.html"))
+
+    def test_saved_file_is_json(self):
+        BuildManifest(pages={"page.md": self.record()}).save(self.tmp.name)
+        with open(BuildManifest.path(self.tmp.name), encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(data["pages"]["page.md"]["output"], "page.html")
+
+
+if __name__ == "__main__":
+    unittest.main()
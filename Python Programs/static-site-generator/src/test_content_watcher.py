@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+from content_watcher import (
+    IN_Q_OVERFLOW,
+    InotifyWatcher,
+    PollingWatcher,
+    scan_markdown_files,
+)
+from fixtures import write_file
+
+
+class WatcherTests:
+    def make_watcher(self, content_dir):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = self.tmp.name
+        write_file(os.path.join(self.content, "a.md"), "a")
+        write_file(os.path.join(self.content, "docs", "b.md"), "b")
+        self.watcher = self.make_watcher(self.content)
+
+    def tearDown(self):
+        self.watcher.close()
+        self.tmp.cleanup()
+
+    def test_no_changes(self):
+        self.assertEqual(self.watcher.wait(timeout=0), (set(), set()))
+
+    def test_modified_file(self):
+        write_file(os.path.join(self.content, "docs", "b.md"), "changed")
+        changed, deleted = self.watcher.wait(timeout=1)
+        self.assertEqual(changed, {os.path.join("docs", "b.md")})
+        self.assertEqual(deleted, set())
+
+    def test_deleted_file(self):
+        os.remove(os.path.join(self.content, "a.md"))
+        self.assertEqual(self.watcher.wait(timeout=1), (set(), {"a.md"}))
+
+    def test_new_directory(self):
+        write_file(os.path.join(self.content, "new", "c.md"), "c")
+        changed, _ = self.watcher.wait(timeout=1)
+        self.assertIn(os.path.join("new", "c.md"), changed)
+
+    def test_directory_moved_out_of_tree(self):
+        with tempfile.TemporaryDirectory() as outside:
+            os.rename(os.path.join(self.content, "docs"), os.path.join(outside, "docs"))
+            self.assertEqual(
+                self.watcher.wait(timeout=1), (set(), {os.path.join("docs", "b.md")})
+            )
+            # Later edits to the moved directory are not reported.
+            write_file(os.path.join(outside, "docs", "b.md"), "changed")
+            self.assertEqual(self.watcher.wait(timeout=0.05), (set(), set()))
+
+    def test_directory_renamed_inside_tree(self):
+        os.rename(os.path.join(self.content, "docs"), os.path.join(self.content, "guide"))
+        changed, deleted = self.watcher.wait(timeout=1)
+        if not changed:
+            # The two halves of the rename can arrive in separate reads.
+            changed, _ = self.watcher.wait(timeout=1)
+        self.assertEqual(changed, {os.path.join("guide", "b.md")})
+        self.assertEqual(deleted, {os.path.join("docs", "b.md")})
+
+    def test_deleted_directory(self):
+        os.remove(os.path.join(self.content, "docs", "b.md"))
+        os.rmdir(os.path.join(self.content, "docs"))
+        self.assertEqual(self.watcher.wait(timeout=1), (set(), {os.path.join("docs", "b.md")}))
+
+    def test_ignores_other_files(self):
+        write_file(os.path.join(self.content, "notes.txt"), "txt")
+        self.assertEqual(self.watcher.wait(timeout=0.05), (set(), set()))
+
+
+class TestPollingWatcher(WatcherTests, unittest.TestCase):
+    def make_watcher(self, content_dir):
+        return PollingWatcher(content_dir, poll_interval=0.01)
+
+    def test_scan_markdown_files(self):
+        self.assertEqual(
+            sorted(scan_markdown_files(self.content)),
+            ["a.md", os.path.join("docs", "b.md")],
+        )
+
+
+class TestInotifyWatcher(WatcherTests, unittest.TestCase):
+    def make_watcher(self, content_dir):
+        try:
+            return InotifyWatcher(content_dir)
+        except OSError:
+            self.skipTest("inotify is not available")
+
+    def test_queue_overflow_rescans(self):
+        write_file(os.path.join(self.content, "new", "c.md"), "c")
+        os.remove(os.path.join(self.content, "a.md"))
+        changed = set()
+        deleted = set()
+        self.watcher._handle([(-1, IN_Q_OVERFLOW, "")], changed, deleted)
+        self.assertEqual(
+            changed, {os.path.join("docs", "b.md"), os.path.join("new", "c.md")}
+        )
+        self.assertEqual(deleted, {"a.md"})
+        # The new directory is watched after the rescan.
+        write_file(os.path.join(self.content, "new", "c.md"), "changed")
+        self.assertIn(os.path.join("new", "c.md"), self.watcher.wait(timeout=1)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+from dev_server import DevServer
+from fixtures import write_file
+
+
+class TestDevServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        write_file(os.path.join(self.content, "index.md"), "# Home")
+        write_file(os.path.join(self.content, "old.md"), "Old page")
+        self.rebuilt = threading.Event()
+        self.server = DevServer(
+            self.content,
+            self.output,
+            port=0,
+            poll_interval=0.01,
+            on_rebuild=lambda *args: self.rebuilt.set(),
+        )
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def fetch(self, path):
+        with urllib.request.urlopen(self.server.url + path, timeout=5) as response:
+            return response.read().decode("utf-8")
+
+    def test_serves_initial_build(self):
+        report = self.server.start(watch=False)
+        self.assertEqual(report.page_count, 2)
+        self.assertEqual(self.fetch("index.html"), "<div><h1>Home</h1></div>")
+
+    def test_rebuild(self):
+        self.server.start(watch=False)
+        os.remove(os.path.join(self.content, "old.md"))
+        write_file(os.path.join(self.content, "index.md"), "# New home")
+        timings = self.server.rebuild({"index.md"}, {"old.md"})
+        self.assertEqual(list(timings), ["index.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "old.html")))
+        self.assertEqual(self.fetch("index.html"), "<div><h1>New home</h1></div>")
+
+    def test_rebuild_continues_after_a_failing_page(self):
+        self.server.start(watch=False)
+        write_file(os.path.join(self.content, "index.md"), "my_var is bad")
+        write_file(os.path.join(self.content, "old.md"), "New page")
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            timings = self.server.rebuild({"index.md", "old.md"}, set())
+        self.assertEqual(list(timings), ["old.md"])
+        self.assertIn("index.md", stderr.getvalue())
+        self.assertEqual(self.fetch("old.html"), "<div><p>New page</p></div>")
+        self.assertEqual(self.fetch("index.html"), "<div><h1>Home</h1></div>")
+
+    def test_watch_rerenders_changed_page(self):
+        self.server.start(watch=True)
+        write_file(os.path.join(self.content, "index.md"), "# Edited")
+        self.assertTrue(self.rebuilt.wait(timeout=5))
+        self.assertEqual(self.fetch("index.html"), "<div><h1>Edited</h1></div>")
+
+    def test_watch_survives_unexpected_errors(self):
+        self.server.start(watch=False)
+        write_file(os.path.join(self.content, "index.md"), "# After error")
+        server = self.server
+
+        class FlakyWatcher:
+            calls = 0
+            closed = False
+
+            def wait(self, timeout=None):
+                self.calls += 1
+                if self.calls == 1:
+                    raise OSError("watch descriptor went away")
+                if self.calls == 2:
+                    return {"index.md"}, set()
+                server._stop.wait(timeout)
+                return set(), set()
+
+            def close(self):
+                self.closed = True
+
+        watcher = FlakyWatcher()
+        thread = threading.Thread(target=self.server.watch, args=(watcher,))
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            thread.start()
+            self.assertTrue(self.rebuilt.wait(timeout=5))
+            self.server._stop.set()
+            thread.join(timeout=5)
+        self.assertIn("watch descriptor went away", stderr.getvalue())
+        self.assertTrue(watcher.closed)
+        self.assertEqual(self.fetch("index.html"), "<div><h1>After error</h1></div>")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+import os
+import tempfile
+import unittest
+
+import generate_site
+from block_cache import BlockCache
+from block_markdown import markdown_to_html_node
+from fixtures import read_file, write_file
+from generate_site import build_site, find_markdown_files, output_path_for
+from pipeline_stats import instrument
+
+
+class TestBuildSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\nWelcome **here**")
+        write_file(
+            os.path.join(self.content, "blog", "post.md"), "- one\n- two"
+        )
+        write_file(os.path.join(self.content, "blog", "notes.txt"), "not markdown")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_markdown_files(self):
+        self.assertEqual(
+            find_markdown_files(self.content),
+            [os.path.join("blog", "post.md"), "index.md"],
+        )
+
+    def test_output_path_for(self):
+        self.assertEqual(
+            output_path_for(os.path.join("blog", "post.md")),
+            os.path.join("blog", "post.html"),
+        )
+
+    def test_build_site_single_worker(self):
+        seen = []
+        report = build_site(
+            self.content, self.output, workers=1, on_page=lambda p, s: seen.append(p)
+        )
+        self.assertEqual(report.page_count, 2)
+        self.assertEqual(sorted(seen), sorted(report.page_timings))
+        self.assertEqual(
+            read_file(os.path.join(self.output, "index.html")),
+            "<div><h1>Home</h1><p>Welcome <b>here</b></p></div>",
+        )
+        self.assertEqual(
+            read_file(os.path.join(self.output, "blog", "post.html")),
+            "<div><ul><li>one</li><li>two</li></ul></div>",
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog", "notes.html")))
+
+    def test_build_site_process_pool(self):
+        report = build_site(self.content, self.output, workers=2)
+        self.assertEqual(report.page_count, 2)
+        self.assertGreater(report.pages_per_second, 0)
+        self.assertEqual(
+            read_file(os.path.join(self.output, "blog", "post.html")),
+            "<div><ul><li>one</li><li>two</li></ul></div>",
+        )
+
+    def test_on_page_reports_pages_as_they_finish(self):
+        # The first page in submission order is far slower than the rest.
+        write_file(os.path.join(self.content, "a.md"), "Some **bold** text\n\n" * 20_000)
+        seen = []
+        build_site(
+            self.content, self.output, workers=2, on_page=lambda path, _: seen.append(path)
+        )
+        self.assertEqual(sorted(seen), ["a.md", os.path.join("blog", "post.md"), "index.md"])
+        self.assertEqual(seen[-1], "a.md")
+
+    def test_stage_stats(self):
+        report = build_site(self.content, self.output, workers=2, stage_stats=True)
+        self.assertEqual(sorted(report.page_stats), sorted(report.page_timings))
+        post_stats = report.page_stats[os.path.join("blog", "post.md")].to_dict()
+        self.assertEqual(post_stats["unordered_list_to_html_node"]["calls"], 1)
+
+        build_stats = report.build_stats().to_dict()
+        self.assertEqual(build_stats["markdown_to_blocks"]["calls"], 2)
+        self.assertEqual(build_stats["to_html"]["calls"], 2)
+
+    def test_stage_stats_count_every_text_node(self):
+        report = build_site(self.content, self.output, workers=1, stage_stats=True)
+        with instrument() as expected:
+            for relative_path in report.page_stats:
+                path = os.path.join(self.content, relative_path)
+                markdown_to_html_node(read_file(path)).to_html()
+        build_stats = report.build_stats().to_dict()
+        for stage in ("text_to_children", "to_html"):
+            self.assertEqual(build_stats[stage]["nodes"], expected.stages[stage].nodes)
+
+    def test_inline_cache(self):
+        write_file(os.path.join(self.content, "about.md"), "# Home\n\n- one")
+        expected = build_site(self.content, os.path.join(self.tmp.name, "plain"), workers=1)
+        report = build_site(self.content, self.output, workers=1, inline_cache_size=100)
+        self.assertEqual(report.inline_cache_stats["hits"], 2)
+        self.assertEqual(report.inline_cache_stats["misses"], 4)
+        for relative_path in expected.page_timings:
+            output = output_path_for(relative_path)
+            self.assertEqual(
+                read_file(os.path.join(self.output, output)),
+                read_file(os.path.join(self.tmp.name, "plain", output)),
+            )
+        self.assertIsNone(expected.inline_cache_stats)
+
+    def test_block_cache_is_persisted_and_used(self):
+        self.addCleanup(setattr, generate_site, "_process_block_cache", None)
+        for workers in (1, 2):
+            path = os.path.join(self.tmp.name, f"cache{workers}", "blocks.json")
+            generate_site._process_block_cache = None
+            build_site(
+                self.content, self.output, workers=workers, incremental=False, block_cache_path=path
+            )
+            saved = BlockCache(path=path)
+            # "# Home", "Welcome **here**" and the list.
+            self.assertEqual(len(saved), 3)
+
+        # A later build takes blocks from the file instead of rendering them.
+        key = BlockCache.key_for("# Home")
+        saved.put(key, "<h1>From the cache</h1>")
+        saved.save()
+        generate_site._process_block_cache = None
+        build_site(self.content, self.output, workers=2, incremental=False, block_cache_path=path)
+        self.assertEqual(
+            read_file(os.path.join(self.output, "index.html")),
+            "<div><h1>From the cache</h1><p>Welcome <b>here</b></p></div>",
+        )
+
+    def test_crlf_sources(self):
+        with open(os.path.join(self.content, "index.md"), "wb") as f:
+            f.write(b"# Title\r\n\r\nPara one\r\n\r\n- a\r\n- b\r\n")
+        expected = "<div><h1>Title</h1><p>Para one</p><ul><li>a</li><li>b</li></ul></div>"
+        build_site(self.content, self.output, workers=1)
+        self.assertEqual(read_file(os.path.join(self.output, "index.html")), expected)
+
+        large_page_bytes = generate_site.LARGE_PAGE_BYTES
+        generate_site.LARGE_PAGE_BYTES = 0
+        try:
+            build_site(self.content, self.output, workers=1, incremental=False)
+        finally:
+            generate_site.LARGE_PAGE_BYTES = large_page_bytes
+        self.assertEqual(read_file(os.path.join(self.output, "index.html")), expected)
+
+    def test_large_pages_are_streamed(self):
+        template_path = os.path.join(self.tmp.name, "template.html")
+        write_file(template_path, "<main>{{ Content }}</main><nav>{{ Content }}</nav>")
+        expected = os.path.join(self.tmp.name, "plain")
+        build_site(self.content, expected, workers=1, template_path=template_path)
+
+        large_page_bytes = generate_site.LARGE_PAGE_BYTES
+        generate_site.LARGE_PAGE_BYTES = 0
+        try:
+            report = build_site(
+                self.content, self.output, workers=1, template_path=template_path
+            )
+            self.assertEqual(report.page_count, 2)
+            for relative_path in report.page_timings:
+                output = output_path_for(relative_path)
+                self.assertEqual(
+                    read_file(os.path.join(self.output, output)),
+                    read_file(os.path.join(expected, output)),
+                )
+            report = build_site(
+                self.content, self.output, workers=1, template_path=template_path
+            )
+            self.assertEqual(report.skipped, 2)
+        finally:
+            generate_site.LARGE_PAGE_BYTES = large_page_bytes
+
+    def test_stage_stats_disabled(self):
+        report = build_site(self.content, self.output, workers=1)
+        self.assertEqual(report.page_stats, {})
+        self.assertEqual(report.build_stats().to_dict(), {})
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        for name in ["a.md", "b.md", os.path.join("docs", "c.md")]:
+            write_file(os.path.join(self.content, name), f"Page {name}")
+        build_site(self.content, self.output, workers=1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unchanged_pages_are_skipped(self):
+        report = build_site(self.content, self.output, workers=1)
+        self.assertEqual(report.page_count, 0)
+        self.assertEqual(report.skipped, 3)
+
+    def test_only_changed_page_is_rebuilt(self):
+        write_file(os.path.join(self.content, "a.md"), "Edited **page**")
+        report = build_site(self.content, self.output, workers=1)
+        self.assertEqual(list(report.page_timings), ["a.md"])
+        self.assertEqual(report.skipped, 2)
+        self.assertEqual(
+            read_file(os.path.join(self.output, "a.html")),
+            "<div><p>Edited <b>page</b></p></div>",
+        )
+
+    def test_touched_but_identical_page_is_skipped(self):
+        path = os.path.join(self.content, "b.md")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        report = build_site(self.content, self.output, workers=1)
+        self.assertEqual(report.page_count, 0)
+
+    def test_missing_output_is_rebuilt(self):
+        os.remove(os.path.join(self.output, "b.html"))
+        report = build_site(self.content, self.output, workers=1)
+        self.assertEqual(list(report.page_timings), ["b.md"])
+
+    def test_deleted_source_removes_output(self):
+        os.remove(os.path.join(self.content, "docs", "c.md"))
+        report = build_site(self.content, self.output, workers=1)
+        self.assertEqual(report.removed, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.output, "docs")))
+
+    def test_template_change_rebuilds_everything(self):
+        template_path = os.path.join(self.tmp.name, "template.html")
+        write_file(template_path, "<html>{{ Content }}</html>")
+        report = build_site(
+            self.content, self.output, workers=1, template_path=template_path
+        )
+        self.assertEqual(report.page_count, 3)
+        self.assertEqual(
+            read_file(os.path.join(self.output, "a.html")),
+            "<html><div><p>Page a.md</p></div></html>",
+        )
+
+        report = build_site(
+            self.content, self.output, workers=1, template_path=template_path
+        )
+        self.assertEqual(report.page_count, 0)
+
+    def test_full_build_ignores_manifest(self):
+        report = build_site(self.content, self.output, workers=1, incremental=False)
+        self.assertEqual(report.page_count, 3)
+        self.assertEqual(report.skipped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
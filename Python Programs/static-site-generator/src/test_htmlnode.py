@@ -1,6 +1,18 @@
+import io
+import sys
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+import htmlnode
+from htmlnode import (
+    FrozenNodeError,
+    HTMLNode,
+    LeafNode,
+    ParentNode,
+    RawHTMLNode,
+    escape_attribute,
+    escape_text,
+    escape_text_run,
+)
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -20,6 +32,56 @@ class TestHTMLNode(unittest.TestCase):
         self.assertTrue(html_props.startswith(" "))
         self.assertEqual(len(html_props.split(" ")) - 1, 2)
 
+    def test_props_to_html_escapes_quotes_and_ampersands(self):
+        node = HTMLNode(props={"href": 'https://example.com/?q="x"&page=2', "title": "a<b>"})
+        self.assertEqual(
+            node.props_to_html(),
+            ' href="https://example.com/?q=&quot;x&quot;&amp;page=2" title="a&lt;b&gt;"',
+        )
+
+    def test_props_to_html_cannot_break_out_of_attribute(self):
+        node = LeafNode("a", "click", {"href": '" onclick="alert(1)'})
+        self.assertEqual(
+            node.to_html(), '<a href="&quot; onclick=&quot;alert(1)">click</a>'
+        )
+
+    def test_props_to_html_already_escaped_entities_are_escaped_again(self):
+        node = HTMLNode(props={"href": "/?a=1&amp;b=2"})
+        self.assertEqual(node.props_to_html(), ' href="/?a=1&amp;amp;b=2"')
+
+    def test_props_to_html_non_string_values(self):
+        node = HTMLNode(props={"width": 640, "data": ["a", "b"]})
+        self.assertEqual(node.props_to_html(), " width=\"640\" data=\"['a', 'b']\"")
+
+    def test_props_to_html_equal_values_of_other_types(self):
+        # 1, True and 1.0 compare equal but render differently.
+        self.assertEqual(HTMLNode(props={"width": 1}).props_to_html(), ' width="1"')
+        self.assertEqual(HTMLNode(props={"width": True}).props_to_html(), ' width="True"')
+        self.assertEqual(HTMLNode(props={"width": 1.0}).props_to_html(), ' width="1.0"')
+
+    def test_escape_text(self):
+        plain = "nothing to escape here"
+        self.assertIs(escape_text(plain), plain)
+        self.assertEqual(escape_text("&<>\"'"), "&amp;&lt;&gt;\"'")
+
+    def test_escape_text_run(self):
+        values = ["a < b", "", "plain", "x & y"]
+        self.assertEqual(escape_text_run(values), [escape_text(v) for v in values])
+        self.assertEqual(escape_text_run(["a\0<", "&"]), ["a\0&lt;", "&amp;"])
+        self.assertEqual(escape_text_run([]), [])
+
+    def test_escape_attribute(self):
+        self.assertEqual(escape_attribute("plain"), "plain")
+        self.assertEqual(escape_attribute('&<>"\''), "&amp;&lt;&gt;&quot;'")
+
+    def test_no_instance_dict(self):
+        for node in [
+            HTMLNode("p", "text"),
+            LeafNode("b", "bold"),
+            ParentNode("div", []),
+        ]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
     def test_repr_method(self):
         node = HTMLNode("p", "Hello", None, {"class": "my-paragraph"})
         expected_repr = (
@@ -55,6 +117,27 @@ class TestLeafNode(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "LeafNode requires a value"):
             LeafNode("p", None)
 
+    def test_leaf_to_html_escapes_text(self):
+        self.assertEqual(LeafNode(None, "a < b && c > d").to_html(), "a &lt; b &amp;&amp; c &gt; d")
+        self.assertEqual(
+            LeafNode("code", "if x < 1: print('\"hi\"')").to_html(),
+            "<code>if x &lt; 1: print('\"hi\"')</code>",
+        )
+
+    def test_leaf_to_html_cannot_inject_markup(self):
+        node = LeafNode("p", "<script>alert(1)</script>")
+        self.assertEqual(node.to_html(), "<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>")
+
+    def test_leaf_to_html_non_string_value(self):
+        self.assertEqual(LeafNode("p", 5).to_html(), "<p>5</p>")
+        self.assertEqual(LeafNode(None, 1.5).to_html(), "1.5")
+
+    def test_raw_html_node_is_not_escaped(self):
+        node = RawHTMLNode("<p>already <b>rendered</b> &amp; safe</p>")
+        self.assertEqual(node.to_html(), "<p>already <b>rendered</b> &amp; safe</p>")
+        self.assertIsNone(node.tag)
+        self.assertEqual(repr(node), "RawHTMLNode('<p>already <b>rendered</b> &amp; safe</p>')")
+
     def test_repr_method(self):
         node = LeafNode("a", "Link", {"href": "#"})
         expected_repr = "HTMLNode('a', 'Link', children: None, {'href': '#'})"
@@ -137,6 +220,200 @@ class TestParentNode(unittest.TestCase):
         expected_repr = f"HTMLNode('p', None, children: [{expected_child_repr}], {{'class': 'text'}})"
         self.assertEqual(repr(node), expected_repr)
 
+    def test_to_html_escapes_leaf_children(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode(None, "1 < 2 & "),
+                LeafNode("b", "3 > 2"),
+                RawHTMLNode("<i>raw</i>"),
+                ParentNode("span", [LeafNode(None, "&")]),
+            ],
+        )
+        self.assertEqual(
+            node.to_html(),
+            "<p>1 &lt; 2 &amp; <b>3 &gt; 2</b><i>raw</i><span>&amp;</span></p>",
+        )
+
+    def test_escape_runs_give_same_html(self):
+        children = [LeafNode(None, f"{i} < {i + 1} & ") for i in range(40)]
+        children += [LeafNode("b", "x>y"), RawHTMLNode("<hr>"), ParentNode("i", [LeafNode(None, "&")])]
+        node = ParentNode("div", [ParentNode("p", children)] + children)
+        expected = node.to_html()
+
+        saved = htmlnode.ESCAPE_RUN_THRESHOLD
+        htmlnode.ESCAPE_RUN_THRESHOLD = 2
+        try:
+            self.assertEqual(node.to_html(), expected)
+        finally:
+            htmlnode.ESCAPE_RUN_THRESHOLD = saved
+
+    def test_non_string_leaf_values_in_parent(self):
+        node = ParentNode("p", [LeafNode(None, 5), LeafNode("b", 0), LeafNode(None, " & ")])
+        self.assertEqual(node.to_html(), "<p>5<b>0</b> &amp; </p>")
+
+        saved = htmlnode.ESCAPE_RUN_THRESHOLD
+        htmlnode.ESCAPE_RUN_THRESHOLD = 2
+        try:
+            self.assertEqual(node.to_html(), "<p>5<b>0</b> &amp; </p>")
+        finally:
+            htmlnode.ESCAPE_RUN_THRESHOLD = saved
+
+    def test_leaf_without_value_raises_in_parent(self):
+        leaf = LeafNode("b", "x")
+        leaf.value = None
+        with self.assertRaises(ValueError):
+            ParentNode("p", [leaf]).to_html()
+
+    def test_iter_html_fragments_in_order(self):
+        node = ParentNode(
+            "p", [LeafNode("b", "Bold"), LeafNode(None, " text")], {"class": "x"}
+        )
+        self.assertEqual(
+            list(node.iter_html()),
+            ['<p class="x">', "<b>Bold</b>", " text", "</p>"],
+        )
+
+    def test_render_to_matches_to_html(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode(None, "Nested "), LeafNode("i", "it")]),
+                LeafNode("a", "link", {"href": "https://boot.dev"}),
+            ],
+        )
+        stream = io.StringIO()
+        node.render_to(stream)
+        self.assertEqual(stream.getvalue(), node.to_html())
+
+    def test_iter_html_is_lazy(self):
+        children = [LeafNode("span", str(i)) for i in range(3)]
+        fragments = ParentNode("div", children).iter_html()
+        self.assertEqual(next(fragments), "<div>")
+        children[0].value = "changed"
+        self.assertEqual(next(fragments), "<span>changed</span>")
+
+    def test_to_html_very_deep_nesting(self):
+        depth = 10_000
+        node = LeafNode("b", "core")
+        for _ in range(depth):
+            node = ParentNode("blockquote", [node])
+        expected = "<blockquote>" * depth + "<b>core</b>" + "</blockquote>" * depth
+        self.assertEqual(node.to_html(), expected)
+
+    def test_to_html_very_deep_nesting_with_siblings(self):
+        depth = 10_000
+        node = ParentNode("li", [LeafNode(None, "leaf")])
+        for i in range(depth):
+            node = ParentNode("ul", [LeafNode("i", str(i)), node, LeafNode(None, ".")])
+        html = node.to_html()
+        self.assertTrue(html.startswith(f"<ul><i>{depth - 1}</i><ul>"))
+        self.assertTrue(html.endswith("<li>leaf</li>" + ".</ul>" * depth))
+
+
+def make_tree():
+    return ParentNode(
+        "div",
+        [
+            ParentNode("p", [LeafNode(None, "See "), LeafNode("a", "docs", {"href": "/docs"})]),
+            LeafNode("b", "bold"),
+        ],
+        {"class": "page"},
+    )
+
+
+class TestFrozenNodes(unittest.TestCase):
+    def test_frozen_leaf_renders_same_html(self):
+        leaf = LeafNode("a", "docs", {"href": "/docs"})
+        expected = leaf.to_html()
+        self.assertIs(leaf.freeze(), leaf)
+        self.assertEqual(leaf.to_html(), expected)
+        self.assertEqual(list(leaf.iter_html()), [expected])
+        self.assertIsInstance(leaf, LeafNode)
+
+    def test_frozen_nodes_keep_their_attributes_and_size(self):
+        leaf = LeafNode("a", "docs", {"href": "/docs"})
+        tree = make_tree()
+        leaf_size = sys.getsizeof(leaf)
+        tree_size = sys.getsizeof(tree)
+        leaf.freeze()
+        tree.freeze()
+        self.assertEqual((leaf.value, leaf.children), ("docs", None))
+        self.assertIsNone(tree.value)
+        self.assertEqual(len(tree.children), 2)
+        self.assertEqual(sys.getsizeof(leaf), leaf_size)
+        self.assertEqual(sys.getsizeof(tree), tree_size)
+
+        class FourSlots:
+            __slots__ = ("a", "b", "c", "d")
+
+        self.assertEqual(sys.getsizeof(HTMLNode()), sys.getsizeof(FourSlots()))
+
+    def test_frozen_leaf_rejects_changes(self):
+        leaf = LeafNode("a", "docs", {"href": "/docs"}).freeze()
+        with self.assertRaises(FrozenNodeError):
+            leaf.value = "other"
+        with self.assertRaises(FrozenNodeError):
+            del leaf.tag
+        with self.assertRaises(TypeError):
+            leaf.props["href"] = "/other"
+
+    def test_freeze_does_not_share_props_with_caller(self):
+        props = {"href": "/docs"}
+        leaf = LeafNode("a", "docs", props).freeze()
+        props["href"] = "/other"
+        self.assertEqual(leaf.to_html(), '<a href="/docs">docs</a>')
+
+    def test_frozen_subtree(self):
+        tree = make_tree()
+        expected = tree.to_html()
+        self.assertIs(tree.freeze(), tree)
+        self.assertEqual(tree.to_html(), expected)
+        self.assertEqual("".join(tree.iter_html()), expected)
+
+        paragraph = tree.children[0]
+        with self.assertRaises(FrozenNodeError):
+            paragraph.tag = "section"
+        with self.assertRaises(FrozenNodeError):
+            paragraph.children[1].value = "changed"
+        with self.assertRaises(AttributeError):
+            tree.children.append(LeafNode(None, "more"))
+
+    def test_frozen_subtree_inside_unfrozen_parent(self):
+        tree = make_tree().freeze()
+        wrapper = ParentNode("main", [tree, LeafNode(None, "!")])
+        self.assertEqual(wrapper.to_html(), f"<main>{make_tree().to_html()}!</main>")
+
+    def test_freeze_without_subtree_html(self):
+        tree = make_tree().freeze(cache_html=False)
+        self.assertEqual(tree.to_html(), make_tree().to_html())
+        with self.assertRaises(FrozenNodeError):
+            tree.props = None
+        tree.freeze()
+        self.assertEqual(tree.to_html(), make_tree().to_html())
+
+    def test_freeze_very_deep_tree(self):
+        depth = 10_000
+        node = LeafNode("b", "core")
+        for _ in range(depth):
+            node = ParentNode("blockquote", [node])
+        expected = node.to_html()
+        self.assertEqual(node.freeze().to_html(), expected)
+
+    def test_freeze_leaf_without_value_fails(self):
+        leaf = LeafNode("p", "text")
+        leaf.value = None
+        with self.assertRaises(ValueError):
+            leaf.freeze()
+        leaf.value = "text"
+        self.assertEqual(leaf.to_html(), "<p>text</p>")
+
+    def test_freeze_unknown_node_type(self):
+        with self.assertRaises(NotImplementedError):
+            HTMLNode("p", "text").freeze()
+        with self.assertRaises(TypeError):
+            ParentNode("div", [HTMLNode("p", "text")]).freeze()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,6 +7,9 @@ from inline_markdown import (
     split_nodes_image,
     split_nodes_link,
     text_to_textnodes,
+    register_inline_delimiter,
+    register_inline_pattern,
+    unregister_inline_syntax,
 )
 
 
@@ -303,6 +306,22 @@ class TestSplitNodesImageLink(unittest.TestCase):
         expected = [TextNode("onlylink", TextType.LINK, "only.url")]
         self.assertListEqual(expected, new_nodes)
 
+    def test_split_link_same_text_as_earlier_image(self):
+        node = TextNode("![same](u.png) then [same](u.png)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        expected = [
+            TextNode("![same](u.png) then ", TextType.TEXT),
+            TextNode("same", TextType.LINK, "u.png"),
+        ]
+        self.assertListEqual(expected, new_nodes)
+
+    def test_split_links_many_in_one_node(self):
+        text = "".join(f"[l{i}](u{i}) " for i in range(1000))
+        new_nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 2000)
+        self.assertEqual(new_nodes[-2], TextNode("l999", TextType.LINK, "u999"))
+        self.assertEqual(new_nodes[-1], TextNode(" ", TextType.TEXT))
+
 
 class TestTextToTextNodes(unittest.TestCase):
     def test_full_conversion_example(self):
@@ -385,5 +404,80 @@ class TestTextToTextNodes(unittest.TestCase):
         self.assertListEqual(nodes, [])
 
 
+class TestInlineExtensions(unittest.TestCase):
+    def register(self, syntax):
+        self.addCleanup(unregister_inline_syntax, syntax)
+        return syntax
+
+    def test_register_delimiter(self):
+        self.register(register_inline_delimiter("~~", "strike"))
+        self.assertListEqual(
+            text_to_textnodes("a ~~gone~~ and **bold**"),
+            [
+                TextNode("a ", TextType.TEXT),
+                TextNode("gone", "strike"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("bold", TextType.BOLD),
+            ],
+        )
+
+    def test_later_delimiter_is_literal_inside_earlier(self):
+        self.register(register_inline_delimiter("~~", "strike"))
+        self.assertListEqual(
+            text_to_textnodes("`a ~~b`"), [TextNode("a ~~b", TextType.CODE)]
+        )
+        with self.assertRaisesRegex(ValueError, "unclosed delimiter '~~'"):
+            text_to_textnodes("~~a `b` c~~")
+
+    def test_priority_delimiter_takes_precedence(self):
+        self.register(register_inline_delimiter("~~", "strike", priority=1))
+        self.assertListEqual(
+            text_to_textnodes("~~a `b` c~~"), [TextNode("a `b` c", "strike")]
+        )
+
+    def test_duplicate_delimiter(self):
+        with self.assertRaises(ValueError):
+            register_inline_delimiter("**", TextType.BOLD)
+
+    def test_register_pattern(self):
+        self.register(
+            register_inline_pattern(
+                "footnote",
+                r"\[\^([^\]]+)\]",
+                lambda label: TextNode(label, "footnote"),
+                first_chars="[",
+            )
+        )
+        self.assertListEqual(
+            text_to_textnodes("Claim[^1] and [link](url)"),
+            [
+                TextNode("Claim", TextType.TEXT),
+                TextNode("1", "footnote"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("link", TextType.LINK, "url"),
+            ],
+        )
+
+    def test_pattern_without_first_chars(self):
+        self.register(
+            register_inline_pattern(
+                "mention", r"@(\w+)", lambda name: TextNode(name, "mention")
+            )
+        )
+        self.assertListEqual(
+            text_to_textnodes("hi @bob"),
+            [TextNode("hi ", TextType.TEXT), TextNode("bob", "mention")],
+        )
+
+    def test_unregister_restores_core_behaviour(self):
+        syntax = register_inline_delimiter("~~", "strike")
+        unregister_inline_syntax(syntax)
+        self.assertListEqual(
+            text_to_textnodes("a ~~b~~"), [TextNode("a ~~b~~", TextType.TEXT)]
+        )
+        with self.assertRaises(ValueError):
+            unregister_inline_syntax(syntax)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+
+from htmlnode import LeafNode
+from inline_markdown import (
+    register_inline_delimiter,
+    register_inline_pattern,
+    text_to_textnodes,
+    text_to_tokens,
+    unregister_inline_syntax,
+)
+from inline_tokens import (
+    BOLD,
+    IMAGE,
+    LINK,
+    NODE,
+    TEXT,
+    tokens_to_html,
+    tokens_to_html_nodes,
+)
+from textnode import (
+    TextNode,
+    TextType,
+    register_text_type,
+    text_node_to_html_node,
+    unregister_text_type,
+)
+
+
+class TestInlineTokens(unittest.TestCase):
+    SAMPLES = [
+        "",
+        "plain text",
+        "This is **bold** and _italic_ with `code < 1`",
+        "A [link](https://example.com?a=1&b=2) and ![alt \"x\"](img.png)",
+        "**bold** at the start and _end_",
+        "x < y & [a](b)[c](d)",
+    ]
+
+    def test_arrays(self):
+        tokens = text_to_tokens("a **b** [c](d)")
+        self.assertEqual(list(tokens.types), [TEXT, BOLD, TEXT, LINK])
+        self.assertEqual(list(tokens.starts), [0, 4, 7, 9])
+        self.assertEqual(list(tokens.ends), [2, 5, 8, 10])
+        self.assertEqual(list(tokens.url_starts), [12])
+        self.assertEqual(list(tokens.url_ends), [13])
+        self.assertIsNone(tokens.nodes)
+        self.assertEqual(len(tokens), 4)
+
+    def test_to_textnodes_matches_text_to_textnodes(self):
+        for text in self.SAMPLES:
+            self.assertEqual(text_to_tokens(text).to_textnodes(), text_to_textnodes(text))
+
+    def test_tokens_to_html_nodes(self):
+        for text in self.SAMPLES:
+            expected = [text_node_to_html_node(node) for node in text_to_textnodes(text)]
+            actual = tokens_to_html_nodes(text_to_tokens(text))
+            self.assertEqual(
+                [(node.tag, node.value, node.props) for node in actual],
+                [(node.tag, node.value, node.props) for node in expected],
+            )
+
+    def test_tokens_to_html(self):
+        for text in self.SAMPLES:
+            expected = "".join(
+                text_node_to_html_node(node).to_html() for node in text_to_textnodes(text)
+            )
+            self.assertEqual(tokens_to_html(text_to_tokens(text)), expected)
+
+    def test_image(self):
+        tokens = text_to_tokens("![alt](src.png)")
+        self.assertEqual(list(tokens.types), [IMAGE])
+        self.assertEqual(tokens_to_html(tokens), '<img src="src.png" alt="alt"></img>')
+
+    def test_unclosed_delimiter(self):
+        with self.assertRaisesRegex(ValueError, "unclosed delimiter '\\*\\*'"):
+            text_to_tokens("a **b")
+
+
+class TestInlineTokenExtensions(unittest.TestCase):
+    def register(self, syntax):
+        self.addCleanup(unregister_inline_syntax, syntax)
+        return syntax
+
+    def test_extension_delimiter(self):
+        self.register(register_inline_delimiter("~~", "strike"))
+        register_text_type("strike", lambda node: LeafNode("s", node.text))
+        self.addCleanup(unregister_text_type, "strike")
+        tokens = text_to_tokens("a ~~gone~~")
+        self.assertEqual(
+            tokens.to_textnodes(), [TextNode("a ", TextType.TEXT), TextNode("gone", "strike")]
+        )
+        self.assertEqual(tokens_to_html(tokens), "a <s>gone</s>")
+
+    def test_pattern_without_text_type_keeps_node(self):
+        self.register(
+            register_inline_pattern(
+                "mention", r"@(\w+)", lambda name: TextNode(name, TextType.BOLD)
+            )
+        )
+        tokens = text_to_tokens("hi @bob")
+        self.assertEqual(list(tokens.types), [TEXT, NODE])
+        self.assertEqual(tokens.nodes, [TextNode("bob", TextType.BOLD)])
+        self.assertEqual(tokens_to_html(tokens), "hi <b>bob</b>")
+
+    def test_pattern_with_text_type(self):
+        self.register(
+            register_inline_pattern(
+                "wiki",
+                r"\[\[([^|\]]+)\|([^\]]+)\]\]",
+                lambda title, page: TextNode(title, TextType.LINK, page),
+                priority=1,
+                first_chars="[",
+                text_type=TextType.LINK,
+            )
+        )
+        tokens = text_to_tokens("see [[Home|/index]]")
+        self.assertEqual(list(tokens.types), [TEXT, LINK])
+        self.assertEqual(tokens_to_html(tokens), 'see <a href="/index">Home</a>')
+
+    def test_text_type_needs_two_groups(self):
+        with self.assertRaises(ValueError):
+            register_inline_pattern(
+                "bad", r"@(\w+)", lambda name: TextNode(name, TextType.LINK), text_type=TextType.LINK
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
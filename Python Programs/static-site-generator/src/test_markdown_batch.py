@@ -0,0 +1,81 @@
+import unittest
+
+import block_markdown
+from block_markdown import markdown_to_html_node
+from markdown_batch import BatchConverter, markdown_to_html_many
+
+
+COMMENTS = [
+    "Thanks!",
+    "- looks **good** to me\n- ship it",
+    "Thanks!",
+    "See [the docs](https://boot.dev) and `run_tests()`",
+    "# Question\n\nWhy is _this_ needed?",
+    "- looks **good** to me\n- but fix the `typo`",
+]
+
+
+def expected_html(documents):
+    return [markdown_to_html_node(markdown).to_html() for markdown in documents]
+
+
+class TestMarkdownToHTMLMany(unittest.TestCase):
+    def test_matches_single_document_api(self):
+        self.assertEqual(markdown_to_html_many(COMMENTS), expected_html(COMMENTS))
+
+    def test_accepts_generator(self):
+        documents = (comment for comment in COMMENTS)
+        self.assertEqual(markdown_to_html_many(documents), expected_html(COMMENTS))
+
+    def test_empty(self):
+        self.assertEqual(markdown_to_html_many([]), [])
+
+    def test_worker_pool(self):
+        documents = COMMENTS * 50
+        with BatchConverter(workers=2, chunksize=16) as converter:
+            self.assertEqual(
+                markdown_to_html_many(documents, converter=converter),
+                expected_html(documents),
+            )
+            # The pool persists across calls.
+            self.assertEqual(
+                markdown_to_html_many(COMMENTS, converter=converter),
+                expected_html(COMMENTS),
+            )
+
+
+class TestBatchConverter(unittest.TestCase):
+    def test_caches_are_shared_across_documents(self):
+        converter = BatchConverter()
+        html = list(converter.convert_many(COMMENTS))
+        self.assertEqual(html, expected_html(COMMENTS))
+
+        stats = converter.stats()
+        self.assertEqual(stats["block_cache"]["hits"], 1)
+        self.assertEqual(stats["inline_cache"]["hits"], 1)
+
+    def test_settings_do_not_leak_between_iterations(self):
+        converter = BatchConverter(chunksize=2)
+        results = converter.convert_many(COMMENTS)
+        self.assertEqual(next(results), expected_html(COMMENTS[:1])[0])
+        self.assertIsNone(block_markdown._inline_cache)
+        self.assertFalse(block_markdown._direct_inline_html)
+        # A conversion run by the consumer does not use the converter's caches.
+        inline_misses = converter.inline_cache.misses
+        markdown_to_html_node("something **new**")
+        self.assertEqual(converter.inline_cache.misses, inline_misses)
+        self.assertEqual(list(results), expected_html(COMMENTS[1:]))
+
+    def test_convert(self):
+        converter = BatchConverter()
+        self.assertEqual(converter.convert("Thanks!"), "<div><p>Thanks!</p></div>")
+        self.assertEqual(converter.convert("Thanks!"), "<div><p>Thanks!</p></div>")
+        self.assertEqual(converter.block_cache.hits, 1)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            BatchConverter(workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+import pipeline_stats
+from block_markdown import direct_inline_html, markdown_to_html_node
+from pipeline_stats import PipelineStats, count_nodes, instrument
+from htmlnode import LeafNode, ParentNode
+
+
+MARKDOWN = """# Title
+
+A paragraph with **bold** text.
+
+- one
+- two _italic_
+"""
+
+
+class TestInstrument(unittest.TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(pipeline_stats.active)
+        markdown_to_html_node(MARKDOWN).to_html()
+        self.assertIsNone(pipeline_stats.active)
+
+    def test_records_each_stage(self):
+        with instrument() as stats:
+            html = markdown_to_html_node(MARKDOWN).to_html()
+        self.assertIsNone(pipeline_stats.active)
+        self.assertEqual(html, markdown_to_html_node(MARKDOWN).to_html())
+
+        stages = stats.to_dict()
+        self.assertEqual(
+            set(stages),
+            {
+                "markdown_to_blocks",
+                "heading_to_html_node",
+                "paragraph_to_html_node",
+                "unordered_list_to_html_node",
+                "text_to_children",
+                "to_html",
+            },
+        )
+        self.assertEqual(stages["markdown_to_blocks"]["nodes"], 3)
+        self.assertEqual(stages["text_to_children"]["calls"], 4)
+        self.assertEqual(stages["unordered_list_to_html_node"]["nodes"], 6)
+        self.assertEqual(stages["to_html"]["calls"], 1)
+        self.assertGreater(stages["to_html"]["seconds"], 0)
+
+    def test_direct_inline_html_keeps_node_counts(self):
+        with instrument() as plain:
+            markdown_to_html_node(MARKDOWN).to_html()
+        with instrument() as direct, direct_inline_html():
+            markdown_to_html_node(MARKDOWN).to_html()
+        self.assertEqual(direct.stages["text_to_children"].nodes, 7)
+        self.assertEqual(direct.stages["to_html"].nodes, plain.stages["to_html"].nodes)
+        self.assertEqual(
+            direct.stages["text_to_children"].nodes, plain.stages["text_to_children"].nodes
+        )
+
+    def test_nested_instrument_restores_outer(self):
+        with instrument() as outer:
+            with instrument() as inner:
+                markdown_to_html_node("inner")
+            markdown_to_html_node("outer")
+            self.assertIs(pipeline_stats.active, outer)
+        self.assertEqual(inner.stages["paragraph_to_html_node"].calls, 1)
+        self.assertEqual(outer.stages["paragraph_to_html_node"].calls, 1)
+
+
+class TestPipelineStats(unittest.TestCase):
+    def test_merge(self):
+        first = PipelineStats()
+        first.record("to_html", 0.5, 3)
+        second = PipelineStats()
+        second.record("to_html", 0.25, 2)
+        second.record("markdown_to_blocks", 0.1, 4)
+
+        total = PipelineStats().merge(first).merge(second)
+        self.assertEqual(
+            total.to_dict(),
+            {
+                "markdown_to_blocks": {"calls": 1, "seconds": 0.1, "nodes": 4},
+                "to_html": {"calls": 2, "seconds": 0.75, "nodes": 5},
+            },
+        )
+
+    def test_count_nodes(self):
+        tree = ParentNode("div", [ParentNode("p", [LeafNode(None, "a")]), LeafNode("b", "c")])
+        self.assertEqual(count_nodes(tree), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,15 @@
 import unittest
 
 from enum import Enum
-from textnode import TextNode, TextType, text_node_to_html_node
+from textnode import (
+    TextNode,
+    TextType,
+    register_text_type,
+    text_node_to_html,
+    text_node_to_html_node,
+    text_nodes_to_html,
+    unregister_text_type,
+)
 from htmlnode import LeafNode
 
 
@@ -52,6 +60,12 @@ class TestTextNode(unittest.TestCase):
         expected_repr_no_url = "TextNode('Another text', 'bold', None)"
         self.assertEqual(repr(node_no_url), expected_repr_no_url)
 
+    def test_no_instance_dict(self):
+        node = TextNode("Compact", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = "not allowed"
+
     def test_text_node_to_html_text(self):
         tn = TextNode("This is plain text", TextType.TEXT)
         hn = text_node_to_html_node(tn)
@@ -107,6 +121,56 @@ class TestTextNode(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Invalid TextType: not_an_enum_member"):
             text_node_to_html_node(tn_non_enum_type)
 
+    def test_registered_text_type(self):
+        register_text_type("strike", lambda node: LeafNode("s", node.text))
+        self.addCleanup(unregister_text_type, "strike")
+        hn = text_node_to_html_node(TextNode("gone", "strike"))
+        self.assertEqual(hn.to_html(), "<s>gone</s>")
+
+    def test_builtin_text_type_cannot_be_registered(self):
+        with self.assertRaises(ValueError):
+            register_text_type(TextType.BOLD, lambda node: LeafNode("strong", node.text))
+
+
+class TestTextNodeToHTML(unittest.TestCase):
+    NODES = [
+        TextNode("a < b & c", TextType.TEXT),
+        TextNode("bold", TextType.BOLD),
+        TextNode("it", TextType.ITALIC),
+        TextNode("x > 1", TextType.CODE),
+        TextNode("link", TextType.LINK, 'https://example.com/?q="a"&b'),
+        TextNode('alt "text"', TextType.IMAGE, "/img.png"),
+    ]
+
+    def test_matches_leaf_nodes(self):
+        for node in self.NODES:
+            self.assertEqual(text_node_to_html(node), text_node_to_html_node(node).to_html())
+
+    def test_text_nodes_to_html(self):
+        self.assertEqual(
+            text_nodes_to_html(self.NODES),
+            "".join(text_node_to_html_node(node).to_html() for node in self.NODES),
+        )
+
+    def test_registered_text_type(self):
+        register_text_type("strike", lambda node: LeafNode("s", node.text))
+        self.addCleanup(unregister_text_type, "strike")
+        self.assertEqual(text_node_to_html(TextNode("gone", "strike")), "<s>gone</s>")
+
+    def test_invalid_text_type(self):
+        with self.assertRaisesRegex(ValueError, "Invalid TextType: nope"):
+            text_node_to_html(TextNode("x", "nope"))
+
+    def test_link_without_url(self):
+        with self.assertRaisesRegex(ValueError, "Link TextNode requires a URL"):
+            text_node_to_html(TextNode("x", TextType.LINK))
+        with self.assertRaisesRegex(ValueError, "Link TextNode requires a URL"):
+            text_node_to_html_node(TextNode("x", TextType.LINK))
+
+    def test_text_type_is_usable_as_key(self):
+        self.assertEqual({TextType.BOLD: 1}[TextType("bold")], 1)
+        self.assertNotIn("bold", {TextType.BOLD: 1})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,5 @@
 from enum import Enum
-from htmlnode import LeafNode
+from htmlnode import LeafNode, escape_attribute, escape_text
 
 
 class TextType(Enum):
@@ -10,8 +10,14 @@ class TextType(Enum):
     LINK = "link"
     IMAGE = "image"
 
+    # Members are singletons compared by identity, so hash them the same
+    # way; Enum's own __hash__ is Python code run on every dict lookup.
+    __hash__ = object.__hash__
+
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -30,27 +36,122 @@ class TextNode:
         return f"TextNode({repr(self.text)}, {repr(self.text_type.value)}, {repr(self.url)})"
 
 
-def text_node_to_html_node(text_node):
-    if not isinstance(text_node.text_type, TextType):
+EXTENSION_TEXT_TYPES = {}
+
+
+def register_text_type(text_type, to_html_node):
+    """Lets text_node_to_html_node render a text type added by an extension.
+
+    to_html_node is called with the TextNode and returns an HTMLNode.
+    """
+    if isinstance(text_type, TextType):
+        raise ValueError(f"Built-in TextType cannot be re-registered: {text_type}")
+    EXTENSION_TEXT_TYPES[text_type] = to_html_node
+
+
+def unregister_text_type(text_type):
+    EXTENSION_TEXT_TYPES.pop(text_type, None)
+
+
+# Tags of the text types whose leaf is just the node's text in a tag.
+SIMPLE_LEAF_TAGS = {
+    TextType.TEXT: None,
+    TextType.BOLD: "b",
+    TextType.ITALIC: "i",
+    TextType.CODE: "code",
+}
+
+# (opening, closing) HTML of the simple leaves, shared by every leaf that
+# text_node_to_html renders.
+LEAF_TEMPLATES = {
+    text_type: ("", "") if tag is None else (f"<{tag}>", f"</{tag}>")
+    for text_type, tag in SIMPLE_LEAF_TAGS.items()
+}
+
+
+def _simple_leaf(tag):
+    def to_html_node(text_node):
+        return LeafNode(tag, text_node.text)
+
+    return to_html_node
+
+
+def _check_link(text_node):
+    if text_node.url is None:
+        raise ValueError("Link TextNode requires a URL")
+
+
+def _check_image(text_node):
+    if text_node.url is None:
+        raise ValueError("Image TextNode requires a URL for src attribute")
+    if text_node.text is None:
+        raise ValueError("Image TextNode requires text for alt attribute")
+
+
+def _link_leaf(text_node):
+    _check_link(text_node)
+    return LeafNode("a", text_node.text, {"href": text_node.url})
+
+
+def _image_leaf(text_node):
+    _check_image(text_node)
+    return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+
+
+def _link_html(text_node):
+    _check_link(text_node)
+    if text_node.text is None:
+        raise ValueError("LeafNode requires a value")
+    return f'<a href="{escape_attribute(text_node.url)}">{escape_text(text_node.text)}</a>'
+
+
+def _image_html(text_node):
+    _check_image(text_node)
+    return (
+        f'<img src="{escape_attribute(text_node.url)}" '
+        f'alt="{escape_attribute(text_node.text)}"></img>'
+    )
+
+
+HTML_NODE_BUILDERS = {text_type: _simple_leaf(tag) for text_type, tag in SIMPLE_LEAF_TAGS.items()}
+HTML_NODE_BUILDERS[TextType.LINK] = _link_leaf
+HTML_NODE_BUILDERS[TextType.IMAGE] = _image_leaf
+
+HTML_RENDERERS = {TextType.LINK: _link_html, TextType.IMAGE: _image_html}
+
+
+def _extension_to_html_node(text_node):
+    to_html_node = EXTENSION_TEXT_TYPES.get(text_node.text_type)
+    if to_html_node is None:
         raise ValueError(f"Invalid TextType: {text_node.text_type}")
+    return to_html_node(text_node)
 
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    if text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    if text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    if text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    if text_node.text_type == TextType.LINK:
-        if text_node.url is None:
-            raise ValueError("Link TextNode requires a URL")
-        return LeafNode("a", text_node.text, {"href": text_node.url})
-    if text_node.text_type == TextType.IMAGE:
-        if text_node.url is None:
-            raise ValueError("Image TextNode requires a URL for src attribute")
+
+def text_node_to_html_node(text_node):
+    to_html_node = HTML_NODE_BUILDERS.get(text_node.text_type)
+    if to_html_node is None:
+        return _extension_to_html_node(text_node)
+    return to_html_node(text_node)
+
+
+def text_node_to_html(text_node):
+    """Renders a TextNode straight to HTML, without building a LeafNode.
+
+    Gives the same HTML as text_node_to_html_node(text_node).to_html().
+    Simple leaves wrap the escaped text in their LEAF_TEMPLATES entry, and
+    extension text types are rendered through their registered node.
+    """
+    template = LEAF_TEMPLATES.get(text_node.text_type)
+    if template is not None:
         if text_node.text is None:
-            raise ValueError("Image TextNode requires text for alt attribute")
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+            raise ValueError("LeafNode requires a value")
+        return template[0] + escape_text(text_node.text) + template[1]
+    render = HTML_RENDERERS.get(text_node.text_type)
+    if render is not None:
+        return render(text_node)
+    return _extension_to_html_node(text_node).to_html()
+
 
-    raise ValueError(f"Unsupported text type: {text_node.text_type}")
+def text_nodes_to_html(text_nodes):
+    """Renders a list of TextNodes to one HTML string with text_node_to_html."""
+    return "".join([text_node_to_html(text_node) for text_node in text_nodes])